@@ -2,9 +2,13 @@
 NeuroDesk LLM Wrapper API
 Main Flask application for ticket assignment workflow - Step 1
 """
-from flask import Flask, request, jsonify
+import time
+
+# Taken before the heavy imports so the startup report covers them
+STARTUP_STARTED = time.perf_counter()
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-from langchain_openai import ChatOpenAI
 import logging
 import os
 import requests
@@ -13,6 +17,10 @@ import requests
 from config.settings import Config
 from services.assignment_service import AssignmentService
 from services.evaluation_service import EvaluationService
+from services.json_provider import OrjsonProvider, dumps, model_response
+from services.llm_factory import create_llm
+from services.metrics import HTTP_REQUEST_DURATION, registry
+from services.startup import StartupReport, warm_up
 
 # Configure logging
 logging.basicConfig(
@@ -21,8 +29,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+startup = StartupReport(STARTUP_STARTED)
+startup.record("imports", STARTUP_STARTED)
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Configure CORS to allow all origins
 CORS(app, resources={
@@ -41,15 +53,34 @@ except ValueError as e:
     logger.error(f"Configuration error: {str(e)}")
     raise
 
-# Initialize OpenAI model
-llm = ChatOpenAI(
-    model=Config.OPENAI_MODEL,
-    temperature=Config.OPENAI_TEMPERATURE,
-    openai_api_key=Config.OPENAI_API_KEY
-)
+# Initialize the LLM for the configured provider
+with startup.phase("llm"):
+    llm = create_llm()
+
+with startup.phase("services"):
+    # Initialize assignment service
+    assignment_service = AssignmentService(llm)
+
+    # Initialize evaluation service
+    evaluation_service = EvaluationService(llm)
+
+# Fill the caches and connection pools before the server starts answering /health
+if Config.STARTUP_WARMUP:
+    warm_up(startup, assignment_service, evaluation_service)
+startup.mark_ready()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
 
-# Initialize assignment service
-assignment_service = AssignmentService(llm)
+@app.after_request
+def record_request_duration(response):
+    """Record request latency by route; streamed responses are timed to their first byte"""
+    started = g.pop("request_started", None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        HTTP_REQUEST_DURATION.observe((request.method, endpoint, str(response.status_code)), time.perf_counter() - started)
+    return response
 
 @app.route("/", methods=["GET"])
 def home():
@@ -61,7 +92,12 @@ def home():
         "endpoints": {
             "health": "/health",
             "ticket_assignment": "/api/ticket-assignment",
-            "service_status": "/api/service-status"
+            "ticket_assignment_batch": "/api/ticket-assignment/batch",
+            "ticket_assignment_stream": "/api/ticket-assignment/stream",
+            "evaluate_skills": "/api/evaluate-skills",
+            "evaluate_skills_batch": "/api/evaluate-skills/batch",
+            "service_status": "/api/service-status",
+            "metrics": "/metrics"
         },
         "required_request_fields": ["ticket", "skills"]
     })
@@ -72,9 +108,15 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "llm_available": Config.OPENAI_API_KEY is not None,
-        "service": "NeuroDesk LLM Wrapper"
+        "service": "NeuroDesk LLM Wrapper",
+        "startup": startup.as_dict()
     })
 
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Stage latency histograms, error counters and in-flight gauges in Prometheus text format"""
+    return Response(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.route("/api/service-status", methods=["GET"])
 def service_status():
     """Get assignment service status"""
@@ -126,10 +168,8 @@ def ticket_assignment():
         # Process ticket assignment
         result = assignment_service.process_ticket_assignment(request_data)
         
-        # Convert response to dictionary for JSON serialization using model_dump()
-        response_dict = result.model_dump()
-        
-        return jsonify(response_dict)
+        # Serialize the response model directly with model_dump_json()
+        return model_response(result)
         
     except Exception as e:
         logger.error(f"Error processing ticket assignment: {str(e)}")
@@ -139,6 +179,69 @@ def ticket_assignment():
             "message": str(e)
         }), 500
 
+@app.route("/api/ticket-assignment/stream", methods=["POST"])
+def ticket_assignment_stream():
+    """
+    Ticket assignment as Server-Sent Events
+    
+    Takes the same request as /api/ticket-assignment and sends each result as soon as
+    it is known: `skills`, then `technician`, then `justification` deltas, then `done`
+    with the full response. A failure sends an `error` event instead.
+    """
+    if not request.is_json:
+        return jsonify({"error": "Content-Type must be application/json"}), 400
+    
+    request_data = request.get_json()
+    logger.info(f"Streaming ticket assignment for: {request_data.get('subject', 'Unknown')}")
+    
+    def events():
+        for event in assignment_service.stream_ticket_assignment(request_data):
+            yield f"event: {event['event']}\ndata: {dumps(event['data']).decode('utf-8')}\n\n"
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.route("/api/ticket-assignment/batch", methods=["POST"])
+def ticket_assignment_batch():
+    """
+    Assign many tickets in one request
+    
+    Request Format:
+    {
+        "selection_engine": "scoring",
+        "tickets": [
+            {"id": 1, "subject": "...", "description": "...", "requester_id": 101},
+            {"id": 2, "subject": "...", "description": "...", "requester_id": 102}
+        ]
+    }
+    """
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Content-Type must be application/json"}), 400
+        
+        request_data = request.get_json()
+        logger.info(f"Processing batch ticket assignment for {len(request_data.get('tickets') or [])} tickets")
+        
+        result = assignment_service.process_ticket_batch(request_data)
+        return model_response(result)
+        
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": "Validation failed",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error processing batch ticket assignment: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": "Internal server error",
+            "message": str(e)
+        }), 500
+
 @app.route("/api/validate-request", methods=["POST"])
 def validate_request():
     """
@@ -217,14 +320,9 @@ def evaluate_skills():
                 "error": "Missing required fields",
                 "missing": missing_fields
             }), 400
-        evaluationService=EvaluationService(llm)
-        # Get technicians data
+        # Get technician data
         try:
-            technicians = evaluationService.get_technicians()
-            technician = next(
-                (t for t in technicians if t['id'] == ticket['assigned_technician_id']), 
-                None
-            )
+            technician = evaluation_service.get_technician(ticket['assigned_technician_id'])
             if not technician:
                 return jsonify({
                     "error": f"Technician {ticket['assigned_technician_id']} not found"
@@ -236,10 +334,10 @@ def evaluate_skills():
                 "message": str(e)
             }), 500
         
-        metrics = evaluationService.calculate_metrics(ticket)
+        metrics = evaluation_service.calculate_metrics(ticket)
         
         # Update technician skills
-        result = evaluationService.update_technician_skills(
+        result = evaluation_service.update_technician_skills(
             technician_id=ticket['assigned_technician_id'],
             current_skills=technician.get('skills', []),
             ticket_metrics=metrics
@@ -261,6 +359,47 @@ def evaluate_skills():
             "message": str(e)
         }), 500
 
+@app.route("/api/evaluate-skills/batch", methods=["POST"])
+def evaluate_skills_batch():
+    """
+    Evaluate technician skills for many resolved tickets
+    
+    Each ticket takes the same fields as /api/evaluate-skills. Skill changes are folded
+    per technician in resolution order and returned as one update per technician.
+    
+    Request Format:
+    {
+        "tickets": [
+            {"id": 1, "subject": "...", "description": "...", "priority": "high", "required_skills": [1, 2],
+             "assigned_technician_id": 1, "resolved_at": "2024-01-01T11:15:00.000Z"},
+            {"id": 2, "subject": "...", "description": "...", "priority": "low", "required_skills": [3],
+             "assigned_technician_id": 1, "resolved_at": "2024-01-01T12:40:00.000Z"}
+        ]
+    }
+    """
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Content-Type must be application/json"}), 400
+        
+        data = request.get_json()
+        logger.info(f"Evaluating skills for {len(data.get('tickets') or [])} tickets")
+        
+        result = evaluation_service.evaluate_tickets(data.get('tickets'))
+        return jsonify(result)
+        
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": "Validation failed",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error evaluating skills batch: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": str(e)
+        }), 500
+
 if __name__ == "__main__":
     logger.info("Starting NeuroDesk LLM Wrapper API")
     logger.info(f"Environment: {Config.FLASK_ENV}")
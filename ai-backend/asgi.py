@@ -0,0 +1,167 @@
+"""
+NeuroDesk LLM Wrapper API - ASGI entry point
+Serves the ticket assignment workflow on asyncio, alongside the Flask app in app.py
+
+Run with: uvicorn asgi:app --host 0.0.0.0 --port 8001 (Config.ASGI_PORT)
+"""
+import time
+
+# Taken before the heavy imports so the startup report covers them
+STARTUP_STARTED = time.perf_counter()
+
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config.settings import Config
+from services.json_provider import dumps, loads
+from services.metrics import registry
+from services.startup import StartupReport, awarm_up
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, Config.LOG_LEVEL),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+IMPORTS_DONE = time.perf_counter()
+
+CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+    (b"access-control-allow-headers", b"Content-Type, Authorization, X-Requested-With"),
+]
+
+def _build_service():
+    """Create the async assignment service with the configured LLM"""
+    from services.async_assignment_service import AsyncAssignmentService
+    from services.llm_factory import create_llm
+
+    Config.validate()
+    return AsyncAssignmentService(create_llm())
+
+async def _send_json(send: Callable[[Dict[str, Any]], Awaitable[None]], payload: Any, status: int = 200):
+    # Pre-serialized bodies, such as model_dump_json() output, are sent as they are
+    body = payload if isinstance(payload, bytes) else dumps(payload)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())] + CORS_HEADERS,
+    })
+    await send({"type": "http.response.body", "body": body})
+
+async def _read_body(receive: Callable[[], Awaitable[Dict[str, Any]]]) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+def create_app(service=None):
+    """
+    Create the ASGI application
+
+    Args:
+        service: AsyncAssignmentService to use; created on lifespan startup when omitted
+
+    Returns:
+        ASGI application callable
+    """
+    state = {"service": service}
+    startup = StartupReport(STARTUP_STARTED)
+    startup.record("imports", STARTUP_STARTED, IMPORTS_DONE)
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    if state["service"] is None:
+                        with startup.phase("services"):
+                            state["service"] = _build_service()
+                    # Uvicorn accepts connections only once startup completes
+                    if Config.STARTUP_WARMUP:
+                        await awarm_up(startup, state["service"])
+                    startup.mark_ready()
+                    logger.info("NeuroDesk ASGI app started")
+                    await send({"type": "lifespan.startup.complete"})
+                except Exception as e:
+                    logger.error(f"Startup failed: {str(e)}")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+            elif message["type"] == "lifespan.shutdown":
+                if state["service"] is not None:
+                    await state["service"].aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def ticket_assignment(receive, send):
+        body = await _read_body(receive)
+        try:
+            request_data = loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            await _send_json(send, {"error": "Request body must be valid JSON"}, 400)
+            return
+        if not isinstance(request_data, dict):
+            await _send_json(send, {"error": "Request body must be a JSON object"}, 400)
+            return
+
+        logger.info(f"Processing ticket assignment for: {request_data.get('subject', 'Unknown')}")
+        result = await state["service"].aprocess_ticket_assignment(request_data)
+        await _send_json(send, result.model_dump_json().encode("utf-8"))
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            await lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        method, path = scope["method"], scope["path"].rstrip("/") or "/"
+        service = state["service"]
+        try:
+            if method == "OPTIONS":
+                await send({"type": "http.response.start", "status": 204, "headers": CORS_HEADERS})
+                await send({"type": "http.response.body", "body": b""})
+            elif path == "/health" and method == "GET":
+                await _send_json(send, {
+                    "status": "healthy",
+                    "llm_available": Config.OPENAI_API_KEY is not None,
+                    "service": "NeuroDesk LLM Wrapper (ASGI)",
+                    "startup": startup.as_dict()
+                })
+            elif path == "/metrics" and method == "GET":
+                body = registry.render().encode("utf-8")
+                await send({
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"text/plain; version=0.0.4; charset=utf-8"), (b"content-length", str(len(body)).encode())] + CORS_HEADERS,
+                })
+                await send({"type": "http.response.body", "body": body})
+            elif service is None:
+                await _send_json(send, {"error": "Service is starting"}, 503)
+            elif path == "/api/service-status" and method == "GET":
+                await _send_json(send, service.get_assignment_status())
+            elif path == "/api/ticket-assignment" and method == "POST":
+                await ticket_assignment(receive, send)
+            else:
+                await _send_json(send, {"error": "Not found"}, 404)
+        except Exception as e:
+            logger.error(f"Error processing {method} {path}: {str(e)}")
+            await _send_json(send, {
+                "success": False,
+                "error": "Internal server error",
+                "message": str(e)
+            }, 500)
+
+    return app
+
+app = create_app()
+
+if __name__ == "__main__":
+    import uvicorn
+
+    logger.info("Starting NeuroDesk ASGI API")
+    uvicorn.run("asgi:app", host="0.0.0.0", port=Config.ASGI_PORT)
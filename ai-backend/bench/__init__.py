@@ -0,0 +1,3 @@
+"""
+Offline benchmark harness - stub backend, fake LLM and load generator
+"""
@@ -0,0 +1,130 @@
+"""
+JSON microbenchmark - Decode and encode costs of the stdlib path against the orjson path
+
+Usage:
+    python -m bench.json_bench --technicians 5000 --skills 2000
+    python -m bench.json_bench --technicians 20000 --skills-per-technician 12 --repeat 7 --output json.json
+
+Measures, on synthetic payloads from the stub backend:
+    roster    decoding /technicians/all into Technician models, or into compact records with orjson
+    catalog   decoding /skills/all into Skill models with json or orjson
+    response  encoding a batch assignment response with jsonify-style json.dumps(model_dump()),
+              orjson or model_dump_json
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+import orjson
+from bench.stub_backend import build_catalog, build_roster
+from models.skill import Skill
+from models.technician import Technician
+from models.ticket import TicketBatchAssignmentResponse, TicketBatchResult
+from services.json_provider import dumps
+from services.technician_roster import CompactTechnician, parse_technicians_payload
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Median and best wall time of `func`, and the memory still held by its result"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "best_ms": round(min(timings) * 1000, 2),
+        "retained_kb": round(retained / 1024, 1),
+    }
+
+def _technician_models(body: bytes) -> List[Technician]:
+    return [Technician(**record) for record in json.loads(body)["data"]["technicians"]]
+
+def _compact_technicians(body: bytes) -> List[CompactTechnician]:
+    return [CompactTechnician(record) for record in parse_technicians_payload(body)]
+
+def _batch_response(size: int) -> TicketBatchAssignmentResponse:
+    results = [TicketBatchResult(
+        index=index,
+        ticket_id=index + 1,
+        success=True,
+        selected_technician_id=index % 97 + 1,
+        justification="• Best skill match\n• Lowest workload among matching technicians",
+        error_message=None,
+        diagnostics={"selection_engine": "scoring", "candidate_technicians": 10, "timings": {"total_ms": 12.5}},
+    ) for index in range(size)]
+    return TicketBatchAssignmentResponse(success=True, total=size, succeeded=size, failed=0, results=results)
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> Dict[str, Any]:
+    return {**candidate, "speedup": round(baseline["median_ms"] / candidate["median_ms"], 1) if candidate["median_ms"] else None}
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    roster_body = orjson.dumps({"success": True, "data": {"technicians": build_roster(args.technicians, args.skills, args.skills_per_technician)}})
+    catalog_body = orjson.dumps({"success": True, "data": {"skills": build_catalog(args.skills)}})
+    response = _batch_response(args.batch_size)
+
+    roster_baseline = measure(lambda: _technician_models(roster_body), args.repeat)
+    catalog_baseline = measure(lambda: [Skill(**skill) for skill in json.loads(catalog_body)["data"]["skills"]], args.repeat)
+    response_baseline = measure(lambda: json.dumps(response.model_dump(mode="json")).encode("utf-8"), args.repeat)
+
+    return {
+        "config": {
+            "technicians": args.technicians,
+            "skills": args.skills,
+            "skills_per_technician": args.skills_per_technician,
+            "batch_size": args.batch_size,
+            "repeat": args.repeat,
+            "roster_bytes": len(roster_body),
+            "catalog_bytes": len(catalog_body),
+        },
+        "roster": {
+            "json_technician_models": roster_baseline,
+            "orjson_compact_records": compare(roster_baseline, measure(lambda: _compact_technicians(roster_body), args.repeat)),
+        },
+        "catalog": {
+            "json_skill_models": catalog_baseline,
+            "orjson_skill_models": compare(catalog_baseline, measure(lambda: [Skill(**skill) for skill in orjson.loads(catalog_body)["data"]["skills"]], args.repeat)),
+        },
+        "response": {
+            "json_dumps_model_dump": response_baseline,
+            "orjson_model_dump": compare(response_baseline, measure(lambda: dumps(response.model_dump()), args.repeat)),
+            "model_dump_json": compare(response_baseline, measure(lambda: response.model_dump_json().encode("utf-8"), args.repeat)),
+        },
+    }
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="JSON decode/encode microbenchmark of the NeuroDesk AI backend")
+    parser.add_argument("--technicians", type=int, default=5000, help="Technicians in the roster payload")
+    parser.add_argument("--skills", type=int, default=2000, help="Skills in the catalog payload")
+    parser.add_argument("--skills-per-technician", type=int, default=8, help="Skills held by each technician")
+    parser.add_argument("--batch-size", type=int, default=500, help="Tickets in the encoded batch response")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs of every case")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    for section in ("roster", "catalog", "response"):
+        for case, result in report[section].items():
+            print(f"{section} {case}: {result['median_ms']}ms median, {result['retained_kb']}KB retained" + (f", {result['speedup']}x" if "speedup" in result else ""), file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Load generator - Drives an HTTP endpoint at a fixed concurrency or request rate and reports latency percentiles
+"""
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import requests
+from bench.stub_backend import AREAS, TOPICS
+
+PayloadFactory = Callable[[int], Dict[str, Any]]
+
+SYMPTOMS = [
+    "keeps failing after the latest update", "is unreachable for the whole team", "became very slow this morning",
+    "shows an access denied error", "stopped working after a password reset", "drops every few minutes",
+]
+
+def assignment_payload(seed: int = 11) -> PayloadFactory:
+    """Ticket assignment requests whose text mentions an area and a topic of the synthetic catalog"""
+    def build(index: int) -> Dict[str, Any]:
+        rng = random.Random(seed * 1_000_003 + index)
+        area, topic, symptom = rng.choice(AREAS), rng.choice(TOPICS), rng.choice(SYMPTOMS)
+        return {
+            "id": index + 1,
+            "subject": f"{area} {symptom}",
+            "description": f"The {area} service {symptom}. It probably needs {topic.lower()} by someone who knows {area}.",
+            "requester_id": 1 + index % 50,
+            "priority": rng.choice(["low", "normal", "high", "critical"]),
+            "impact": rng.choice(["low", "medium", "high"]),
+            "urgency": rng.choice(["low", "normal", "high"]),
+            "tags": [area.lower(), topic.lower()],
+        }
+    return build
+
+def evaluation_payload(skill_count: int, technician_count: int, seed: int = 13) -> PayloadFactory:
+    """Skill evaluation requests for resolved tickets of random technicians of the synthetic roster"""
+    def build(index: int) -> Dict[str, Any]:
+        rng = random.Random(seed * 1_000_003 + index)
+        area = rng.choice(AREAS)
+        return {"ticket": {
+            "id": index + 1,
+            "subject": f"{area} outage",
+            "description": f"The {area} service was unavailable for several users.",
+            "status": "resolved",
+            "priority": rng.choice(["low", "medium", "high", "critical"]),
+            "required_skills": rng.sample(range(1, skill_count + 1), min(2, skill_count)),
+            "assigned_technician_id": rng.randint(1, technician_count),
+            "resolution": f"Restarted the {area} service and corrected its configuration.",
+            "work_logs": [{"timestamp": "2024-01-01T10:30:00.000Z", "notes": "Investigated and resolved", "time_spent": 45}],
+            "feedback": rng.choice(["Fixed quickly, thanks!", "Took a while but it works now.", "Still flaky sometimes."]),
+            "assigned_at": "2024-01-01T10:00:00.000Z",
+            "resolved_at": "2024-01-01T11:30:00.000Z",
+        }}
+    return build
+
+def _percentile(values: List[float], quantile: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, math.ceil(quantile * len(values)) - 1))]
+
+def _round_ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+def _succeeded(response: requests.Response) -> bool:
+    """2xx responses, except those whose body reports `"success": false`"""
+    if not response.ok:
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return True
+    return not (isinstance(body, dict) and body.get("success") is False)
+
+def run_load(url: str, make_payload: PayloadFactory, requests_total: int, concurrency: int = 8, qps: Optional[float] = None, timeout: float = 60) -> Dict[str, Any]:
+    """
+    Send `requests_total` POST requests and measure their latency
+
+    Without `qps` the load is closed-loop: `concurrency` workers send their next request
+    as soon as the previous one completes. With `qps` requests are scheduled at that rate
+    whatever the server does, sent by up to `concurrency` workers, and latency is measured
+    from the scheduled send time so queueing behind a slow server is included.
+
+    Args:
+        url: Endpoint to POST to
+        make_payload: Builds the JSON body of the request with the given index
+        requests_total: Number of requests to send
+        concurrency: Number of workers sending requests
+        qps: Target request rate, or None for closed-loop load
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Dictionary with the request counts, status codes, throughput and latency percentiles in milliseconds
+    """
+    payloads = [make_payload(index) for index in range(requests_total)]
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    failures = 0
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(index: int, scheduled: float):
+        nonlocal failures
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        started = scheduled if qps else time.perf_counter()
+        try:
+            response = session.post(url, json=payloads[index], timeout=timeout)
+            status, ok = str(response.status_code), _succeeded(response)
+        except requests.RequestException as e:
+            status, ok = type(e).__name__, False
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] += 1
+            failures += 0 if ok else 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index in range(requests_total):
+            executor.submit(send, index, started + index / qps if qps else started)
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "url": url,
+        "mode": "open_loop" if qps else "closed_loop",
+        "target_qps": qps,
+        "concurrency": concurrency,
+        "requests": requests_total,
+        "succeeded": requests_total - failures,
+        "failed": failures,
+        "status_codes": dict(sorted(statuses.items())),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(requests_total / duration, 2) if duration else None,
+        "latency_ms": {
+            "p50": _round_ms(_percentile(latencies, 0.5)),
+            "p95": _round_ms(_percentile(latencies, 0.95)),
+            "p99": _round_ms(_percentile(latencies, 0.99)),
+            "mean": _round_ms(sum(latencies) / len(latencies) if latencies else None),
+            "max": _round_ms(latencies[-1] if latencies else None),
+        },
+    }
@@ -0,0 +1,153 @@
+"""
+Benchmark runner - Starts the stub backend and the API with the fake LLM, then load-tests the endpoints
+
+Usage:
+    python -m bench.run_bench --sizes 200x1000,1000x10000 --requests 200 --concurrency 16
+    python -m bench.run_bench --endpoints assignment --qps 20 --llm-latency-ms 300 --output bench.json
+
+Each size is "<skills>x<technicians>". For every size a fresh stub backend and API
+process are started, so caches and catalogs never carry over between runs.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+import requests
+from bench.load_generator import assignment_payload, evaluation_payload, run_load
+from bench.stub_backend import StubBackend
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = {
+    "assignment": "/api/ticket-assignment",
+    "evaluation": "/api/evaluate-skills",
+}
+
+def parse_sizes(value: str) -> List[Tuple[int, int]]:
+    """Parse "200x1000,1000x10000" into (skills, technicians) pairs"""
+    sizes = []
+    for size in value.split(","):
+        skills, _, technicians = size.strip().lower().partition("x")
+        sizes.append((int(skills), int(technicians)))
+    return sizes
+
+def start_app(port: int, backend_url: str, args: argparse.Namespace, workdir: str) -> Tuple[subprocess.Popen, str]:
+    """Start app.py against the stub backend with the fake LLM and wait until it is healthy"""
+    env = dict(os.environ)
+    env.update({
+        "PORT": str(port),
+        "FLASK_ENV": "production",
+        "LOG_LEVEL": args.log_level,
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_LATENCY_MS": str(args.llm_latency_ms),
+        "FAKE_LLM_JITTER_MS": str(args.llm_jitter_ms),
+        "BACKEND_SERVER_URL": backend_url,
+        "SKILLS_API_URL": f"{backend_url}/api/v1/skills/all",
+        "TECHNICIANS_API_URL": f"{backend_url}/api/v1/technicians/search",
+        "OUTBOX_JOURNAL_PATH": os.path.join(workdir, "outbox.jsonl"),
+    })
+    log_path = os.path.join(workdir, "app.log")
+    log = open(log_path, "w")
+    process = subprocess.Popen([sys.executable, "app.py"], cwd=APP_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    log.close()
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            with open(log_path) as app_log:
+                raise RuntimeError(f"API exited with code {process.returncode}:\n{app_log.read()[-2000:]}")
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    stop_app(process)
+    raise RuntimeError(f"API did not become healthy within {args.startup_timeout}s, see {log_path}")
+
+def stop_app(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def bench_size(skills: int, technicians: int, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Benchmark every selected endpoint against one catalog and roster size"""
+    results = []
+    stub = StubBackend(skills=skills, technicians=technicians, seed=args.seed).start()
+    with tempfile.TemporaryDirectory(prefix="neurodesk-bench-") as workdir:
+        process, base_url = start_app(args.port, stub.url, args, workdir)
+        try:
+            for endpoint in args.endpoints:
+                if endpoint == "assignment":
+                    make_payload = assignment_payload(args.seed)
+                else:
+                    make_payload = evaluation_payload(skills, technicians, args.seed)
+                url = f"{base_url}{ENDPOINTS[endpoint]}"
+                if args.warmup:
+                    run_load(url, make_payload, args.warmup, concurrency=min(args.concurrency, args.warmup))
+                backend_before = dict(stub.requests)
+                result = run_load(url, make_payload, args.requests, concurrency=args.concurrency, qps=args.qps)
+                results.append({
+                    "endpoint": endpoint,
+                    "skills": skills,
+                    "technicians": technicians,
+                    **result,
+                    "backend_requests": {route: count - backend_before.get(route, 0) for route, count in stub.requests.items() if count - backend_before.get(route, 0)},
+                })
+                print(f"{endpoint} {skills}x{technicians}: {result['throughput_rps']} req/s, p50 {result['latency_ms']['p50']}ms, p99 {result['latency_ms']['p99']}ms, {result['failed']} failed", file=sys.stderr)
+        finally:
+            stop_app(process)
+            stub.stop()
+    return results
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline load test of the NeuroDesk AI backend")
+    parser.add_argument("--sizes", default="200x1000", help="Comma-separated <skills>x<technicians> sizes (default: 200x1000)")
+    parser.add_argument("--endpoints", default="assignment,evaluation", help="Comma-separated endpoints: assignment, evaluation")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint and size")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests sent first to fill caches")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent workers (closed loop), or the worker cap with --qps")
+    parser.add_argument("--qps", type=float, default=None, help="Target request rate (open loop) instead of closed-loop concurrency")
+    parser.add_argument("--llm-latency-ms", type=float, default=50, help="Simulated latency of each LLM call")
+    parser.add_argument("--llm-jitter-ms", type=float, default=20, help="Random extra latency of each LLM call")
+    parser.add_argument("--seed", type=int, default=7, help="Seed of the synthetic data and payloads")
+    parser.add_argument("--port", type=int, default=8050, help="Port of the API process under test")
+    parser.add_argument("--startup-timeout", type=float, default=60, help="Seconds to wait for the API to become healthy")
+    parser.add_argument("--log-level", default="WARNING", help="LOG_LEVEL of the API process")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+    args.endpoints = [endpoint.strip() for endpoint in args.endpoints.split(",") if endpoint.strip()]
+    unknown = [endpoint for endpoint in args.endpoints if endpoint not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    report = {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "qps": args.qps,
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_jitter_ms": args.llm_jitter_ms,
+            "seed": args.seed,
+        },
+        "results": [result for skills, technicians in parse_sizes(args.sizes) for result in bench_size(skills, technicians, args)],
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(output + "\n")
+    else:
+        print(output)
+    return 0 if all(result["failed"] == 0 for result in report["results"]) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Stub backend - Local stand-in for the Node backend endpoints used by the AI backend
+
+Serves a deterministic synthetic skill catalog and technician roster of any size,
+so benchmarks run offline and scale the data without a database.
+"""
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+AREAS = [
+    "Network", "VPN", "Firewall", "Email", "Printer", "Database", "Cloud", "Backup", "Identity", "Endpoint",
+    "Storage", "Linux", "Windows", "macOS", "Mobile", "Web", "API", "Security", "Telephony", "Hardware",
+]
+TOPICS = [
+    "Troubleshooting", "Configuration", "Administration", "Migration", "Monitoring", "Hardening",
+    "Recovery", "Automation", "Provisioning", "Performance", "Patching", "Integration",
+]
+FIRST_NAMES = ["Alice", "Bob", "Carol", "David", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy", "Mallory", "Niaj", "Olivia", "Peggy", "Rupert", "Sybil", "Trent", "Victor", "Walter", "Yasmin"]
+LAST_NAMES = ["Smith", "Jones", "Brown", "Taylor", "Wilson", "Davies", "Evans", "Thomas", "Roberts", "Walker", "Wright", "Hughes", "Green", "Hall", "Wood", "Clarke"]
+AVAILABILITY = ["available", "available", "available", "busy", "in_meeting", "on_break", "focus_mode"]
+SKILL_LEVELS = ["junior", "mid", "senior", "expert"]
+
+def build_catalog(skill_count: int) -> List[Dict[str, Any]]:
+    """Build `skill_count` distinct skills named after an area and a topic"""
+    skills = []
+    for index in range(skill_count):
+        area = AREAS[index % len(AREAS)]
+        topic = TOPICS[(index // len(AREAS)) % len(TOPICS)]
+        generation = index // (len(AREAS) * len(TOPICS))
+        name = f"{area} {topic}" if generation == 0 else f"{area} {topic} {generation + 1}"
+        skills.append({"id": index + 1, "name": name, "description": f"{topic} of {area.lower()} systems"})
+    return skills
+
+def build_roster(technician_count: int, skill_count: int, skills_per_technician: int = 6, seed: int = 7) -> List[Dict[str, Any]]:
+    """Build `technician_count` active technicians with random skills, workload and availability"""
+    rng = random.Random(seed)
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    technicians = []
+    for index in range(technician_count):
+        skill_ids = rng.sample(range(1, skill_count + 1), min(skills_per_technician, skill_count))
+        updated_at = created_at + timedelta(minutes=index)
+        technicians.append({
+            "id": index + 1,
+            "name": f"{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]} {index + 1}",
+            "user_id": 10000 + index,
+            "assigned_tickets_total": rng.randint(0, 400),
+            "assigned_tickets": [],
+            "skills": [{"id": skill_id, "percentage": rng.randint(20, 100)} for skill_id in skill_ids],
+            "workload": rng.randint(0, 100),
+            "availability_status": rng.choice(AVAILABILITY),
+            "skill_level": rng.choice(SKILL_LEVELS),
+            "specialization": AREAS[skill_ids[0] % len(AREAS)] if skill_ids else None,
+            "is_active": True,
+            "created_at": created_at.isoformat().replace("+00:00", "Z"),
+            "updated_at": updated_at.isoformat().replace("+00:00", "Z"),
+        })
+    return technicians
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections when they exit are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+class StubBackend:
+    """
+    HTTP server answering like the Node backend for the endpoints the AI backend calls
+
+    `/skills/all` honours `If-None-Match`, `/technicians/by-skills` pages like the real
+    endpoint (workload then name, 10 per page by default) and `/tickets/process-skills`
+    assigns IDs to new skills so later catalog reads include them.
+    """
+
+    def __init__(self, skills: int = 200, technicians: int = 1000, skills_per_technician: int = 6, seed: int = 7):
+        self.catalog = build_catalog(skills)
+        self.roster = build_roster(technicians, skills, skills_per_technician, seed)
+        self.roster_by_id = {tech["id"]: tech for tech in self.roster}
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._catalog_body, self._catalog_etag = self._encode_catalog()
+        self._all_body = self._encode({"success": True, "data": {"technicians": self.roster}})
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _encode(self, payload: Any) -> bytes:
+        return json.dumps(payload).encode("utf-8")
+
+    def _encode_catalog(self) -> Tuple[bytes, str]:
+        body = self._encode({"success": True, "data": {"skills": self.catalog}})
+        return body, '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> "StubBackend":
+        """Serve on a background thread; port 0 picks a free port"""
+        self._server = _Server((host, port), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-backend", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _count(self, route: str):
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def handle_get(self, path: str, query: Dict[str, List[str]], headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        if path == "/api/v1/skills/all":
+            self._count("skills_all")
+            with self._lock:
+                body, etag = self._catalog_body, self._catalog_etag
+            if headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag}, b""
+            return 200, {"ETag": etag}, body
+
+        if path == "/api/v1/technicians/all":
+            self._count("technicians_all")
+            return 200, {}, self._all_body
+
+        if path == "/api/v1/technicians/by-skills":
+            self._count("technicians_by_skills")
+            skill_ids = {int(value) for raw in query.get("skills", []) for value in raw.split(",") if value.strip().isdigit()}
+            if not skill_ids:
+                return 400, {}, self._encode({"success": False, "message": "Skills parameter is required"})
+            page = int(query.get("page", ["1"])[0])
+            limit = int(query.get("limit", ["10"])[0])
+            matches = [tech for tech in self.roster if any(skill["id"] in skill_ids for skill in tech["skills"])]
+            matches.sort(key=lambda tech: (tech["workload"], tech["name"]))
+            return 200, {}, self._encode({"success": True, "data": {"technicians": matches[(page - 1) * limit:page * limit]}})
+
+        if path == "/api/v1/technicians":
+            # Roster delta refresh: the synthetic roster never changes
+            self._count("technicians_delta")
+            # Same bound as the backend's `limit` validation
+            if not 1 <= int(query.get("limit", ["10"])[0]) <= 100:
+                return 400, {}, self._encode({"success": False, "message": "Validation errors", "errors": [{"path": "limit", "msg": "Limit must be between 1 and 100"}]})
+            return 200, {}, self._encode({"success": True, "data": {"technicians": [], "pagination": {"hasNextPage": False}}})
+
+        match = re.fullmatch(r"/api/v1/technicians/(\d+)", path)
+        if match:
+            self._count("technician_by_id")
+            technician = self.roster_by_id.get(int(match.group(1)))
+            if technician is None:
+                return 404, {}, self._encode({"success": False, "message": "Technician not found"})
+            return 200, {}, self._encode({"success": True, "data": technician})
+
+        return 404, {}, self._encode({"success": False, "message": "Not found"})
+
+    def handle_post(self, path: str, payload: Any) -> Tuple[int, Dict[str, str], bytes]:
+        if path == "/api/v1/tickets/process-skills":
+            self._count("process_skills")
+            created = []
+            with self._lock:
+                names = {skill["name"].lower() for skill in self.catalog}
+                for skill in (payload or {}).get("skills", []):
+                    if skill.get("id") is None and skill.get("name") and skill["name"].lower() not in names:
+                        created.append({"id": len(self.catalog) + 1, "name": skill["name"], "description": skill.get("description", "")})
+                        self.catalog.append(created[-1])
+                        names.add(skill["name"].lower())
+                if created:
+                    self._catalog_body, self._catalog_etag = self._encode_catalog()
+            return 200, {}, self._encode({"success": True, "data": {"created_skills": created}})
+
+        return 404, {}, self._encode({"success": False, "message": "Not found"})
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, status: int, headers: Dict[str, str], body: bytes):
+                self.send_response(status)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                self._respond(*stub.handle_get(url.path, parse_qs(url.query), dict(self.headers.items())))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                try:
+                    payload = json.loads(body) if body else None
+                except json.JSONDecodeError:
+                    self._respond(400, {}, stub._encode({"success": False, "message": "Invalid JSON"}))
+                    return
+                self._respond(*stub.handle_post(urlparse(self.path).path, payload))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
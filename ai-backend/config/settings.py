@@ -10,21 +10,102 @@ load_dotenv()
 class Config:
     """Base configuration class"""
     
+    # LLM Provider ("openai", or "fake" for the deterministic offline model used by benchmarks)
+    LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'openai')
+    FAKE_LLM_LATENCY_MS = float(os.getenv('FAKE_LLM_LATENCY_MS', '0'))
+    FAKE_LLM_JITTER_MS = float(os.getenv('FAKE_LLM_JITTER_MS', '0'))
+    # LLM cassette ("off", "record" or "replay") for reproducible runs without the model
+    LLM_CASSETTE_MODE = os.getenv('LLM_CASSETTE_MODE', 'off')
+    LLM_CASSETTE_PATH = os.getenv('LLM_CASSETTE_PATH', '.cassettes/llm.jsonl')
+    LLM_CASSETTE_REPLAY_LATENCY = os.getenv('LLM_CASSETTE_REPLAY_LATENCY', 'false').lower() == 'true'
+
     # OpenAI Configuration
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     OPENAI_MODEL = os.getenv('OPENAI_MODEL')
     OPENAI_TEMPERATURE = float(os.getenv('OPENAI_TEMPERATURE', '0.7'))
+    # Token prices used to report LLM cost alongside token usage
+    LLM_PROMPT_COST_PER_1K_TOKENS = float(os.getenv('LLM_PROMPT_COST_PER_1K_TOKENS', '0'))
+    LLM_COMPLETION_COST_PER_1K_TOKENS = float(os.getenv('LLM_COMPLETION_COST_PER_1K_TOKENS', '0'))
+    # Stream LLM responses so the pipeline can move on before a response has finished
+    LLM_STREAMING = os.getenv('LLM_STREAMING', 'false').lower() == 'true'
+
+    # Technician Selection Configuration ("llm" or "scoring")
+    SELECTION_ENGINE = os.getenv('SELECTION_ENGINE', 'llm')
+    SELECTION_CANDIDATE_K = int(os.getenv('SELECTION_CANDIDATE_K', '15'))
+
+    # Pipeline Configuration ("sequential" or "speculative")
+    PIPELINE_MODE = os.getenv('PIPELINE_MODE', 'sequential')
+    SPECULATIVE_SKILL_K = int(os.getenv('SPECULATIVE_SKILL_K', '5'))
+    SPECULATIVE_PREFETCH_WORKERS = int(os.getenv('SPECULATIVE_PREFETCH_WORKERS', '8'))
     
     # Flask Configuration
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     PORT = int(os.getenv('PORT', 8000))
     DEBUG = FLASK_ENV == 'development'
+    ASGI_PORT = int(os.getenv('ASGI_PORT', 8001))
     
     # External API Configuration
     BACKEND_SERVER_URL = os.getenv('BACKEND_SERVER_URL', 'http://172.16.15.115:5000')
     SKILLS_API_URL = os.getenv('SKILLS_API_URL', 'http://172.16.15.115:5000/api/v1/skills/all')
     TECHNICIANS_API_URL = os.getenv('TECHNICIANS_API_URL', 'http://172.16.15.115:5000/api/v1/technicians/search')
-    
+
+    # Backend HTTP Client Configuration
+    BACKEND_POOL_SIZE = int(os.getenv('BACKEND_POOL_SIZE', '20'))
+    BACKEND_POOL_HOSTS = int(os.getenv('BACKEND_POOL_HOSTS', '4'))
+    BACKEND_POOL_BLOCK = os.getenv('BACKEND_POOL_BLOCK', 'false').lower() == 'true'
+    BACKEND_CONNECT_TIMEOUT = float(os.getenv('BACKEND_CONNECT_TIMEOUT', '3'))
+    BACKEND_READ_TIMEOUT = float(os.getenv('BACKEND_READ_TIMEOUT', '10'))
+    BACKEND_MAX_RETRIES = int(os.getenv('BACKEND_MAX_RETRIES', '2'))
+
+    # Cache Configuration
+    SKILL_CATALOG_TTL_SECONDS = float(os.getenv('SKILL_CATALOG_TTL_SECONDS', '300'))
+    SKILL_SHORTLIST_K = int(os.getenv('SKILL_SHORTLIST_K', '40'))
+    EXTRACTION_CACHE_ENABLED = os.getenv('EXTRACTION_CACHE_ENABLED', 'true').lower() == 'true'
+    EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv('EXTRACTION_CACHE_MAX_ENTRIES', '2048'))
+    EXTRACTION_CACHE_TTL_SECONDS = float(os.getenv('EXTRACTION_CACHE_TTL_SECONDS', '3600'))
+    DEDUP_ENABLED = os.getenv('DEDUP_ENABLED', 'true').lower() == 'true'
+    DEDUP_MAX_ENTRIES = int(os.getenv('DEDUP_MAX_ENTRIES', '5000'))
+    DEDUP_TTL_SECONDS = float(os.getenv('DEDUP_TTL_SECONDS', '1800'))
+    DEDUP_MAX_DISTANCE = int(os.getenv('DEDUP_MAX_DISTANCE', '7'))
+    ROSTER_CACHE_ENABLED = os.getenv('ROSTER_CACHE_ENABLED', 'true').lower() == 'true'
+    ROSTER_REFRESH_INTERVAL_SECONDS = float(os.getenv('ROSTER_REFRESH_INTERVAL_SECONDS', '15'))
+    ROSTER_MAX_STALENESS_SECONDS = float(os.getenv('ROSTER_MAX_STALENESS_SECONDS', '60'))
+    ROSTER_DELTA_PAGE_SIZE = int(os.getenv('ROSTER_DELTA_PAGE_SIZE', '100'))
+
+    # Extraction Micro-Batching Configuration
+    EXTRACTION_BATCH_ENABLED = os.getenv('EXTRACTION_BATCH_ENABLED', 'false').lower() == 'true'
+    EXTRACTION_BATCH_MAX_SIZE = int(os.getenv('EXTRACTION_BATCH_MAX_SIZE', '8'))
+    EXTRACTION_BATCH_WAIT_MS = float(os.getenv('EXTRACTION_BATCH_WAIT_MS', '25'))
+    EXTRACTION_BATCH_FALLBACK = os.getenv('EXTRACTION_BATCH_FALLBACK', 'true').lower() == 'true'
+
+    # Batch Assignment Configuration
+    BATCH_MAX_TICKETS = int(os.getenv('BATCH_MAX_TICKETS', '500'))
+    BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', '8'))
+
+    # Skill Evaluation Configuration
+    EVALUATION_TIMEOUT_SECONDS = float(os.getenv('EVALUATION_TIMEOUT_SECONDS', '30'))
+    EVALUATION_COMBINED_CALL = os.getenv('EVALUATION_COMBINED_CALL', 'false').lower() == 'true'
+    EVALUATION_LLM_WORKERS = int(os.getenv('EVALUATION_LLM_WORKERS', '8'))
+    EVALUATION_BATCH_MAX_TICKETS = int(os.getenv('EVALUATION_BATCH_MAX_TICKETS', '500'))
+    EVALUATION_BATCH_CONCURRENCY = int(os.getenv('EVALUATION_BATCH_CONCURRENCY', '8'))
+
+    # Skill Notification Outbox Configuration
+    OUTBOX_ENABLED = os.getenv('OUTBOX_ENABLED', 'true').lower() == 'true'
+    OUTBOX_JOURNAL_PATH = os.getenv('OUTBOX_JOURNAL_PATH', '.outbox/skill_notifications.jsonl')
+    OUTBOX_MAX_PENDING = int(os.getenv('OUTBOX_MAX_PENDING', '10000'))
+    OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '50'))
+    OUTBOX_BATCH_WINDOW_SECONDS = float(os.getenv('OUTBOX_BATCH_WINDOW_SECONDS', '0.2'))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '6'))
+    OUTBOX_BACKOFF_SECONDS = float(os.getenv('OUTBOX_BACKOFF_SECONDS', '1'))
+    OUTBOX_COMPACT_AFTER = int(os.getenv('OUTBOX_COMPACT_AFTER', '1000'))
+
+    # Metrics Configuration
+    METRICS_PERCENTILE_WINDOW = int(os.getenv('METRICS_PERCENTILE_WINDOW', '1024'))
+
+    # Startup Configuration
+    STARTUP_WARMUP = os.getenv('STARTUP_WARMUP', 'false').lower() == 'true'
+    STARTUP_WARMUP_CONNECTIONS = int(os.getenv('STARTUP_WARMUP_CONNECTIONS', '4'))
+
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
@@ -32,6 +113,6 @@ class Config:
     @classmethod
     def validate(cls):
         """Validate required configuration"""
-        if not cls.OPENAI_API_KEY:
+        if cls.LLM_PROVIDER == 'openai' and cls.LLM_CASSETTE_MODE != 'replay' and not cls.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY is required")
         return True 
\ No newline at end of file
@@ -139,6 +139,21 @@ class TicketAssignmentResponse(BaseModel):
     selected_technician_id: Optional[int] = Field(None, description="Selected technician ID")
     justification: Optional[str] = Field(None, description="Justification for the selection")
     error_message: Optional[str] = Field(None, description="Error message if assignment failed")
+    diagnostics: Optional[Dict[str, Any]] = Field(None, description="Pipeline diagnostics for this assignment")
+
+class TicketBatchResult(TicketAssignmentResponse):
+    """Assignment result for one ticket of a batch"""
+    index: int = Field(..., description="Position of the ticket in the batch request")
+    ticket_id: Optional[int] = Field(None, description="ID of the ticket")
+
+class TicketBatchAssignmentResponse(BaseModel):
+    """Response model for batch ticket assignment"""
+    success: bool = Field(..., description="Whether every ticket in the batch was assigned")
+    total: int = Field(..., description="Number of tickets in the batch")
+    succeeded: int = Field(..., description="Number of tickets assigned")
+    failed: int = Field(..., description="Number of tickets that failed")
+    results: List[TicketBatchResult] = Field(..., description="Per-ticket results in request order")
+    diagnostics: Optional[Dict[str, Any]] = Field(None, description="Pipeline diagnostics for the batch")
     
 class TicketSummary(BaseModel):
     """Simplified ticket model for API requests"""
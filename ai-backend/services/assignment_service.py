@@ -1,36 +1,110 @@
 """
 Main assignment service - Step 1: Extract skills from ticket using provided skills list
 """
-from datetime import datetime
+import contextvars
 import logging
 import time
 import requests
-from typing import Dict, Any, Optional, List, Tuple
-from langchain_openai import ChatOpenAI
-from models.ticket import Ticket, TicketAssignmentResponse, SkillScoreSimple
+from pydantic import ValidationError
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional, List, Tuple
+from models.ticket import Ticket, TicketAssignmentResponse, TicketBatchAssignmentResponse, TicketBatchResult, SkillScoreSimple
 from models.skill import Skill
-from models.technician import AvailabilityStatus, SkillLevel, SkillObject, Technician
+from models.technician import Technician
 from services.skill_extraction import SkillExtractionService
 from services.technician_selection import TechnicianSelectionService
+from services.technician_scoring import TechnicianScoringService
+from services.backend_client import get_backend_client
+from services.skill_catalog import CatalogSnapshot, get_skill_catalog
+from services.technician_roster import CompactTechnician, get_technician_roster
+from services.ticket_dedup import NearDuplicateIndex
+from services.skill_outbox import get_skill_outbox
+from services.metrics import get_stage_summary, track_stage
+from services.stage_timer import StageTimer
+from services.token_usage import current_token_usage, get_token_totals, tracks_token_usage
 from config.settings import Config
 
+if TYPE_CHECKING:
+    # Only for annotations; importing langchain_openai pulls in the whole openai SDK
+    from langchain_openai import ChatOpenAI
+
 logger = logging.getLogger(__name__)
 
+SELECTION_ENGINES = ("llm", "scoring")
+PIPELINE_MODES = ("sequential", "speculative")
+
+# Default page size of `/technicians/by-skills`: a full page may be missing matches
+BY_SKILLS_PAGE_SIZE = 10
+
+@dataclass
+class Speculation:
+    """A technician fetch started before the ticket's skills were known"""
+    future: Any
+    predicted_skill_ids: set
+    full_roster: bool
+    local_roster: bool = False
+
+@dataclass(frozen=True)
+class AssignmentContext:
+    """
+    Per-request state of one assignment run
+
+    Created when the request has been validated and the catalog snapshot taken, then
+    passed to every stage instead of being kept on the service, so one service
+    instance can run any number of assignments concurrently. Fields cannot be
+    reassigned; the timer and diagnostics belong to this run alone and only collect
+    what it records.
+    """
+    ticket: Ticket
+    snapshot: CatalogSnapshot
+    selection_engine: str
+    pipeline_mode: str
+    use_cache: bool
+    timer: StageTimer
+    diagnostics: Dict[str, Any]
+    technician_pool: Optional[List[Technician]] = None
+
+    @property
+    def available_skills(self) -> List[Skill]:
+        return self.snapshot.skills
+
+    def finish_diagnostics(self, speculation: Optional[Speculation] = None) -> Dict[str, Any]:
+        """Add the stage timings and token usage of the run, and get the diagnostics for the response"""
+        self.diagnostics["timings"] = self.timer.as_dict()
+        self.diagnostics["token_usage"] = current_token_usage().as_dict()
+        if speculation is not None and "predicted_skill_ids" in self.diagnostics.get("speculation", {}):
+            self.diagnostics["speculation"]["overlap_ms"] = self.timer.overlap_ms("prefetch", "extraction")
+        return self.diagnostics
+
 class AssignmentService:
     """Main service for orchestrating ticket assignment workflow"""
     
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: "ChatOpenAI"):
         self.llm = llm
         self.skill_extraction_service = SkillExtractionService(llm)
         self.technician_selection_service = TechnicianSelectionService(llm)
-        self._ticket_id = None
+        self.technician_scoring_service = TechnicianScoringService()
+        self.backend = get_backend_client()
+        self.skill_catalog = get_skill_catalog()
+        self.ticket_dedup = NearDuplicateIndex() if Config.DEDUP_ENABLED else None
+        self.skill_outbox = get_skill_outbox() if Config.OUTBOX_ENABLED else None
+        if self.skill_outbox is not None:
+            self.skill_outbox.start()
+        self.technician_roster = get_technician_roster() if Config.ROSTER_CACHE_ENABLED else None
+        if self.technician_roster is not None:
+            self.technician_roster.start()
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=Config.SPECULATIVE_PREFETCH_WORKERS, thread_name_prefix="technician-prefetch")
         
-    def process_ticket_assignment(self, request_data: Dict[str, Any]) -> TicketAssignmentResponse:
+    @tracks_token_usage("ticket_assignment")
+    def process_ticket_assignment(self, request_data: Dict[str, Any], snapshot: CatalogSnapshot = None, technician_pool: List[Technician] = None) -> TicketAssignmentResponse:
         """
         Process ticket assignment - Step 1: Extract skills from ticket
         
         Args:
             request_data: Dictionary containing ticket and skills information
+            snapshot: Skill catalog snapshot to use instead of reading the shared catalog
+            technician_pool: Prefetched technicians to match against instead of querying the backend
             
         Returns:
             TicketAssignmentResponse with the extracted skills
@@ -39,30 +113,32 @@ class AssignmentService:
         try:    
             logger.info("Starting ticket assignment process - Step 1")
             
-            # Step 1: Extract and validate ticket data
-            ticket = self._extract_and_validate_ticket(request_data)
+            # Steps 1-2: Validate the ticket and take the catalog snapshot this run works against
+            context = self._create_context(request_data, snapshot=snapshot, technician_pool=technician_pool)
+            timer = context.timer
 
-            self._ticket_id = ticket.id
-            
-            # Step 2: Get available skills from backend
-            available_skills = self._get_available_skills()
+            # Technicians for the likely skills are fetched while the LLM extracts the actual ones
+            speculation = None
+            if context.pipeline_mode == "speculative" and technician_pool is None:
+                speculation = self._start_speculative_fetch(context)
         
             # Step 3: Extract skills from ticket using available skills list & LLM
-            extracted_skill_names = self._extract_skills_from_ticket(ticket, available_skills)
+            with timer.stage("extraction"):
+                extracted_skill_names = self._extract_skills_from_ticket(context, stream=Config.LLM_STREAMING)
             
             # Step 4: Convert skill names to SkillScoreSimple objects
-            existing_extracted_skills = self._get_skill_objects(extracted_skill_names["existing_skills"], available_skills)
+            existing_extracted_skills = self._get_skill_objects(extracted_skill_names["existing_skills"], context.available_skills)
 
-            self._notify_extracted_skills(extracted_skill_names, existing_extracted_skills)
+            with timer.stage("notify"):
+                self._notify_extracted_skills(context, extracted_skill_names, existing_extracted_skills)
 
             # Step 5: Get technicians that match the extracted skills from backend
-            technicians = self._get_technicians(existing_extracted_skills)
-
-            if len(technicians) == 0:
-                technicians = self._get_technicians(existing_extracted_skills, by_skills=False)
+            with timer.stage("technicians"):
+                technicians = self._resolve_technicians(context, existing_extracted_skills, speculation)
             
             # Step 6: Select the best technician based on the extracted skills
-            selected_technician, justification = self._select_best_technician(technicians, existing_extracted_skills, ticket)
+            with timer.stage("selection"):
+                selected_technician, justification = self._select_best_technician(context, technicians, existing_extracted_skills)
 
             # Step 7: Return the result
             return TicketAssignmentResponse(
@@ -70,6 +146,7 @@ class AssignmentService:
                 selected_technician_id=selected_technician.id,
                 justification=justification,
                 error_message=None,
+                diagnostics=context.finish_diagnostics(speculation),
             )
             
         except Exception as e:
@@ -80,7 +157,200 @@ class AssignmentService:
                 justification=None,
                 error_message=str(e),
             )
+
+    @tracks_token_usage("ticket_assignment_stream")
+    def stream_ticket_assignment(self, request_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Process ticket assignment, yielding each result as soon as it is known
+        
+        Both LLM responses are streamed: the technician lookup starts as soon as the skills
+        array has streamed, and the justification is passed on piece by piece.
+        
+        Args:
+            request_data: Dictionary containing ticket information
+            
+        Yields:
+            Events as {"event": name, "data": payload}, in order: `skills`, `technician`,
+            one or more `justification` deltas, then `done` with the full response.
+            An `error` event with the failed response ends the stream early.
+        """
+        try:
+            logger.info("Starting streamed ticket assignment process")
+
+            context = self._create_context(request_data, streamed=True)
+            ticket, timer, diagnostics = context.ticket, context.timer, context.diagnostics
+
+            speculation = None
+            if context.pipeline_mode == "speculative":
+                speculation = self._start_speculative_fetch(context)
+
+            with timer.stage("extraction"):
+                extracted_skill_names = self._extract_skills_from_ticket(context, stream=True)
+            existing_extracted_skills = self._get_skill_objects(extracted_skill_names["existing_skills"], context.available_skills)
+
+            yield {"event": "skills", "data": {
+                "existing_skills": [{"id": skill.id, "name": skill.name} for skill in existing_extracted_skills],
+                "new_skills": extracted_skill_names.get("new_skills", []),
+                "elapsed_ms": timer.as_dict()["total_ms"],
+            }}
+
+            with timer.stage("notify"):
+                self._notify_extracted_skills(context, extracted_skill_names, existing_extracted_skills)
+
+            with timer.stage("technicians"):
+                technicians = self._resolve_technicians(context, existing_extracted_skills, speculation)
+            diagnostics["candidate_technicians"] = len(technicians)
+
+            with timer.stage("selection"):
+                if context.selection_engine == "scoring":
+                    selected_technician, justification = self.technician_scoring_service.select_technician_for_ticket(ticket, technicians, existing_extracted_skills)
+                    selection_events = [("technician", selected_technician), ("justification", justification or ""), ("done", (selected_technician, justification))]
+                else:
+                    technicians, diagnostics["pruned_technicians"] = self.technician_selection_service.prune_candidates(ticket, technicians, existing_extracted_skills)
+                    selection_events = self.technician_selection_service.stream_select_technician(ticket, technicians, existing_extracted_skills)
+
+                for kind, value in selection_events:
+                    if kind == "technician":
+                        yield {"event": "technician", "data": {
+                            "selected_technician_id": value.id if value else None,
+                            "name": value.name if value else None,
+                            "elapsed_ms": timer.as_dict()["total_ms"],
+                        }}
+                    elif kind == "justification":
+                        yield {"event": "justification", "data": {"delta": value}}
+                    else:
+                        selected_technician, justification = value
+
+            yield {"event": "done", "data": TicketAssignmentResponse(
+                success=True,
+                selected_technician_id=selected_technician.id,
+                justification=justification,
+                error_message=None,
+                diagnostics=context.finish_diagnostics(speculation),
+            ).model_dump()}
+
+        except Exception as e:
+            logger.error(f"Error in streamed ticket assignment process: {str(e)}")
+            yield {"event": "error", "data": TicketAssignmentResponse(
+                success=False,
+                selected_technician_id=None,
+                justification=None,
+                error_message=str(e),
+            ).model_dump()}
+
+    @tracks_token_usage("ticket_assignment_batch")
+    def process_ticket_batch(self, request_data: Dict[str, Any]) -> TicketBatchAssignmentResponse:
+        """
+        Process the assignment of many tickets in one call
+        
+        The skill catalog snapshot and, without the local roster, the technician list are
+        fetched once and shared by every ticket. Tickets are then processed concurrently,
+        at most BATCH_MAX_CONCURRENCY at a time, and a failed ticket does not fail the batch.
+        
+        Args:
+            request_data: Dictionary with a `tickets` list. Top-level `selection_engine` and
+                `use_cache` apply to every ticket that does not set its own
+            
+        Returns:
+            TicketBatchAssignmentResponse with one result per ticket, in request order
+        """
+        tickets = request_data.get("tickets")
+        if not isinstance(tickets, list) or not tickets:
+            raise ValueError("'tickets' must be a non-empty list")
+        if len(tickets) > Config.BATCH_MAX_TICKETS:
+            raise ValueError(f"A batch can contain at most {Config.BATCH_MAX_TICKETS} tickets")
+
+        started_at = time.monotonic()
+        shared_options = {key: request_data[key] for key in ("selection_engine", "use_cache") if key in request_data}
+        payloads = [{**shared_options, **ticket} if isinstance(ticket, dict) else ticket for ticket in tickets]
+
+        snapshot = self.skill_catalog.get_snapshot()
+        technician_pool = None
+        if self.technician_roster is None:
+            technician_pool = self._get_technicians([], by_skills=False)
+
+        concurrency = max(1, min(Config.BATCH_MAX_CONCURRENCY, len(payloads)))
+        logger.info(f"Processing batch of {len(payloads)} tickets with concurrency {concurrency}")
+
+        def assign(payload: Any) -> TicketAssignmentResponse:
+            if not isinstance(payload, dict):
+                return TicketAssignmentResponse(success=False, error_message="Each ticket must be an object")
+            return self.process_ticket_assignment(payload, snapshot=snapshot, technician_pool=technician_pool)
+
+        # Each ticket runs in a copy of this context, so its tokens also count towards the batch
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ticket-batch") as executor:
+            responses = list(executor.map(lambda payload: contextvars.copy_context().run(assign, payload), payloads))
+
+        results = []
+        for index, (payload, response) in enumerate(zip(payloads, responses)):
+            ticket_data = payload.get("ticket", payload) if isinstance(payload, dict) else {}
+            ticket_id = ticket_data.get("id") if isinstance(ticket_data, dict) else None
+            try:
+                result = TicketBatchResult(index=index, ticket_id=ticket_id, **response.model_dump())
+            except ValidationError:
+                # A malformed id fails only its own ticket, which already failed to parse
+                result = TicketBatchResult(index=index, ticket_id=None, **{
+                    **response.model_dump(),
+                    "success": False,
+                    "error_message": response.error_message or f"Invalid ticket id: {ticket_id!r}",
+                })
+            results.append(result)
+
+        succeeded = sum(1 for result in results if result.success)
+        return TicketBatchAssignmentResponse(
+            success=succeeded == len(results),
+            total=len(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            results=results,
+            diagnostics={
+                "concurrency": concurrency,
+                "catalog_version": snapshot.version,
+                "technician_source": "roster" if technician_pool is None else "prefetched",
+                "elapsed_ms": round((time.monotonic() - started_at) * 1000, 1),
+                "token_usage": current_token_usage().as_dict(),
+            },
+        )
     
+    def _create_context(self, request_data: Dict[str, Any], snapshot: CatalogSnapshot = None, technician_pool: List[Technician] = None, **diagnostics: Any) -> AssignmentContext:
+        """
+        Validate an assignment request and start the context of its run
+        
+        Args:
+            request_data: Raw request data
+            snapshot: Skill catalog snapshot to use instead of reading the shared catalog
+            technician_pool: Prefetched technicians to match against instead of querying the backend
+            **diagnostics: Extra diagnostics reported for this run
+            
+        Returns:
+            AssignmentContext of the run, with its `catalog` stage timed
+        """
+        timer = StageTimer("assignment")
+        with track_stage("assignment", "validation"):
+            ticket = self._extract_and_validate_ticket(request_data)
+
+        with timer.stage("catalog"):
+            if snapshot is None:
+                snapshot = self.skill_catalog.get_snapshot()
+        return self._build_context(request_data, ticket, snapshot, timer, technician_pool, diagnostics)
+
+    def _build_context(self, request_data: Dict[str, Any], ticket: Ticket, snapshot: CatalogSnapshot, timer: StageTimer, technician_pool: Optional[List[Technician]], diagnostics: Dict[str, Any]) -> AssignmentContext:
+        """Build the context of a run from its validated ticket and catalog snapshot"""
+        selection_engine = self._get_selection_engine(request_data)
+        pipeline_mode = self._get_pipeline_mode(request_data)
+        logger.info(f"Using skill catalog version {snapshot.version} with {len(snapshot.skills)} skills")
+
+        return AssignmentContext(
+            ticket=ticket,
+            snapshot=snapshot,
+            selection_engine=selection_engine,
+            pipeline_mode=pipeline_mode,
+            use_cache=request_data.get("use_cache", True) is not False,
+            timer=timer,
+            diagnostics={"selection_engine": selection_engine, "pipeline_mode": pipeline_mode, **diagnostics},
+            technician_pool=technician_pool,
+        )
+
     def _extract_and_validate_ticket(self, request_data: Dict[str, Any]) -> Ticket:
         """
         Extract and validate ticket data from request
@@ -186,13 +456,15 @@ class AssignmentService:
             logger.error(f"Error validating skills: {str(e)}")
             raise
     
-    def _extract_skills_from_ticket(self, ticket: Ticket, available_skills: List[str]) -> Dict[str,Any]:
+    def _extract_skills_from_ticket(self, context: AssignmentContext, stream: bool = False) -> Dict[str,Any]:
         """
         Extract skills from ticket using the skill extraction service
         
+        A near-duplicate of a recently processed ticket reuses that ticket's extraction instead of calling the LLM.
+        
         Args:
-            ticket: Ticket object
-            available_skills: List of available skill names to choose from
+            context: Context of the assignment run, whose diagnostics record any reused extraction
+            stream: Stream the LLM response and hand off as soon as the skills array is complete
             
         Returns:
             Dict[str,Any] containing the extracted skill names and the new skills
@@ -200,10 +472,27 @@ class AssignmentService:
         try:
             logger.info("Starting skill extraction (Step 1)")
 
-            available_skills_text = [skill.name for skill in available_skills]
+            ticket = context.ticket
+            catalog_version = context.snapshot.version
+            ticket_text = f"{ticket.subject}\n{ticket.description}"
+
+            reused = self._find_reusable_extraction(context, ticket_text)
+            if reused is not None:
+                return reused
+
+            available_skills_text = self._shortlist_skills(context)
             
             # Extract skills using LLM with available skills list
-            extracted_skills = self.skill_extraction_service.extract_skills_from_ticket(ticket, available_skills_text)
+            extracted_skills = self.skill_extraction_service.extract_skills_from_ticket(
+                ticket, available_skills_text,
+                catalog_version=catalog_version,
+                use_cache=context.use_cache,
+                stream=stream,
+                catalog_skills=[skill.name for skill in context.snapshot.skills]
+            )
+
+            if self.ticket_dedup is not None:
+                self.ticket_dedup.add(ticket_text, ticket.id, catalog_version, extracted_skills)
             
             logger.info(f"Successfully extracted {len(extracted_skills)} skills from ticket")
             return extracted_skills
@@ -212,42 +501,61 @@ class AssignmentService:
             logger.error(f"Error in skill extraction: {str(e)}")
             raise
 
-    def _get_available_skills(self) -> List[Skill]:
+    def _find_reusable_extraction(self, context: AssignmentContext, ticket_text: str) -> Optional[Dict[str, Any]]:
+        """Get the extraction of a recent near-duplicate ticket, if one may be reused"""
+        if not context.use_cache or self.ticket_dedup is None:
+            return None
+        match = self.ticket_dedup.find(ticket_text, context.snapshot.version)
+        if match is None:
+            return None
+        logger.info(f"Reusing skill extraction from near-duplicate ticket {match.ticket_id} (similarity {match.similarity})")
+        context.diagnostics["reused_extraction"] = {
+            "ticket_id": match.ticket_id,
+            "similarity": match.similarity,
+        }
+        return match.extraction
+
+    def _shortlist_skills(self, context: AssignmentContext) -> List[str]:
         """
-        Get available skills from the backend server
+        Get the skill names to offer the LLM for a ticket
+        
+        When SKILL_SHORTLIST_K is set and the catalog is larger than K, only K skills are offered:
+        the skills retrieved by the local BM25 index, best first, padded to K with the rest of
+        the catalog in catalog order. The full catalog is used when nothing matches.
         
+        Args:
+            context: Context of the assignment run, with the ticket and its catalog snapshot
+            
         Returns:
-            List of Skill objects from the backend
+            List of skill names
         """
-        try:
-            logger.info(f"Fetching available skills from: {Config.SKILLS_API_URL}")
-            
-            response = requests.get(Config.SKILLS_API_URL, timeout=10)
+        top_k = Config.SKILL_SHORTLIST_K
+        ticket, snapshot = context.ticket, context.snapshot
+        skill_names = [skill.name for skill in snapshot.skills]
+        if top_k <= 0 or len(skill_names) <= top_k:
+            return skill_names
+
+        query = " ".join([ticket.subject, ticket.description, " ".join(ticket.tags or [])])
+        shortlist = [
+            snapshot.by_name[name.lower().strip()].name for name, _ in self.skill_catalog.get_index(snapshot).search(query, top_k)
+            if name.lower().strip() in snapshot.by_name
+        ]
+
+        if not shortlist:
+            logger.info("No catalog skills matched the ticket text, using the full catalog")
+            return skill_names
+
+        matched = len(shortlist)
+        offered = set(shortlist)
+        for name in skill_names:
+            if len(shortlist) >= top_k:
+                break
+            if name not in offered:
+                shortlist.append(name)
+
+        logger.info(f"Shortlisted {len(shortlist)} of {len(skill_names)} catalog skills for extraction ({matched} matched the ticket)")
+        return shortlist
 
-            response.raise_for_status()
-            
-            skills_data = response.json()
-            
-            # Convert response data to Skill objects
-            skills = []
-            for skill_data in skills_data["data"]["skills"]:
-                try:
-                    skill = Skill(**skill_data)
-                    skills.append(skill)
-                except Exception as e:
-                    logger.warning(f"Failed to parse skill data: {skill_data}, error: {str(e)}")
-                    continue
-            
-            logger.info(f"Successfully fetched {len(skills)} skills from backend")
-            return skills
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to fetch skills from backend: {str(e)}")
-            raise Exception(f"Backend server unavailable: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error processing skills response: {str(e)}")
-            raise
-    
     def _get_skill_objects(self, skill_names: List[str], available_skills: List[Skill]) -> List[Skill]:
         """
         Get skill objects from available skills that match the given skill names
@@ -276,12 +584,15 @@ class AssignmentService:
             logger.error(f"Error filtering skill objects: {str(e)}")
             raise
    
-    def _get_technicians(self, extracted_skills: List[Skill], by_skills: bool = True) -> List[Technician]:
+    def _get_technicians(self, extracted_skills: List[Skill], by_skills: bool = True, technician_pool: List[Technician] = None) -> List[Technician]:
         """
-        Get technicians that match the extracted skills from the backend server
+        Get technicians that match the extracted skills, from a prefetched pool or the local
+        roster when available, or from the backend server otherwise
         
         Args:
             extracted_skills: List of Skill objects representing extracted skills
+            by_skills: Whether to match on the skills, or return every active technician
+            technician_pool: Technicians prefetched for a batch
             
         Returns:
             List of Technician objects that match the skills
@@ -293,6 +604,22 @@ class AssignmentService:
             if not skill_ids and by_skills:
                 logger.warning("No valid skill IDs found for technician search")
                 return []
+
+            if technician_pool is not None:
+                if not by_skills:
+                    return list(technician_pool)
+                return self._filter_by_skills(technician_pool, skill_ids)
+            
+            if self.technician_roster is not None:
+                try:
+                    if by_skills:
+                        technicians = self.technician_roster.get_candidates(skill_ids)
+                    else:
+                        technicians = self.technician_roster.get_all()
+                    logger.info(f"Found {len(technicians)} technicians in local roster for skills: {skill_ids}")
+                    return technicians
+                except Exception as e:
+                    logger.warning(f"Local technician roster unavailable, querying backend: {str(e)}")
             
             logger.info(f"Searching for technicians with skills: {skill_ids}")
             
@@ -307,91 +634,18 @@ class AssignmentService:
                     'skills': skill_ids,  # API accepts array of skill IDs
                 }
             
-                response = requests.get(technicians_url, params=params, timeout=10)
+                response = self.backend.get("technicians_by_skills", technicians_url, params=params)
                 response.raise_for_status()
                 
             else:
                 # Prepare query parameters
                 technicians_url = f"{Config.BACKEND_SERVER_URL}/api/v1/technicians/all"
 
-                response = requests.get(technicians_url, timeout=10)
+                response = self.backend.get("technicians_all", technicians_url)
                 response.raise_for_status()
             
 
-            response_data = response.json()
-            
-            if not response_data.get('success'):
-                raise Exception(f"Backend returned error: {response_data.get('message', 'Unknown error')}")
-            
-            # Extract technicians from the response structure
-            technicians_data = response_data.get('data', {}).get('technicians', [])
-
-            logger.info(f"Total technicians fetched: {len(technicians_data)}")
-            
-            # Convert response data to Technician objects
-            technicians = []
-            for tech_data in technicians_data:
-                try:
-                    # Parse skills data - convert to SkillObject format
-                    skills = []
-                    if tech_data.get('skills'):
-                        for skill_data in tech_data['skills']:
-                            if isinstance(skill_data, dict) and 'id' in skill_data:
-                                skill_obj = SkillObject(
-                                    id=skill_data.get('id'),
-                                    percentage=skill_data.get('percentage', 0)
-                                )
-                                skills.append(skill_obj)
-                    
-                    # Parse assigned tickets (should be array of integers)
-                    assigned_tickets = tech_data.get('assigned_tickets', [])
-                    if not isinstance(assigned_tickets, list):
-                        assigned_tickets = []
-                    
-                    # Parse timestamps
-                    created_at = None
-                    updated_at = None
-                    
-                    if tech_data.get('created_at'):
-                        try:
-                            created_at = datetime.fromisoformat(tech_data['created_at'].replace('Z', '+00:00'))
-                        except (ValueError, AttributeError):
-                            created_at = datetime.now()
-                    else:
-                        created_at = datetime.now()
-                    
-                    if tech_data.get('updated_at'):
-                        try:
-                            updated_at = datetime.fromisoformat(tech_data['updated_at'].replace('Z', '+00:00'))
-                        except (ValueError, AttributeError):
-                            updated_at = datetime.now()
-                    else:
-                        updated_at = datetime.now()
-                    
-                    # Create Technician object with proper field mapping
-                    technician = Technician(
-                        id=tech_data.get('id'),
-                        name=tech_data.get('name'),
-                        user_id=tech_data.get('user_id'),
-                        assigned_tickets_total=tech_data.get('assigned_tickets_total', 0),
-                        assigned_tickets=assigned_tickets,
-                        skills=skills,
-                        workload=tech_data.get('workload', 0),
-                        availability_status=tech_data.get('availability_status', AvailabilityStatus.AVAILABLE),
-                        skill_level=tech_data.get('skill_level', SkillLevel.JUNIOR),
-                        specialization=tech_data.get('specialization'),
-                        is_active=tech_data.get('is_active', True),
-                        created_at=created_at,
-                        updated_at=updated_at
-                    )
-                    technicians.append(technician)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to parse technician data: {tech_data}, error: {str(e)}")
-                    continue
-            
-            logger.info(f"Successfully fetched {len(technicians)} technicians from backend")
-            return technicians
+            return self._parse_technicians_response(response.json())
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch technicians from backend: {str(e)}")
@@ -399,49 +653,247 @@ class AssignmentService:
         except Exception as e:
             logger.error(f"Error processing technicians response: {str(e)}")
             raise
+
+    def _parse_technicians_response(self, response_data: Dict[str, Any]) -> List[CompactTechnician]:
+        """Convert a backend technicians response to compact technician records"""
+        if not response_data.get('success'):
+            raise Exception(f"Backend returned error: {response_data.get('message', 'Unknown error')}")
+        
+        # Extract technicians from the response structure
+        technicians_data = response_data.get('data', {}).get('technicians', [])
+
+        logger.info(f"Total technicians fetched: {len(technicians_data)}")
+        
+        # Convert response data to compact records, without validating a Technician model per record
+        technicians = []
+        for tech_data in technicians_data:
+            try:
+                technicians.append(CompactTechnician(tech_data))
+            except Exception as e:
+                logger.warning(f"Failed to parse technician data: {tech_data}, error: {str(e)}")
+                continue
+        
+        logger.info(f"Successfully fetched {len(technicians)} technicians from backend")
+        return technicians
+
+    def _resolve_technicians(self, context: AssignmentContext, extracted_skills: List[Skill], speculation: Optional[Speculation]) -> List[Technician]:
+        """
+        Get the candidate technicians for the extracted skills, from a speculative fetch when it
+        covers them, otherwise by skills with every active technician as the fallback
+        """
+        if speculation is not None:
+            technicians = self._reconcile_speculation(context, speculation, extracted_skills)
+            if technicians is not None:
+                return technicians
+
+        with track_stage("assignment", "technicians_by_skills"):
+            technicians = self._get_technicians(extracted_skills, technician_pool=context.technician_pool)
+        if len(technicians) == 0:
+            with track_stage("assignment", "technicians_fallback"):
+                technicians = self._get_technicians(extracted_skills, by_skills=False, technician_pool=context.technician_pool)
+        return technicians
+
+    def _filter_by_skills(self, technicians: List[Technician], skill_ids: List[int]) -> List[Technician]:
+        """Technicians with any of the skills, ordered by workload then name like `/technicians/by-skills`"""
+        wanted = set(skill_ids)
+        matching = [tech for tech in technicians if any(skill.id in wanted for skill in tech.skills or [])]
+        matching.sort(key=lambda tech: (tech.workload, tech.name))
+        return matching
         
-    def _notify_extracted_skills(self, extracted_skill_names: Dict[str,Any], existing_extracted_skills: List[Skill]):
+    def _notify_extracted_skills(self, context: AssignmentContext, extracted_skill_names: Dict[str,Any], existing_extracted_skills: List[Skill]):
         """
         Notify the extracted skills to the backend server
+        
+        With the outbox enabled the notification is queued for background delivery
+        and this call returns without waiting for the backend.
+        
+        Args:
+            context: Context of the assignment run the skills were extracted for
+            extracted_skill_names: Extraction result with the existing and new skills
+            existing_extracted_skills: Skill objects of the existing extracted skills
         """
         try:
             logger.info(f"Notifying extracted skills to the backend server")
 
-            data = []
+            ticket_id = context.ticket.id
+            data = self._build_skill_notification(extracted_skill_names, existing_extracted_skills)
 
-            for skill in existing_extracted_skills:
-                data.append({
-                    "id": skill.id,
-                    "name": skill.name,
-                    "description": skill.description,
-                })
-            
-            if extracted_skill_names.get("new_skills"):
-                for skill in extracted_skill_names.get("new_skills"):
-                    data.append({
-                        "name": skill["name"],
-                        "description": skill["description"],
-                    })
+            if not data:
+                logger.info("No extracted skills to notify")
+                return
 
+            if self.skill_outbox is not None:
+                self.skill_outbox.enqueue(ticket_id, data, has_new_skills=bool(extracted_skill_names.get("new_skills")))
+                return
 
-            response = requests.post(f"{Config.BACKEND_SERVER_URL}/api/v1/tickets/process-skills", json={"ticket_id": self._ticket_id, "skills": data}, timeout=10)
+            response = self.backend.post("process_skills", f"{Config.BACKEND_SERVER_URL}/api/v1/tickets/process-skills", json={"ticket_id": ticket_id, "skills": data})
             response.raise_for_status()
 
             if not response.json().get("success"):
                 logger.error(f"Failed to notify extracted skills to the backend server: {response.json().get('message')}")
                 return
 
+            # New skills were created in the backend, so the cached catalog is out of date
+            if extracted_skill_names.get("new_skills"):
+                self.skill_catalog.invalidate_after_create()
+
             logger.info(f"Successfully notified extracted skills to the backend server")
 
         except Exception as e:
             logger.error(f"Error notifying extracted skills: {str(e)}")
 
-    def _select_best_technician(self, technicians: List[Technician], extracted_skills: List[Skill], ticket: Ticket) -> Tuple[Optional[Technician], Optional[str]]:
+    def _build_skill_notification(self, extracted_skill_names: Dict[str,Any], existing_extracted_skills: List[Skill]) -> List[Dict[str, Any]]:
+        """Build the `/tickets/process-skills` skill payloads for an extraction"""
+        data = []
+
+        for skill in existing_extracted_skills:
+            data.append({
+                "id": skill.id,
+                "name": skill.name,
+                "description": skill.description,
+            })
+        
+        if extracted_skill_names.get("new_skills"):
+            for skill in extracted_skill_names.get("new_skills"):
+                data.append({
+                    "name": skill["name"],
+                    "description": skill["description"],
+                })
+        return data
+
+    def _get_pipeline_mode(self, request_data: Dict[str, Any]) -> str:
+        """
+        Get the pipeline mode for this request
+        
+        Args:
+            request_data: Raw request data, which may override the configured mode with `pipeline_mode`
+            
+        Returns:
+            "sequential" or "speculative"
+        """
+        pipeline_mode = request_data.get("pipeline_mode") or Config.PIPELINE_MODE
+        if pipeline_mode not in PIPELINE_MODES:
+            raise ValueError(f"pipeline_mode must be one of {list(PIPELINE_MODES)}")
+        return pipeline_mode
+
+    def _predict_skills(self, ticket: Ticket, snapshot: CatalogSnapshot) -> List[Skill]:
+        """Guess the ticket's skills from the local BM25 index, before the LLM has answered"""
+        top_k = Config.SPECULATIVE_SKILL_K
+        if top_k <= 0:
+            return []
+        query = " ".join([ticket.subject, ticket.description, " ".join(ticket.tags or [])])
+        predicted = []
+        for name, _ in self.skill_catalog.get_index(snapshot).search(query, top_k):
+            skill = snapshot.by_name.get(name.lower().strip())
+            if skill is not None and skill.id is not None:
+                predicted.append(skill)
+        return predicted
+
+    def _start_speculative_fetch(self, context: AssignmentContext) -> Speculation:
+        """
+        Start fetching technicians for the predicted skills on the prefetch pool
+        
+        With no predicted skills the full roster is fetched instead, which any extraction can be matched against.
+        
+        Args:
+            context: Context of the assignment run, whose timer records the `prefetch` stage
+            
+        Returns:
+            Speculation holding the pending fetch
+        """
+        predicted = self._predict_skills(context.ticket, context.snapshot)
+
+        def fetch() -> List[Technician]:
+            with context.timer.stage("prefetch"):
+                if predicted:
+                    return self._get_technicians(predicted)
+                return self._get_technicians([], by_skills=False)
+
+        return Speculation(
+            future=self._prefetch_executor.submit(fetch),
+            predicted_skill_ids={skill.id for skill in predicted},
+            full_roster=not predicted,
+            local_roster=self.technician_roster is not None,
+        )
+
+    def _reconcile_speculation(self, context: AssignmentContext, speculation: Speculation, extracted_skills: List[Skill], prefetched: List[Technician] = None) -> Optional[List[Technician]]:
+        """
+        Match the speculatively fetched technicians against the extracted skills
+        
+        The prefetch is used when it covers every extracted skill: it was the full roster,
+        or the extracted skills are a subset of the predicted ones and the prefetch was not
+        cut off by the page size of `/technicians/by-skills`, which filtering a page for
+        fewer skills would otherwise miss technicians past. Otherwise the caller fetches
+        technicians for the extracted skills as usual.
+        
+        Args:
+            context: Context of the assignment run, whose diagnostics record the speculation outcome
+            speculation: The speculative fetch
+            extracted_skills: Skills extracted by the LLM
+            prefetched: Result of the fetch if already awaited, otherwise it is waited for here
+            
+        Returns:
+            The candidate technicians, or None when the speculation missed
+        """
+        outcome = {
+            "predicted_skill_ids": sorted(speculation.predicted_skill_ids),
+            "full_roster": speculation.full_roster,
+        }
+        context.diagnostics["speculation"] = outcome
+
+        if prefetched is None:
+            try:
+                prefetched = speculation.future.result()
+            except Exception as e:
+                logger.warning(f"Speculative technician fetch failed: {str(e)}")
+                outcome["result"] = "failed"
+                return None
+
+        skill_ids = {skill.id for skill in extracted_skills if skill.id is not None}
+        if speculation.full_roster:
+            outcome["result"] = "hit"
+            return self._filter_by_skills(prefetched, skill_ids) or list(prefetched)
+
+        complete = speculation.local_roster or len(prefetched) < BY_SKILLS_PAGE_SIZE
+        if skill_ids and skill_ids <= speculation.predicted_skill_ids and complete:
+            matching = self._filter_by_skills(prefetched, skill_ids)
+            if matching:
+                outcome["result"] = "hit"
+                return matching
+
+        outcome["result"] = "miss"
+        logger.info(f"Speculative technician fetch missed: extracted {sorted(skill_ids)}, predicted {outcome['predicted_skill_ids']}")
+        return None
+
+    def _get_selection_engine(self, request_data: Dict[str, Any]) -> str:
         """
-        Select the best technician based on the extracted skills
+        Get the technician selection engine for this request
+        
+        Args:
+            request_data: Raw request data, which may override the configured engine with `selection_engine`
+            
+        Returns:
+            "llm" or "scoring"
         """
+        selection_engine = request_data.get("selection_engine") or Config.SELECTION_ENGINE
+        if selection_engine not in SELECTION_ENGINES:
+            raise ValueError(f"selection_engine must be one of {list(SELECTION_ENGINES)}")
+        return selection_engine
 
-        selected_technician, justification = self.technician_selection_service.select_technician_for_ticket(ticket, technicians, extracted_skills)
+    def _select_best_technician(self, context: AssignmentContext, technicians: List[Technician], extracted_skills: List[Skill]) -> Tuple[Optional[Technician], Optional[str]]:
+        """
+        Select the best technician based on the extracted skills, using the LLM or the deterministic scoring engine
+        """
+        ticket, diagnostics = context.ticket, context.diagnostics
+        diagnostics["candidate_technicians"] = len(technicians)
+
+        if context.selection_engine == "scoring":
+            selected_technician, justification = self.technician_scoring_service.select_technician_for_ticket(ticket, technicians, extracted_skills)
+        else:
+            # Bound the prompt size before the LLM sees the candidates
+            technicians, pruned = self.technician_selection_service.prune_candidates(ticket, technicians, extracted_skills)
+            diagnostics["pruned_technicians"] = pruned
+            selected_technician, justification = self.technician_selection_service.select_technician_for_ticket(ticket, technicians, extracted_skills)
 
         if selected_technician:
             return selected_technician, justification
@@ -461,6 +913,16 @@ class AssignmentService:
             "implemented_flows": ["skill_extraction_step1"],
             "pending_flows": ["technician_matching", "technician_selection"],
             "llm_available": self.llm is not None,
+            "backend_client": self.backend.get_pool_stats(),
+            "skill_catalog": self.skill_catalog.get_stats(),
+            "selection_engine": Config.SELECTION_ENGINE,
+            "extraction_cache": self.skill_extraction_service.cache.get_stats(),
+            "extraction_batcher": self.skill_extraction_service.get_batch_stats(),
+            "ticket_dedup": self.ticket_dedup.get_stats() if self.ticket_dedup is not None else None,
+            "skill_outbox": self.skill_outbox.get_stats() if self.skill_outbox is not None else None,
+            "technician_roster": self.technician_roster.get_stats() if self.technician_roster is not None else None,
+            "stage_latency": get_stage_summary(),
+            "token_usage": get_token_totals(),
             "required_request_fields": ["subject", "description", "requester_id"],
             "step1_description": "Extract skills from ticket using provided skills list"
         }
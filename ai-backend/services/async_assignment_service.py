@@ -0,0 +1,231 @@
+"""
+Async assignment service - asyncio version of the ticket assignment workflow for the ASGI app
+"""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple
+import httpx
+from models.ticket import TicketAssignmentResponse
+from models.skill import Skill
+from models.technician import Technician
+from services.assignment_service import AssignmentContext, AssignmentService, Speculation
+from services.async_backend_client import AsyncBackendClient, get_async_backend_client
+from services.metrics import track_stage
+from services.stage_timer import StageTimer
+from services.token_usage import tracks_token_usage
+from config.settings import Config
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+class AsyncAssignmentService(AssignmentService):
+    """
+    Assignment workflow that awaits the LLM and the backend instead of blocking on them
+
+    Validation, caching, near-duplicate reuse, shortlisting, the roster and the
+    scoring engine are shared with AssignmentService. The LLM calls use `ainvoke`
+    and backend calls go through the async client, so a single event loop can hold
+    many assignments in flight. The CPU-bound BM25 and scoring work, roster reads
+    and outbox writes run in worker threads so they do not stall the event loop.
+    """
+
+    def __init__(self, llm: "ChatOpenAI", backend: AsyncBackendClient = None):
+        super().__init__(llm)
+        self.async_backend = backend or get_async_backend_client()
+
+    @tracks_token_usage("ticket_assignment")
+    async def aprocess_ticket_assignment(self, request_data: Dict[str, Any]) -> TicketAssignmentResponse:
+        """
+        Async version of process_ticket_assignment
+
+        Args:
+            request_data: Dictionary containing ticket and skills information
+
+        Returns:
+            TicketAssignmentResponse with the selected technician
+        """
+        try:
+            logger.info("Starting async ticket assignment process")
+
+            context = await self._acreate_context(request_data)
+            timer = context.timer
+
+            speculation = None
+            if context.pipeline_mode == "speculative":
+                speculation = await self._astart_speculative_fetch(context)
+
+            with timer.stage("extraction"):
+                extracted_skill_names = await self._aextract_skills_from_ticket(context)
+            existing_extracted_skills = self._get_skill_objects(extracted_skill_names["existing_skills"], context.available_skills)
+
+            with timer.stage("notify"):
+                await self._anotify_extracted_skills(context, extracted_skill_names, existing_extracted_skills)
+
+            with timer.stage("technicians"):
+                technicians = None
+                if speculation is not None:
+                    try:
+                        prefetched = await speculation.future
+                    except Exception as e:
+                        logger.warning(f"Speculative technician fetch failed: {str(e)}")
+                        context.diagnostics["speculation"] = {"result": "failed"}
+                    else:
+                        technicians = self._reconcile_speculation(context, speculation, existing_extracted_skills, prefetched=prefetched)
+
+                if technicians is None:
+                    with track_stage("assignment", "technicians_by_skills"):
+                        technicians = await self._aget_technicians(existing_extracted_skills)
+                    if len(technicians) == 0:
+                        with track_stage("assignment", "technicians_fallback"):
+                            technicians = await self._aget_technicians(existing_extracted_skills, by_skills=False)
+
+            with timer.stage("selection"):
+                selected_technician, justification = await self._aselect_best_technician(context, technicians, existing_extracted_skills)
+
+            return TicketAssignmentResponse(
+                success=True,
+                selected_technician_id=selected_technician.id,
+                justification=justification,
+                error_message=None,
+                diagnostics=context.finish_diagnostics(speculation),
+            )
+
+        except Exception as e:
+            logger.error(f"Error in async ticket assignment process: {str(e)}")
+            return TicketAssignmentResponse(
+                success=False,
+                selected_technician_id=None,
+                justification=None,
+                error_message=str(e),
+            )
+
+    async def _acreate_context(self, request_data: Dict[str, Any], **diagnostics: Any) -> AssignmentContext:
+        """Validate an assignment request and start the context of its run, awaiting the catalog snapshot"""
+        timer = StageTimer("assignment")
+        with track_stage("assignment", "validation"):
+            ticket = self._extract_and_validate_ticket(request_data)
+
+        with timer.stage("catalog"):
+            snapshot = await self.skill_catalog.aget_snapshot(self.async_backend)
+        return self._build_context(request_data, ticket, snapshot, timer, None, diagnostics)
+
+    async def _astart_speculative_fetch(self, context: AssignmentContext) -> Speculation:
+        """Start fetching technicians for the predicted skills as a task on the event loop"""
+        predicted = await asyncio.to_thread(self._predict_skills, context.ticket, context.snapshot)
+
+        async def fetch() -> List[Technician]:
+            with context.timer.stage("prefetch"):
+                if predicted:
+                    return await self._aget_technicians(predicted)
+                return await self._aget_technicians([], by_skills=False)
+
+        return Speculation(
+            future=asyncio.create_task(fetch()),
+            predicted_skill_ids={skill.id for skill in predicted},
+            full_roster=not predicted,
+            local_roster=self.technician_roster is not None,
+        )
+
+    async def _aextract_skills_from_ticket(self, context: AssignmentContext) -> Dict[str, Any]:
+        """Extract skills from a ticket, reusing a near-duplicate's extraction when possible"""
+        ticket, catalog_version = context.ticket, context.snapshot.version
+        ticket_text = f"{ticket.subject}\n{ticket.description}"
+        reused = self._find_reusable_extraction(context, ticket_text)
+        if reused is not None:
+            return reused
+
+        shortlist = await asyncio.to_thread(self._shortlist_skills, context)
+        extracted_skills = await self.skill_extraction_service.aextract_skills_from_ticket(
+            ticket, shortlist,
+            catalog_version=catalog_version,
+            use_cache=context.use_cache,
+            catalog_skills=[skill.name for skill in context.snapshot.skills]
+        )
+
+        if self.ticket_dedup is not None:
+            self.ticket_dedup.add(ticket_text, ticket.id, catalog_version, extracted_skills)
+        return extracted_skills
+
+    async def _aget_technicians(self, extracted_skills: List[Skill], by_skills: bool = True) -> List[Technician]:
+        """
+        Get technicians that match the extracted skills, from the local roster when enabled
+        or from the backend server otherwise
+        """
+        skill_ids = [skill.id for skill in extracted_skills if skill.id is not None]
+        if not skill_ids and by_skills:
+            logger.warning("No valid skill IDs found for technician search")
+            return []
+
+        if self.technician_roster is not None:
+            try:
+                # A stale roster refreshes synchronously, which must not block the event loop
+                if by_skills:
+                    return await asyncio.to_thread(self.technician_roster.get_candidates, skill_ids)
+                return await asyncio.to_thread(self.technician_roster.get_all)
+            except Exception as e:
+                logger.warning(f"Local technician roster unavailable, querying backend: {str(e)}")
+
+        try:
+            if by_skills:
+                response = await self.async_backend.get(
+                    "technicians_by_skills", f"{Config.BACKEND_SERVER_URL}/api/v1/technicians/by-skills",
+                    params={"skills": skill_ids}
+                )
+            else:
+                response = await self.async_backend.get("technicians_all", f"{Config.BACKEND_SERVER_URL}/api/v1/technicians/all")
+            response.raise_for_status()
+            return self._parse_technicians_response(response.json())
+
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch technicians from backend: {str(e)}")
+            raise Exception(f"Backend server unavailable: {str(e)}")
+
+    async def _anotify_extracted_skills(self, context: AssignmentContext, extracted_skill_names: Dict[str, Any], existing_extracted_skills: List[Skill]):
+        """Notify the extracted skills to the backend server, through the outbox when enabled"""
+        try:
+            ticket_id = context.ticket.id
+            data = self._build_skill_notification(extracted_skill_names, existing_extracted_skills)
+            if not data:
+                logger.info("No extracted skills to notify")
+                return
+
+            if self.skill_outbox is not None:
+                await asyncio.to_thread(self.skill_outbox.enqueue, ticket_id, data, has_new_skills=bool(extracted_skill_names.get("new_skills")))
+                return
+
+            response = await self.async_backend.post("process_skills", f"{Config.BACKEND_SERVER_URL}/api/v1/tickets/process-skills", json={"ticket_id": ticket_id, "skills": data})
+            response.raise_for_status()
+            if not response.json().get("success"):
+                logger.error(f"Failed to notify extracted skills to the backend server: {response.json().get('message')}")
+                return
+
+            if extracted_skill_names.get("new_skills"):
+                self.skill_catalog.invalidate_after_create()
+
+        except Exception as e:
+            logger.error(f"Error notifying extracted skills: {str(e)}")
+
+    async def _aselect_best_technician(self, context: AssignmentContext, technicians: List[Technician], extracted_skills: List[Skill]) -> Tuple[Optional[Technician], Optional[str]]:
+        """Select the best technician with the scoring engine or an awaited LLM call"""
+        ticket, diagnostics = context.ticket, context.diagnostics
+        diagnostics["candidate_technicians"] = len(technicians)
+
+        if context.selection_engine == "scoring":
+            return await asyncio.to_thread(self.technician_scoring_service.select_technician_for_ticket, ticket, technicians, extracted_skills)
+
+        technicians, pruned = await asyncio.to_thread(self.technician_selection_service.prune_candidates, ticket, technicians, extracted_skills)
+        diagnostics["pruned_technicians"] = pruned
+        return await self.technician_selection_service.aselect_technician_for_ticket(ticket, technicians, extracted_skills)
+
+    def get_assignment_status(self) -> Dict[str, Any]:
+        """Get the current status of the async assignment service"""
+        status = super().get_assignment_status()
+        status["service"] = "AsyncAssignmentService"
+        status["async_backend_client"] = self.async_backend.get_pool_stats()
+        return status
+
+    async def aclose(self):
+        """Close the async backend connections"""
+        await self.async_backend.aclose()
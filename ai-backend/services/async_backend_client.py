@@ -0,0 +1,117 @@
+"""
+Async backend client - Pooled asyncio HTTP client for calls to the Node backend server
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+import httpx
+from services.backend_client import ENDPOINT_POLICIES, DEFAULT_POLICY
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+class AsyncBackendClient:
+    """
+    Keep-alive asyncio HTTP client applying the same per-endpoint policies as BackendClient
+
+    Used by the ASGI app, where a request waiting on the backend must not block the event loop.
+    """
+
+    def __init__(self, pool_size: int = None, transport: httpx.AsyncBaseTransport = None):
+        self.pool_size = pool_size or Config.BACKEND_POOL_SIZE
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            headers={"Connection": "keep-alive"},
+            transport=transport,
+        )
+        self._endpoint_stats: Dict[str, Dict[str, Any]] = {}
+
+    async def get(self, endpoint: str, url: str, **kwargs) -> httpx.Response:
+        """Send a GET request to a named backend endpoint"""
+        return await self._request("GET", endpoint, url, **kwargs)
+
+    async def post(self, endpoint: str, url: str, **kwargs) -> httpx.Response:
+        """Send a POST request to a named backend endpoint"""
+        return await self._request("POST", endpoint, url, **kwargs)
+
+    async def _request(self, method: str, endpoint: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request using the endpoint's timeout and retry policy
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint name used to look up the policy and record statistics
+            url: Full request URL
+
+        Returns:
+            The backend response (status is not checked here)
+        """
+        policy = ENDPOINT_POLICIES.get(endpoint, DEFAULT_POLICY)
+        kwargs.setdefault("timeout", httpx.Timeout(policy.read_timeout, connect=policy.connect_timeout))
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.TimeoutException) as e:
+                self._record(endpoint, time.perf_counter() - started, error=True)
+                # Only connect failures guarantee the request was never sent
+                never_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt >= policy.max_retries or not (policy.retry_after_send or never_sent):
+                    raise
+                attempt += 1
+                self._endpoint_stats[endpoint]["retries"] += 1
+                logger.warning(f"Backend {endpoint} request failed ({str(e)}), retry {attempt}/{policy.max_retries}")
+                await asyncio.sleep(policy.backoff_factor * (2 ** (attempt - 1)))
+                continue
+
+            self._record(endpoint, time.perf_counter() - started, error=response.status_code >= 500)
+            if response.status_code in policy.retry_on_status and attempt < policy.max_retries:
+                attempt += 1
+                self._endpoint_stats[endpoint]["retries"] += 1
+                logger.warning(f"Backend {endpoint} returned {response.status_code}, retry {attempt}/{policy.max_retries}")
+                await asyncio.sleep(policy.backoff_factor * (2 ** (attempt - 1)))
+                continue
+            return response
+
+    def _record(self, endpoint: str, elapsed: float, error: bool = False):
+        # Only touched from the event loop thread, so no lock is needed
+        stats = self._endpoint_stats.setdefault(endpoint, {"requests": 0, "errors": 0, "retries": 0, "total_ms": 0.0})
+        stats["requests"] += 1
+        stats["total_ms"] += elapsed * 1000
+        if error:
+            stats["errors"] += 1
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get pool configuration and per-endpoint statistics"""
+        return {
+            "pool_maxsize": self.pool_size,
+            "endpoints": {
+                name: {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "retries": stats["retries"],
+                    "avg_ms": round(stats["total_ms"] / stats["requests"], 2) if stats["requests"] else 0.0,
+                }
+                for name, stats in self._endpoint_stats.items()
+            },
+        }
+
+    async def aclose(self):
+        """Close all pooled connections"""
+        await self.client.aclose()
+
+_async_backend_client: Optional[AsyncBackendClient] = None
+_async_backend_client_lock = threading.Lock()
+
+def get_async_backend_client() -> AsyncBackendClient:
+    """Get the process-wide async backend client, creating it on first use"""
+    global _async_backend_client
+    if _async_backend_client is None:
+        with _async_backend_client_lock:
+            if _async_backend_client is None:
+                _async_backend_client = AsyncBackendClient()
+    return _async_backend_client
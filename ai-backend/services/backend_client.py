@@ -0,0 +1,206 @@
+"""
+Backend client - Shared, pooled HTTP client for calls to the Node backend server
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class EndpointPolicy:
+    """Timeout and retry policy applied to a single backend endpoint"""
+    connect_timeout: float
+    read_timeout: float
+    max_retries: int = 0
+    backoff_factor: float = 0.2
+    retry_on_status: Tuple[int, ...] = (502, 503, 504)
+    # Whether to retry failures that may have happened after the request was sent
+    # (read timeouts, connections aborted mid-request) and so may have been applied
+    retry_after_send: bool = True
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+def _read_policy(read_timeout: float = None) -> EndpointPolicy:
+    return EndpointPolicy(
+        connect_timeout=Config.BACKEND_CONNECT_TIMEOUT,
+        read_timeout=Config.BACKEND_READ_TIMEOUT if read_timeout is None else read_timeout,
+        max_retries=Config.BACKEND_MAX_RETRIES,
+    )
+
+# Per-endpoint policies. Reads are idempotent and safe to retry; the
+# process-skills POST creates skills, so it is only retried when the
+# connection could not be made and the request was never sent. A stale
+# keep-alive socket dropped mid-request is not retried; the outbox redelivers.
+ENDPOINT_POLICIES: Dict[str, EndpointPolicy] = {
+    "skills_all": _read_policy(),
+    "technicians_by_skills": _read_policy(),
+    # The full roster is the largest backend payload
+    "technicians_all": _read_policy(Config.BACKEND_READ_TIMEOUT * 1.5),
+    "technician_by_id": _read_policy(),
+    "technicians_delta": _read_policy(),
+    "process_skills": EndpointPolicy(
+        connect_timeout=Config.BACKEND_CONNECT_TIMEOUT,
+        read_timeout=Config.BACKEND_READ_TIMEOUT,
+        max_retries=1,
+        retry_on_status=(),
+        retry_after_send=False,
+    ),
+}
+
+DEFAULT_POLICY = _read_policy()
+
+def _never_sent(error: requests.exceptions.RequestException) -> bool:
+    """Whether a request failed while connecting, before any of it was sent"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # requests wraps urllib3's MaxRetryError, whose reason is the underlying error;
+    # NewConnectionError (refused, unreachable, DNS) subclasses ConnectTimeoutError
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, ConnectTimeoutError)
+
+class BackendClient:
+    """Keep-alive HTTP client with a bounded connection pool and per-endpoint policies"""
+
+    def __init__(self, pool_size: int = None, pool_block: bool = None):
+        self.pool_size = pool_size or Config.BACKEND_POOL_SIZE
+        self.pool_block = Config.BACKEND_POOL_BLOCK if pool_block is None else pool_block
+
+        # Retries are handled per endpoint in _request, so the adapter itself never retries
+        self._adapter = HTTPAdapter(
+            pool_connections=Config.BACKEND_POOL_HOSTS,
+            pool_maxsize=self.pool_size,
+            pool_block=self.pool_block,
+            max_retries=0,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        self.session.headers.update({"Connection": "keep-alive"})
+
+        self._lock = threading.Lock()
+        self._endpoint_stats: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        """Send a GET request to a named backend endpoint"""
+        return self._request("GET", endpoint, url, **kwargs)
+
+    def post(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        """Send a POST request to a named backend endpoint"""
+        return self._request("POST", endpoint, url, **kwargs)
+
+    def _request(self, method: str, endpoint: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request using the endpoint's timeout and retry policy
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint name used to look up the policy and record statistics
+            url: Full request URL
+
+        Returns:
+            The backend response (status is not checked here)
+        """
+        policy = ENDPOINT_POLICIES.get(endpoint, DEFAULT_POLICY)
+        kwargs.setdefault("timeout", policy.timeout)
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._record(endpoint, time.perf_counter() - started, error=True)
+                if attempt >= policy.max_retries or not (policy.retry_after_send or _never_sent(e)):
+                    raise
+                attempt += 1
+                self._record_retry(endpoint)
+                logger.warning(f"Backend {endpoint} request failed ({str(e)}), retry {attempt}/{policy.max_retries}")
+                time.sleep(policy.backoff_factor * (2 ** (attempt - 1)))
+                continue
+
+            self._record(endpoint, time.perf_counter() - started, error=response.status_code >= 500)
+            if response.status_code in policy.retry_on_status and attempt < policy.max_retries:
+                attempt += 1
+                self._record_retry(endpoint)
+                logger.warning(f"Backend {endpoint} returned {response.status_code}, retry {attempt}/{policy.max_retries}")
+                response.close()
+                time.sleep(policy.backoff_factor * (2 ** (attempt - 1)))
+                continue
+            return response
+
+    def _record(self, endpoint: str, elapsed: float, error: bool = False):
+        with self._lock:
+            stats = self._endpoint_stats.setdefault(endpoint, {"requests": 0, "errors": 0, "retries": 0, "total_ms": 0.0})
+            stats["requests"] += 1
+            stats["total_ms"] += elapsed * 1000
+            if error:
+                stats["errors"] += 1
+
+    def _record_retry(self, endpoint: str):
+        with self._lock:
+            self._endpoint_stats[endpoint]["retries"] += 1
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool and per-endpoint statistics
+
+        Returns:
+            Dictionary with pool configuration, per-host pool usage and endpoint counters
+        """
+        pools = []
+        pool_manager = self._adapter.poolmanager
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            pools.append({
+                "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                "connections_opened": pool.num_connections,
+                "requests_sent": pool.num_requests,
+                # The pool queue is pre-filled with None placeholders for unopened slots
+                "idle_connections": sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0,
+            })
+
+        with self._lock:
+            endpoints = {
+                name: {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "retries": stats["retries"],
+                    "avg_ms": round(stats["total_ms"] / stats["requests"], 2) if stats["requests"] else 0.0,
+                }
+                for name, stats in self._endpoint_stats.items()
+            }
+
+        return {
+            "pool_maxsize": self.pool_size,
+            "pool_block": self.pool_block,
+            "pools": pools,
+            "endpoints": endpoints,
+        }
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+_backend_client: Optional[BackendClient] = None
+_backend_client_lock = threading.Lock()
+
+def get_backend_client() -> BackendClient:
+    """Get the process-wide backend client, creating it on first use"""
+    global _backend_client
+    if _backend_client is None:
+        with _backend_client_lock:
+            if _backend_client is None:
+                _backend_client = BackendClient()
+    return _backend_client
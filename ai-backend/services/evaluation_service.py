@@ -1,7 +1,20 @@
-from datetime import datetime
-from typing import Dict, List, Any, Union
+import contextvars
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple, Union
+from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel
-import requests
+from services.backend_client import get_backend_client
+from services.metrics import track_stage
+from services.token_usage import current_token_usage, record_llm_usage, tracks_token_usage
+from services.technician_roster import get_technician_roster
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_REQUIRED_FIELDS = ('subject', 'description', 'assigned_technician_id', 'required_skills')
 
 class SkillEvaluation(BaseModel):
     skill_id: int
@@ -21,32 +34,238 @@ class MetricsResult(BaseModel):
     sla_adherence: bool
     skill_metrics: Dict[str, SkillMetric]  # Format: {"skill_id": {"score": float, "reasoning": str}}
     feedback_sentiment: SentimentResult  # Format: {"score": float, "reasoning": str}
+    token_usage: Optional[Dict[str, Any]] = None  # LLM tokens spent on this ticket's analyses
 
     class Config:
         arbitrary_types_allowed = True
 
 class EvaluationService:
-    def __init__(self, llm, technician_api_url="http://172.16.15.115:5000/api/v1"):
+    def __init__(self, llm, technician_api_url: str = None):
         self.llm = llm
-        self.technician_api_url = technician_api_url
+        self.technician_api_url = technician_api_url or f"{Config.BACKEND_SERVER_URL}/api/v1"
+        self.backend = get_backend_client()
+        self.technician_roster = get_technician_roster() if Config.ROSTER_CACHE_ENABLED else None
+        if self.technician_roster is not None:
+            self.technician_roster.start()
+        self.json_parser = JsonOutputParser()
+        # The skill and feedback analyses are independent LLM calls and run side by side
+        self._llm_executor = ThreadPoolExecutor(max_workers=Config.EVALUATION_LLM_WORKERS, thread_name_prefix="evaluation")
 
     
 
+    @tracks_token_usage("evaluate_skills")
     def calculate_metrics(self, ticket_data: Dict) -> MetricsResult:
         resolution_time = self._calculate_resolution_time(ticket_data)
         
         sla_target = self._get_sla_target(ticket_data['priority'])
         sla_adherence = resolution_time <= sla_target if resolution_time else True
 
-        skill_metrics = self._analyze_skill_performance(ticket_data)
-        feedback_sentiment = self._analyze_feedback_sentiment(ticket_data)
+        skill_metrics, feedback_sentiment = self._analyze_ticket(ticket_data)
 
         return MetricsResult(
             resolution_time=resolution_time,
             sla_adherence=sla_adherence,
             skill_metrics=skill_metrics,
-            feedback_sentiment=feedback_sentiment
+            feedback_sentiment=feedback_sentiment,
+            token_usage=current_token_usage().as_dict()
         )
+
+    def _analyze_ticket(self, ticket_data: Dict) -> Tuple[Dict[str, Dict[str, Union[float, str]]], Dict[str, Union[float, str]]]:
+        """
+        Analyze skill performance and feedback sentiment within EVALUATION_TIMEOUT_SECONDS
+
+        Uses one combined LLM call when EVALUATION_COMBINED_CALL is set and there is
+        feedback to analyze, otherwise the two analyses run concurrently. The calls share
+        one deadline, which also bounds their wait for an EVALUATION_LLM_WORKERS thread, so
+        a saturated pool cannot hold an evaluation indefinitely. A sentiment analysis that
+        misses it is reported as neutral; a skill analysis that misses it fails the evaluation.
+
+        Returns:
+            Tuple of the skill metrics and the feedback sentiment
+        """
+        deadline = time.monotonic() + Config.EVALUATION_TIMEOUT_SECONDS
+
+        if Config.EVALUATION_COMBINED_CALL and ticket_data.get('feedback'):
+            combined = self._submit_analysis(self._analyze_combined, ticket_data)
+            try:
+                return self._result_by(combined, deadline)
+            except FutureTimeoutError:
+                combined.cancel()
+                raise TimeoutError(f"Ticket analysis did not finish within {Config.EVALUATION_TIMEOUT_SECONDS}s")
+            except Exception as e:
+                logger.warning(f"Combined ticket analysis failed, analyzing separately: {str(e)}")
+
+        skill_future = self._submit_analysis(self._analyze_skill_performance, ticket_data)
+        sentiment_future = self._submit_analysis(self._analyze_feedback_sentiment, ticket_data)
+
+        try:
+            skill_metrics = self._result_by(skill_future, deadline)
+        except FutureTimeoutError:
+            skill_future.cancel()
+            sentiment_future.cancel()
+            raise TimeoutError(f"Skill analysis did not finish within {Config.EVALUATION_TIMEOUT_SECONDS}s")
+        except Exception:
+            sentiment_future.cancel()
+            raise
+
+        try:
+            feedback_sentiment = self._result_by(sentiment_future, deadline)
+        except FutureTimeoutError:
+            sentiment_future.cancel()
+            logger.warning(f"Feedback analysis did not finish within {Config.EVALUATION_TIMEOUT_SECONDS}s")
+            feedback_sentiment = {"score": 0.0, "reasoning": "Feedback analysis timed out"}
+
+        return skill_metrics, feedback_sentiment
+
+    @tracks_token_usage("evaluate_skills_batch")
+    def evaluate_tickets(self, tickets: List[Dict]) -> Dict[str, Any]:
+        """
+        Evaluate many resolved tickets and consolidate the skill updates per technician
+
+        The LLM analyses run concurrently, up to EVALUATION_BATCH_CONCURRENCY tickets at a time
+        and no more than the EVALUATION_LLM_WORKERS pool can run together, so the tickets do not
+        spend their shared deadline queued behind each other.
+        Each technician's tickets are then applied one after another in resolution order, each
+        update starting from the skills left by the previous one.
+
+        Args:
+            tickets: Tickets in the format accepted by `/api/evaluate-skills`
+
+        Returns:
+            Dict with per-ticket `results` in request order and one consolidated skills
+            update per technician in `technicians`
+        """
+        if not isinstance(tickets, list) or not tickets:
+            raise ValueError("tickets must be a non-empty list")
+        if len(tickets) > Config.EVALUATION_BATCH_MAX_TICKETS:
+            raise ValueError(f"A batch can contain at most {Config.EVALUATION_BATCH_MAX_TICKETS} tickets")
+
+        results = []
+        for index, ticket in enumerate(tickets):
+            ticket = ticket if isinstance(ticket, dict) else {}
+            missing_fields = [field for field in EVALUATION_REQUIRED_FIELDS if field not in ticket]
+            results.append({
+                "index": index,
+                "ticket_id": ticket.get('id'),
+                "technician_id": ticket.get('assigned_technician_id'),
+                "success": not missing_fields,
+                "metrics": None,
+                "error_message": f"Missing required fields: {', '.join(missing_fields)}" if missing_fields else None,
+            })
+        valid = [result["index"] for result in results if result["success"]]
+        technician_ids = list(dict.fromkeys(results[index]["technician_id"] for index in valid))
+
+        # Each ticket runs up to two analyses at once on the LLM pool
+        workers = max(1, min(Config.EVALUATION_BATCH_CONCURRENCY, Config.EVALUATION_LLM_WORKERS // 2, len(valid)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="evaluation-batch") as executor:
+            technician_futures = {tech_id: executor.submit(self.get_technician, tech_id) for tech_id in technician_ids}
+            metric_futures = {index: executor.submit(contextvars.copy_context().run, self.calculate_metrics, tickets[index]) for index in valid}
+
+            technicians = {}
+            for tech_id, future in technician_futures.items():
+                try:
+                    technicians[tech_id] = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching technician {tech_id}: {str(e)}")
+                    technicians[tech_id] = e
+
+            metrics = {}
+            for index, future in metric_futures.items():
+                result = results[index]
+                technician = technicians[result["technician_id"]]
+                try:
+                    metrics[index] = future.result()
+                    result["metrics"] = metrics[index].model_dump()
+                    if isinstance(technician, Exception):
+                        raise Exception(f"Error fetching technician data: {str(technician)}")
+                    if technician is None:
+                        raise Exception(f"Technician {result['technician_id']} not found")
+                except Exception as e:
+                    logger.error(f"Error evaluating ticket {result['ticket_id']}: {str(e)}")
+                    metrics.pop(index, None)
+                    result["success"] = False
+                    result["error_message"] = str(e)
+
+        # Fold each technician's tickets in the order they were resolved
+        by_technician: Dict[Any, List[int]] = {}
+        for index in sorted(metrics, key=lambda index: self._resolution_order(tickets[index], index)):
+            by_technician.setdefault(results[index]["technician_id"], []).append(index)
+
+        updates = []
+        for tech_id, indexes in by_technician.items():
+            skills = technicians[tech_id].get('skills') or []
+            for index in indexes:
+                update = self.update_technician_skills(technician_id=tech_id, current_skills=skills, ticket_metrics=metrics[index])
+                skills = update["skills"]
+            update["ticket_ids"] = [results[index]["ticket_id"] for index in indexes]
+            updates.append(update)
+
+        succeeded = sum(1 for result in results if result["success"])
+        return {
+            "success": succeeded == len(results),
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+            "technicians": updates,
+            "diagnostics": {"token_usage": current_token_usage().as_dict()},
+        }
+
+    def _resolution_order(self, ticket_data: Dict, index: int) -> Tuple[bool, datetime, int]:
+        """Sort key placing tickets by resolution time, then those without one in request order"""
+        try:
+            resolved_at = datetime.fromisoformat(ticket_data['resolved_at'].replace('Z', '+00:00'))
+            if resolved_at.tzinfo is None:
+                resolved_at = resolved_at.replace(tzinfo=timezone.utc)
+            return False, resolved_at, index
+        except (AttributeError, KeyError, ValueError):
+            return True, datetime.min.replace(tzinfo=timezone.utc), index
+
+    def _submit_analysis(self, func, ticket_data: Dict) -> Future:
+        """Run an analysis on the LLM pool in a copy of this context, so its tokens are accounted to this ticket"""
+        return self._llm_executor.submit(contextvars.copy_context().run, func, ticket_data)
+
+    def _result_by(self, future: Future, deadline: float) -> Any:
+        """Wait for a future until the shared deadline"""
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+
+    def _analyze_combined(self, ticket_data: Dict) -> Tuple[Dict[str, Dict[str, Union[float, str]]], Dict[str, Union[float, str]]]:
+        """Analyze skill performance and feedback sentiment with a single structured LLM call"""
+        prompt = f"""
+        Analyze this ticket resolution and the user's feedback:
+        
+        Ticket Subject: {ticket_data.get('subject', '')}
+        Description: {ticket_data.get('description', '')}
+        Resolution Steps: {ticket_data.get('resolution', '')}
+        Work Logs: {ticket_data.get('work_logs', [])}
+        User Feedback: {ticket_data.get('feedback')}
+        
+        1. For each required skill {ticket_data.get('required_skills', [])}, rate the demonstrated
+        proficiency from 0 to 100 with a brief justification (max 50 words).
+        2. Rate the sentiment of the user feedback from -100 (extremely negative) through
+        0 (neutral) to 100 (extremely positive) with a brief explanation (max 50 words).
+        
+        Respond with JSON only, in this format:
+        {{"skills": [{{"skill_id": "<skill_id>", "score": <number>, "reasoning": "<justification>"}}],
+          "sentiment": {{"score": <number>, "reasoning": "<explanation>"}}}}
+        """
+
+        with track_stage("evaluation", "combined_analysis"):
+            response = self.llm.invoke(prompt)
+        record_llm_usage("combined_analysis", prompt, response)
+        result = self.json_parser.parse(response.content)
+
+        skill_metrics = {
+            str(skill['skill_id']): {"score": float(skill['score']), "reasoning": str(skill.get('reasoning', ''))}
+            for skill in result.get('skills', [])
+        }
+        sentiment = result['sentiment']
+        feedback_sentiment = {
+            "score": max(-100.0, min(100.0, float(sentiment['score']))),
+            "reasoning": str(sentiment.get('reasoning', ''))
+        }
+        return skill_metrics, feedback_sentiment
+
     def _calculate_resolution_time(self, ticket_data: Dict) -> int:
         """Calculate resolution time in minutes"""
         try:
@@ -95,14 +314,16 @@ class EvaluationService:
         """
         
         try:
-            response = self.llm.predict(prompt)
-            score_line, reason_line = [line for line in response.split('\n') if line.strip()][:2]
+            with track_stage("evaluation", "sentiment_analysis"):
+                response = self.llm.invoke(prompt)
+            record_llm_usage("sentiment_analysis", prompt, response)
+            score_line, reason_line = [line for line in response.content.split('\n') if line.strip()][:2]
             
-            sentiment_score = score_line.replace('SCORE:', '').strip()
+            sentiment_score = float(score_line.replace('SCORE:', '').strip())
             reasoning = reason_line.replace('REASON:', '').strip()
             
             return {
-                "score": max(-100, min(100, sentiment_score)),
+                "score": max(-100.0, min(100.0, sentiment_score)),
                 "reasoning": reasoning
             }
         except (ValueError, TypeError, IndexError):
@@ -129,7 +350,10 @@ class EvaluationService:
         REASON: <justification>
         """
         
-        analysis = self.llm.predict(prompt)
+        with track_stage("evaluation", "skill_analysis"):
+            response = self.llm.invoke(prompt)
+        record_llm_usage("skill_analysis", prompt, response)
+        analysis = response.content
         skill_evaluations = {}
         
         current_skill = None
@@ -156,10 +380,40 @@ class EvaluationService:
                         
         return skill_evaluations
 
+    def get_technician(self, technician_id: int) -> Optional[Dict]:
+        """
+        Get one technician by ID, from the local roster when enabled or from the backend otherwise
+
+        Args:
+            technician_id: ID of the technician
+
+        Returns:
+            Technician data with its `skills`, or None if there is no such technician
+        """
+        if self.technician_roster is not None:
+            try:
+                with track_stage("evaluation", "technician_roster"):
+                    technician = self.technician_roster.get_technician(technician_id)
+                if technician is not None:
+                    return technician.model_dump(mode="json")
+            except Exception as e:
+                logger.warning(f"Local technician roster unavailable, querying backend: {str(e)}")
+
+        try:
+            with track_stage("evaluation", "technician_fetch"):
+                response = self.backend.get("technician_by_id", f"{self.technician_api_url}/technicians/{technician_id}")
+            if response.status_code == 404:
+                return None
+            if response.status_code == 200:
+                return response.json()["data"]
+            raise Exception(f"Failed to fetch technician: {response.text}")
+        except Exception as e:
+            raise Exception(f"Error fetching technician: {str(e)}")
+
     def get_technicians(self) -> List[Dict]:
         """Fetch all technicians from backend API"""
         try:
-            response = requests.get(f"{self.technician_api_url}/technicians/all")
+            response = self.backend.get("technicians_all", f"{self.technician_api_url}/technicians/all")
             if response.status_code == 200:
                 return response.json()["data"]["technicians"]
             else:
@@ -182,10 +436,12 @@ class EvaluationService:
         Use only skill IDs from: {ticket_data.get('required_skills', [])}
         """
         
-        response = self.llm.predict(prompt)
+        with track_stage("evaluation", "skill_extraction"):
+            response = self.llm.invoke(prompt)
+        record_llm_usage("skill_extraction", prompt, response)
         
         skills = []
-        for skill_line in response.split('\n'):
+        for skill_line in response.content.split('\n'):
             if '|' in skill_line:
                 skill_id, level, confidence = skill_line.split('|')
                 skills.append(SkillEvaluation(
@@ -202,8 +458,8 @@ class EvaluationService:
                            ticket_metrics: MetricsResult) -> Dict:
         """Update technician skills based on ticket performance"""
         
-        # Convert current skills to dictionary for easier lookup
-        skill_map = {skill['id']: skill['percentage'] for skill in current_skills}
+        # Convert current skills to dictionary for easier lookup; LLM skill IDs are strings
+        skill_map = {str(skill['id']): skill['percentage'] for skill in current_skills}
         
         # Calculate performance multiplier based on SLA adherence
         performance_multiplier = 1.0
@@ -225,7 +481,7 @@ class EvaluationService:
         
         # Convert back to list format
         updated_skills = [
-            {"id": skill_id, "percentage": level}
+            {"id": int(skill_id) if skill_id.isdigit() else skill_id, "percentage": level}
             for skill_id, level in skill_map.items()
         ]
         
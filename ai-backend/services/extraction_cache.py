@@ -0,0 +1,101 @@
+"""
+Extraction cache - Content-addressed LRU cache for LLM skill-extraction results
+"""
+import copy
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def _normalize(text: Optional[str]) -> str:
+    return _WHITESPACE_RE.sub(" ", (text or "").strip().lower())
+
+def extraction_cache_key(subject: str, description: str, tags: Optional[List[str]], catalog_version: str) -> str:
+    """
+    Build the cache key for a ticket extraction
+
+    Case and whitespace differences in the ticket text and the order of tags do not change the key.
+
+    Args:
+        subject: Ticket subject
+        description: Ticket description
+        tags: Ticket tags
+        catalog_version: Version of the skills offered to the LLM
+
+    Returns:
+        Hex digest identifying the extraction
+    """
+    normalized_tags = sorted({_normalize(tag) for tag in tags or [] if tag})
+    payload = "\x1f".join([_normalize(subject), _normalize(description), ",".join(normalized_tags), catalog_version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ExtractionCache:
+    """Thread-safe LRU cache with an optional TTL and hit/miss counters"""
+
+    def __init__(self, max_entries: int = None, ttl_seconds: float = None):
+        self.max_entries = Config.EXTRACTION_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.ttl_seconds = Config.EXTRACTION_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "bypassed": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached extraction result, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        # Callers get their own copy so they cannot mutate the cached result
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store an extraction result, evicting the least recently used entry when full"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def record_bypass(self):
+        """Count a request that skipped the cache"""
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self):
+        """Remove all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self._stats,
+            }
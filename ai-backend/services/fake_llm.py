@@ -0,0 +1,199 @@
+"""
+Fake chat model - Deterministic stand-in for the OpenAI model with configurable latency
+
+Recognizes the prompts the services send (skill extraction, batched extraction,
+technician selection and the evaluation analyses) and answers each in the format
+its parser expects, derived only from the prompt text.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_TECHNICIAN_ID_RE = re.compile(r"^\s*- ID: (\d+),", re.MULTILINE)
+_REQUIRED_SKILLS_RE = re.compile(r"required skill \[([^\]]*)\]")
+_SKILL_IDS_RE = re.compile(r"Use only skill IDs from: \[([^\]]*)\]")
+_BATCH_TICKET_RE = re.compile(r"- \*\*Key\*\*: (T\d+)\s+\*\*Subject\*\*: (.*?)\s+\*\*Description\*\*: (.*?)\s+\*\*Tags\*\*", re.DOTALL)
+_STOP_WORDS = {"and", "the", "for", "with", "of", "to", "a", "in", "on", "is", "not", "cannot", "can", "my", "our"}
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+def _words(text: str) -> set:
+    return {word for word in _WORD_RE.findall(text.lower()) if word not in _STOP_WORDS}
+
+def _section(prompt: str, header: str) -> str:
+    """Text between a `**Header**` marker and the next `---` separator"""
+    start = prompt.find(header)
+    if start < 0:
+        return ""
+    start += len(header)
+    end = prompt.find("---", start)
+    return prompt[start:end if end >= 0 else len(prompt)]
+
+def _field(prompt: str, name: str) -> str:
+    match = re.search(rf"\*\*{name}\*\*: (.*)", prompt)
+    return match.group(1).strip() if match else ""
+
+def _id_list(raw: str) -> List[str]:
+    return [value.strip().strip("'\"") for value in raw.split(",") if value.strip()]
+
+def _match_skills(text: str, available_skills: List[str], limit: int = 2) -> List[Dict[str, Any]]:
+    """Offered skills sharing the most words with the ticket, or one picked by hash when none do"""
+    ticket_words = _words(text)
+    scored = sorted(
+        ((len(ticket_words & _words(skill)), skill) for skill in available_skills),
+        key=lambda pair: (-pair[0], pair[1])
+    )
+    matched = [skill for overlap, skill in scored[:limit] if overlap > 0]
+    if not matched and available_skills:
+        matched = [available_skills[_digest(text) % len(available_skills)]]
+    return [{"name": skill, "description": "", "is_new": False} for skill in matched]
+
+def _available_skills(prompt: str) -> List[str]:
+    section = _section(prompt, "**Available Skills**:")
+    return [line.strip()[2:].strip() for line in section.splitlines() if line.strip().startswith("- ")]
+
+def _score(seed: str, low: int = 55, high: int = 95) -> int:
+    return low + _digest(seed) % (high - low + 1)
+
+def answer(prompt: str) -> str:
+    """
+    Build the response to a prompt
+
+    Args:
+        prompt: Prompt text sent by one of the services
+
+    Returns:
+        Response text in the format the calling service parses
+    """
+    if "selected_technician_id" in prompt:
+        technician_ids = _TECHNICIAN_ID_RE.findall(prompt)
+        selected = int(technician_ids[0]) if technician_ids else None
+        return json.dumps({
+            "selected_technician_id": selected,
+            "justification": "• Has the skills required by this ticket\n• Currently has the lowest workload among the candidates\n• Available to start work immediately",
+        })
+
+    if "**Tickets**" in prompt:
+        available_skills = _available_skills(prompt)
+        return json.dumps({"tickets": [
+            {"key": key, "skills": _match_skills(f"{subject} {description}", available_skills)}
+            for key, subject, description in _BATCH_TICKET_RE.findall(_section(prompt, "**Tickets**"))
+        ]})
+
+    if "**Available Skills**" in prompt:
+        text = f"{_field(prompt, 'Subject')} {_field(prompt, 'Description')}"
+        return json.dumps({"skills": _match_skills(text, _available_skills(prompt))})
+
+    if "Respond with JSON" in prompt:
+        match = _REQUIRED_SKILLS_RE.search(prompt)
+        skill_ids = _id_list(match.group(1)) if match else []
+        return json.dumps({
+            "skills": [{"skill_id": skill_id, "score": _score(prompt + skill_id), "reasoning": "Resolved the issue with the expected steps"} for skill_id in skill_ids],
+            "sentiment": {"score": _score(prompt, -20, 90), "reasoning": "The user is mostly satisfied with the resolution"},
+        })
+
+    if "sentiment of this user feedback" in prompt:
+        return f"SCORE: {_score(prompt, -20, 90)}\nREASON: The user is mostly satisfied with the resolution"
+
+    if "rate the demonstrated skill levels" in prompt:
+        match = _REQUIRED_SKILLS_RE.search(prompt)
+        skill_ids = _id_list(match.group(1)) if match else []
+        return "\n".join(
+            f"SKILL: {skill_id}\nSCORE: {_score(prompt + skill_id)}\nREASON: Resolved the issue with the expected steps"
+            for skill_id in skill_ids
+        )
+
+    if "Format: Skill ID | Level" in prompt:
+        match = _SKILL_IDS_RE.search(prompt)
+        skill_ids = _id_list(match.group(1)) if match else []
+        return "\n".join(f"{skill_id} | {_score(prompt + skill_id)} | 0.8" for skill_id in skill_ids)
+
+    return "{}"
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model answering from `answer()` after a simulated round trip
+
+    Latency is `latency_ms` plus up to `jitter_ms` drawn from a seeded RNG. Token
+    usage is reported like the OpenAI model does, on the response and on the last
+    streamed chunk, approximating four characters per token.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: int = 0
+    chunk_size: int = 24
+
+    _rng: random.Random = PrivateAttr()
+    _rng_lock: threading.Lock = PrivateAttr()
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _delay(self) -> float:
+        with self._rng_lock:
+            jitter = self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000
+
+    def _respond(self, messages: List[BaseMessage]):
+        prompt = "\n".join(str(message.content) for message in messages)
+        content = answer(prompt)
+        usage = {
+            "input_tokens": max(1, len(prompt) // 4),
+            "output_tokens": max(1, len(content) // 4),
+        }
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        return content, usage
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._delay())
+        content, usage = self._respond(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content, usage_metadata=usage))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self._delay())
+        content, usage = self._respond(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content, usage_metadata=usage))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        content, usage = self._respond(messages)
+        pieces = [content[start:start + self.chunk_size] for start in range(0, len(content), self.chunk_size)] or [""]
+        # Spread the round trip over the chunks, like tokens arriving over time
+        delay = self._delay() / len(pieces)
+        for index, piece in enumerate(pieces):
+            time.sleep(delay)
+            last = index == len(pieces) - 1
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage if last else None))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        content, usage = self._respond(messages)
+        pieces = [content[start:start + self.chunk_size] for start in range(0, len(content), self.chunk_size)] or [""]
+        delay = self._delay() / len(pieces)
+        for index, piece in enumerate(pieces):
+            await asyncio.sleep(delay)
+            last = index == len(pieces) - 1
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage if last else None))
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
@@ -0,0 +1,66 @@
+"""
+JSON provider - orjson encoding and decoding for API responses and backend payloads
+"""
+from decimal import Decimal
+from typing import Any, Union
+import orjson
+from flask import Response, current_app
+from flask.json.provider import JSONProvider
+from pydantic import BaseModel
+
+# numpy scalars and arrays come out of the scoring engine, dicts may be keyed by ID
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _default(obj: Any) -> Any:
+    """Encode the types orjson does not handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        # Same as the models' json_encoders
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object to UTF-8 JSON bytes"""
+    return orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS)
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Decode JSON bytes or text; invalid input raises a json.JSONDecodeError subclass"""
+    return orjson.loads(data)
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson
+
+    Installed as `app.json`, it is used by `jsonify` and by `request.get_json`.
+    Responses are compact and keep the key order of the data, like `model_dump_json`.
+    """
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+def model_response(model: BaseModel, status: int = 200) -> Response:
+    """
+    Build a JSON response straight from a pydantic model with `model_dump_json`
+
+    Args:
+        model: Response model
+        status: HTTP status code
+
+    Returns:
+        Flask response with the serialized model
+    """
+    return current_app.response_class(model.model_dump_json(), status=status, mimetype="application/json")
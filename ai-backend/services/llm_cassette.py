@@ -0,0 +1,255 @@
+"""
+LLM cassette - Record LLM responses to a local file and replay them without the model
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("record", "replay")
+
+def prompt_key(messages: List[BaseMessage], stop: Optional[List[str]] = None) -> str:
+    """SHA-256 of the message types and contents, and of the stop sequences if any"""
+    payload = [[message.type, message.content] for message in messages]
+    if stop:
+        payload.append(["stop", list(stop)])
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+class _StreamRecording:
+    """Chunks of a streamed response being recorded, with their arrival times"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.contents: List[str] = []
+        self.offsets: List[float] = []
+        self.merged: Optional[AIMessageChunk] = None
+
+    def add(self, message: AIMessageChunk):
+        self.offsets.append(time.perf_counter() - self.started)
+        self.contents.append(message.content)
+        self.merged = message if self.merged is None else self.merged + message
+
+class CassetteChatModel(BaseChatModel):
+    """
+    Chat model that records the responses of another model, or replays recorded ones
+
+    In "record" mode every call goes to `inner` and its response is appended to the
+    JSONL cassette at `path`, keyed by the hash of the prompt, with its latency (and
+    the arrival time of every chunk for streamed calls). In "replay" mode responses
+    are served from the cassette with their original content, chunking and token
+    usage, and no model is called. A prompt recorded several times replays its
+    responses in recording order, cycling once they are used up, so nondeterministic
+    answers keep their original mix. With `replay_latency` each replayed response is
+    delayed by the latency recorded with it.
+
+    A streamed call whose consumer stops reading early, as skill extraction does once
+    the skills array is complete, is still recorded in full: the rest of the stream is
+    read from `inner` when the consumer closes it.
+    """
+
+    mode: str = "replay"
+    path: str
+    inner: Optional[BaseChatModel] = None
+    replay_latency: bool = False
+
+    _entries: Dict[str, List[Dict[str, Any]]] = PrivateAttr(default_factory=dict)
+    _cursors: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _stats: Dict[str, int] = PrivateAttr(default_factory=lambda: {"recorded": 0, "hits": 0, "misses": 0})
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        if self.mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {self.mode}")
+        if self.mode == "record" and self.inner is None:
+            raise ValueError("Recording a cassette requires a model to record")
+        directory = os.path.dirname(self.path)
+        if self.mode == "record" and directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            if self.mode == "replay":
+                logger.warning(f"LLM cassette {self.path} does not exist, every prompt will miss")
+            return
+        count = 0
+        with open(self.path, "r", encoding="utf-8") as cassette:
+            for line in cassette:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written last line from an interrupted recording
+                    continue
+                self._entries.setdefault(entry["key"], []).append(entry)
+                count += 1
+        logger.info(f"Loaded {count} recorded LLM responses for {len(self._entries)} prompts from {self.path}")
+
+    def _append(self, entry: Dict[str, Any]):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as cassette:
+                cassette.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            self._entries.setdefault(entry["key"], []).append(entry)
+            self._stats["recorded"] += 1
+
+    def _next_entry(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self._stats["misses"] += 1
+                raise LookupError(f"No recorded LLM response for prompt {key[:12]} in cassette {self.path}")
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            self._stats["hits"] += 1
+            return entries[cursor % len(entries)]
+
+    def _entry(self, key: str, message: AIMessage, latency: float, chunks: List[str] = None, offsets: List[float] = None) -> Dict[str, Any]:
+        entry = {
+            "key": key,
+            "content": message.content,
+            "usage_metadata": message.usage_metadata,
+            "response_metadata": message.response_metadata,
+            "latency_ms": round(latency * 1000, 3),
+        }
+        if chunks is not None:
+            entry["chunks"] = chunks
+            entry["chunk_offsets_ms"] = [round(offset * 1000, 3) for offset in offsets]
+        return entry
+
+    def _record_stream(self, key: str, recording: _StreamRecording):
+        latency = time.perf_counter() - recording.started
+        self._append(self._entry(key, recording.merged, latency, recording.contents, recording.offsets))
+
+    def _message(self, entry: Dict[str, Any]) -> AIMessage:
+        return AIMessage(content=entry["content"], usage_metadata=entry.get("usage_metadata"), response_metadata=entry.get("response_metadata") or {})
+
+    def _replay_chunks(self, entry: Dict[str, Any]):
+        """(offset in seconds, chunk) pairs of a recorded response, for streamed replay"""
+        chunks = entry.get("chunks") or [entry["content"]]
+        offsets = entry.get("chunk_offsets_ms") or [entry.get("latency_ms", 0)] * len(chunks)
+        for index, (offset, content) in enumerate(zip(offsets, chunks)):
+            last = index == len(chunks) - 1
+            message = AIMessageChunk(
+                content=content,
+                usage_metadata=entry.get("usage_metadata") if last else None,
+                response_metadata=(entry.get("response_metadata") or {}) if last else {}
+            )
+            yield offset / 1000, ChatGenerationChunk(message=message)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        key = prompt_key(messages, stop)
+        if self.mode == "replay":
+            entry = self._next_entry(key)
+            if self.replay_latency:
+                time.sleep(entry.get("latency_ms", 0) / 1000)
+            return ChatResult(generations=[ChatGeneration(message=self._message(entry))])
+
+        started = time.perf_counter()
+        message = self.inner.invoke(messages, stop=stop, **kwargs)
+        self._append(self._entry(key, message, time.perf_counter() - started))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        key = prompt_key(messages, stop)
+        if self.mode == "replay":
+            entry = self._next_entry(key)
+            if self.replay_latency:
+                await asyncio.sleep(entry.get("latency_ms", 0) / 1000)
+            return ChatResult(generations=[ChatGeneration(message=self._message(entry))])
+
+        started = time.perf_counter()
+        message = await self.inner.ainvoke(messages, stop=stop, **kwargs)
+        self._append(self._entry(key, message, time.perf_counter() - started))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        key = prompt_key(messages, stop)
+        if self.mode == "replay":
+            started = time.perf_counter()
+            for offset, chunk in self._replay_chunks(self._next_entry(key)):
+                if self.replay_latency:
+                    time.sleep(max(0.0, started + offset - time.perf_counter()))
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+            return
+
+        recording = _StreamRecording()
+        stream = self.inner.stream(messages, stop=stop, **kwargs)
+        complete = False
+        try:
+            for message in stream:
+                recording.add(message)
+                chunk = ChatGenerationChunk(message=message)
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+            complete = True
+        except GeneratorExit:
+            # The consumer stopped reading, read the rest so the response replays in full
+            for message in stream:
+                recording.add(message)
+            complete = True
+            raise
+        finally:
+            # A stream that failed is not recorded
+            if complete and recording.merged is not None:
+                self._record_stream(key, recording)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        key = prompt_key(messages, stop)
+        if self.mode == "replay":
+            started = time.perf_counter()
+            for offset, chunk in self._replay_chunks(self._next_entry(key)):
+                if self.replay_latency:
+                    await asyncio.sleep(max(0.0, started + offset - time.perf_counter()))
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+            return
+
+        recording = _StreamRecording()
+        stream = self.inner.astream(messages, stop=stop, **kwargs)
+        complete = False
+        try:
+            async for message in stream:
+                recording.add(message)
+                chunk = ChatGenerationChunk(message=message)
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+            complete = True
+        except GeneratorExit:
+            async for message in stream:
+                recording.add(message)
+            complete = True
+            raise
+        finally:
+            if complete and recording.merged is not None:
+                self._record_stream(key, recording)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cassette mode, size and hit statistics"""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "path": self.path,
+                "prompts": len(self._entries),
+                "responses": sum(len(entries) for entries in self._entries.values()),
+                **self._stats,
+            }
@@ -0,0 +1,55 @@
+"""
+LLM factory - Chat model construction for the configured provider
+"""
+import logging
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+def _create_provider_llm():
+    """Create the chat model of LLM_PROVIDER"""
+    if Config.LLM_PROVIDER == "fake":
+        from services.fake_llm import FakeChatModel
+
+        logger.info(f"Using fake LLM with {Config.FAKE_LLM_LATENCY_MS}ms (+{Config.FAKE_LLM_JITTER_MS}ms jitter) latency")
+        return FakeChatModel(latency_ms=Config.FAKE_LLM_LATENCY_MS, jitter_ms=Config.FAKE_LLM_JITTER_MS)
+
+    if Config.LLM_PROVIDER != "openai":
+        raise ValueError(f"Unknown LLM_PROVIDER: {Config.LLM_PROVIDER}")
+
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=Config.OPENAI_MODEL,
+        temperature=Config.OPENAI_TEMPERATURE,
+        openai_api_key=Config.OPENAI_API_KEY,
+        # Report token usage on the last chunk of streamed responses too
+        stream_usage=True
+    )
+
+def create_llm():
+    """
+    Create the chat model selected by LLM_PROVIDER and LLM_CASSETTE_MODE
+
+    "openai" builds the production ChatOpenAI model; "fake" builds the deterministic
+    offline model used by the benchmark harness, with FAKE_LLM_LATENCY_MS of simulated
+    latency per call. With LLM_CASSETTE_MODE "record" that model is wrapped to record
+    its responses to LLM_CASSETTE_PATH; with "replay" the recorded responses are served
+    instead and no model is created.
+
+    Returns:
+        Chat model shared by the services
+    """
+    if Config.LLM_CASSETTE_MODE == "off":
+        return _create_provider_llm()
+
+    from services.llm_cassette import CassetteChatModel
+
+    inner = _create_provider_llm() if Config.LLM_CASSETTE_MODE == "record" else None
+    logger.info(f"LLM cassette in {Config.LLM_CASSETTE_MODE} mode ({Config.LLM_CASSETTE_PATH})")
+    return CassetteChatModel(
+        mode=Config.LLM_CASSETTE_MODE,
+        path=Config.LLM_CASSETTE_PATH,
+        inner=inner,
+        replay_latency=Config.LLM_CASSETTE_REPLAY_LATENCY
+    )
@@ -0,0 +1,238 @@
+"""
+Metrics - Stage latency histograms, error counters and in-flight gauges in Prometheus text format
+"""
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+from config.settings import Config
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """Base for metrics that hold one series per combination of label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._lock = threading.Lock()
+
+    def _labels(self, values: LabelValues, extra: Dict[str, str] = None) -> str:
+        pairs = list(zip(self.label_names, values)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, labels: LabelValues = ()) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{self._labels(labels)} {_format_number(value)}" for labels, value in sorted(values.items())]
+
+class Gauge(_Metric):
+    """Value that goes up and down, such as work in flight"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: LabelValues = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def set(self, labels: LabelValues, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+    def get(self, labels: LabelValues = ()) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{self._labels(labels)} {_format_number(value)}" for labels, value in sorted(values.items())]
+
+class Histogram(_Metric):
+    """
+    Cumulative bucket counts of observed values
+
+    A bounded window of recent observations is kept next to the buckets, so
+    percentiles can be reported without a Prometheus server to compute them.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS, window: int = None):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.window = Config.METRICS_PERCENTILE_WINDOW if window is None else window
+        self._series: Dict[LabelValues, Dict[str, object]] = {}
+
+    def observe(self, labels: LabelValues, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0, "recent": deque(maxlen=self.window)}
+                self._series[labels] = series
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][position] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+            series["recent"].append(value)
+
+    def label_values(self) -> List[LabelValues]:
+        with self._lock:
+            return sorted(self._series)
+
+    def count(self, labels: LabelValues) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return series["count"] if series else 0
+
+    def percentiles(self, labels: LabelValues, quantiles: Tuple[float, ...] = (0.5, 0.95, 0.99)) -> Dict[float, Optional[float]]:
+        """Nearest-rank percentiles of the recent observations"""
+        with self._lock:
+            series = self._series.get(labels)
+            recent: Deque[float] = series["recent"] if series else deque()
+            values = sorted(recent)
+        if not values:
+            return {quantile: None for quantile in quantiles}
+        return {quantile: values[min(len(values) - 1, max(0, math.ceil(quantile * len(values)) - 1))] for quantile in quantiles}
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = {labels: (list(data["counts"]), data["sum"], data["count"]) for labels, data in self._series.items()}
+        lines = []
+        for labels, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{self._labels(labels, {'le': _format_number(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on `/metrics`"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+STAGE_DURATION = registry.histogram("neurodesk_stage_duration_seconds", "Duration of pipeline stages", ("pipeline", "stage"))
+STAGE_ERRORS = registry.counter("neurodesk_stage_errors_total", "Pipeline stages that raised an error", ("pipeline", "stage"))
+STAGE_IN_FLIGHT = registry.gauge("neurodesk_stage_in_flight", "Pipeline stages currently running", ("pipeline", "stage"))
+HTTP_REQUEST_DURATION = registry.histogram("neurodesk_http_request_duration_seconds", "Duration of HTTP requests", ("method", "endpoint", "status"))
+
+@contextmanager
+def track_stage(pipeline: str, stage: str) -> Iterator[None]:
+    """
+    Record the enclosed block as a pipeline stage
+
+    Its duration goes to the stage histogram, an exception increments the error
+    counter, and the in-flight gauge is raised while the block runs.
+    """
+    labels = (pipeline, stage)
+    STAGE_IN_FLIGHT.inc(labels)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(labels)
+        raise
+    finally:
+        STAGE_IN_FLIGHT.dec(labels)
+        STAGE_DURATION.observe(labels, time.perf_counter() - start)
+
+def get_stage_summary() -> Dict[str, Dict[str, Dict[str, object]]]:
+    """
+    Get count, errors, in-flight and latency percentiles of every recorded stage
+
+    Returns:
+        Dictionary of pipeline -> stage -> summary, with percentiles in milliseconds
+    """
+    summary: Dict[str, Dict[str, Dict[str, object]]] = {}
+    for labels in STAGE_DURATION.label_values():
+        pipeline, stage = labels
+        percentiles = STAGE_DURATION.percentiles(labels)
+        summary.setdefault(pipeline, {})[stage] = {
+            "count": STAGE_DURATION.count(labels),
+            "errors": int(STAGE_ERRORS.get(labels)),
+            "in_flight": int(STAGE_IN_FLIGHT.get(labels)),
+            **{f"p{int(quantile * 100)}_ms": None if value is None else round(value * 1000, 1) for quantile, value in percentiles.items()},
+        }
+    return summary
@@ -0,0 +1,104 @@
+"""
+Micro-batcher - Groups concurrent calls that arrive within a short window into one batch
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Collects concurrent calls for up to `max_wait_seconds` and hands them to a handler together
+
+    There is no dispatcher thread: the first caller of a window becomes the leader, waits
+    until the window closes or the batch is full, and runs the handler for everyone. Other
+    callers block until the leader has filled in their results, so independent batches
+    can be in flight at the same time.
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], List[Any]], max_batch_size: int, max_wait_seconds: float):
+        """
+        Args:
+            handler: Called with the batched items; returns one result per item, in order.
+                A result that is an exception is raised to that item's caller
+            max_batch_size: Batch size that dispatches immediately
+            max_wait_seconds: Longest the first caller of a batch waits for others
+        """
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+
+        self._condition = threading.Condition()
+        self._open: Optional[List[tuple]] = None
+        self._stats = {"calls": 0, "batches": 0, "largest_batch": 0}
+
+    def call(self, item: Any) -> Any:
+        """
+        Add an item to the current batch and wait for its result
+
+        Args:
+            item: Item passed to the handler
+
+        Returns:
+            The handler's result for this item
+        """
+        future: Future = Future()
+        with self._condition:
+            leader = self._open is None
+            if leader:
+                self._open = []
+            batch = self._open
+            batch.append((item, future))
+            if len(batch) >= self.max_batch_size:
+                self._open = None
+                self._condition.notify_all()
+
+            if leader:
+                deadline = time.monotonic() + self.max_wait_seconds
+                while self._open is batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._open = None
+                        break
+                    self._condition.wait(remaining)
+
+        if leader:
+            self._dispatch(batch)
+        return future.result()
+
+    def _dispatch(self, batch: List[tuple]):
+        items = [item for item, _ in batch]
+        with self._condition:
+            self._stats["calls"] += len(items)
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(items))
+
+        try:
+            results = self.handler(items)
+            if len(results) != len(items):
+                raise ValueError(f"Batch handler returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            logger.error(f"Batch of {len(items)} failed: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        with self._condition:
+            batches = self._stats["batches"]
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_seconds": self.max_wait_seconds,
+                "average_batch_size": round(self._stats["calls"] / batches, 2) if batches else 0.0,
+                **self._stats,
+            }
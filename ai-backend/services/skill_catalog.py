@@ -0,0 +1,282 @@
+"""
+Skill catalog cache - Versioned in-memory copy of the backend skills catalog
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List
+import httpx
+import orjson
+import requests
+from models.skill import Skill
+from services.backend_client import get_backend_client
+from services.skill_index import SkillIndex
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable view of the skills catalog at one version"""
+    version: str
+    skills: List[Skill]
+    fetched_at: float
+    by_name: Dict[str, Skill] = field(default_factory=dict)
+
+    @property
+    def skill_names(self) -> List[str]:
+        return [skill.name for skill in self.skills]
+
+class SkillCatalog:
+    """
+    Cache for the `/skills/all` catalog
+
+    The catalog is served from memory until the TTL expires. It is then revalidated
+    with If-None-Match / If-Modified-Since, and a 200 response whose body hashes to
+    the current version is treated the same as a 304, so Skill models are only rebuilt
+    when the catalog actually changes.
+    """
+
+    def __init__(self, skills_url: str = None, ttl_seconds: float = None):
+        self.skills_url = skills_url or Config.SKILLS_API_URL
+        self.ttl_seconds = Config.SKILL_CATALOG_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.backend = get_backend_client()
+
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._validated_at = 0.0
+        self._index: Optional[SkillIndex] = None
+        self._index_version: Optional[str] = None
+        # Indexed document (name, description) of each skill, keyed like CatalogSnapshot.by_name
+        self._index_docs: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        # asyncio locks are bound to the event loop they are first used on, so each loop gets its own
+        self._async_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+        self._stats = {"hits": 0, "revalidated": 0, "reloaded": 0, "invalidations": 0, "stale_served": 0}
+
+    def get_snapshot(self, force_refresh: bool = False) -> CatalogSnapshot:
+        """
+        Get the current catalog snapshot, revalidating it if the TTL has expired
+
+        Args:
+            force_refresh: Revalidate against the backend even if the TTL has not expired
+
+        Returns:
+            CatalogSnapshot with the current skills
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and not force_refresh and not self.is_stale():
+            self._stats["hits"] += 1
+            return snapshot
+
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self._snapshot is not None and not force_refresh and not self.is_stale():
+                self._stats["hits"] += 1
+                return self._snapshot
+            return self._refresh()
+
+    async def aget_snapshot(self, client, force_refresh: bool = False) -> CatalogSnapshot:
+        """
+        Async version of get_snapshot; concurrent callers share one revalidation request
+
+        Args:
+            client: AsyncBackendClient used to revalidate the catalog
+            force_refresh: Revalidate against the backend even if the TTL has not expired
+
+        Returns:
+            CatalogSnapshot with the current skills
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and not force_refresh and not self.is_stale():
+            self._stats["hits"] += 1
+            return snapshot
+
+        async with self._get_async_lock():
+            if self._snapshot is not None and not force_refresh and not self.is_stale():
+                self._stats["hits"] += 1
+                return self._snapshot
+            return await self._arefresh(client)
+
+    def _get_async_lock(self) -> asyncio.Lock:
+        """Get the lock that serializes revalidation on the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            lock = self._async_locks.get(loop)
+            if lock is None:
+                lock = self._async_locks[loop] = asyncio.Lock()
+            return lock
+
+    def get_skills(self) -> List[Skill]:
+        """Get the list of Skill objects in the current catalog"""
+        return self.get_snapshot().skills
+
+    def is_stale(self) -> bool:
+        """Whether the cached catalog must be revalidated before use"""
+        return time.monotonic() - self._validated_at >= self.ttl_seconds
+
+    def invalidate(self):
+        """Force the next read to revalidate against the backend"""
+        self._validated_at = 0.0
+        self._stats["invalidations"] += 1
+        logger.info("Skill catalog invalidated")
+
+    def get_index(self, snapshot: CatalogSnapshot = None) -> SkillIndex:
+        """
+        Get the BM25 skill index for a catalog snapshot
+
+        When the catalog only gained skills, the new skills are added to the existing
+        index; the index is rebuilt if skills were removed or renamed or any indexed
+        skill's description changed.
+
+        Args:
+            snapshot: Snapshot to index, defaults to the current snapshot
+
+        Returns:
+            SkillIndex covering every skill in the snapshot
+        """
+        snapshot = snapshot or self.get_snapshot()
+        with self._index_lock:
+            if self._index is not None and self._index_version == snapshot.version:
+                return self._index
+
+            docs = {key: (skill.name, skill.description) for key, skill in snapshot.by_name.items()}
+            if self._index is None or any(docs.get(key) != doc for key, doc in self._index_docs.items()):
+                self._index = SkillIndex.from_skills(snapshot.skills)
+                logger.info(f"Built skill index for catalog version {snapshot.version}")
+            else:
+                for key, skill in snapshot.by_name.items():
+                    if key not in self._index_docs:
+                        self._index.add(skill.name, skill.description)
+            self._index_docs = docs
+            self._index_version = snapshot.version
+            return self._index
+
+    def invalidate_after_create(self):
+        """
+        Invalidate the catalog after skills were created in the backend
+
+        The next read picks up the created skills with their IDs, and get_index then
+        adds them to the search index of that snapshot.
+        """
+        self.invalidate()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Get the conditional request headers for revalidating the cached catalog"""
+        headers = {}
+        if self._snapshot is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def _refresh(self) -> CatalogSnapshot:
+        try:
+            logger.info(f"Revalidating skill catalog from: {self.skills_url}")
+            response = self.backend.get("skills_all", self.skills_url, headers=self.conditional_headers())
+            return self.apply_response(response.status_code, response.headers, response.content)
+
+        except requests.exceptions.RequestException as e:
+            if self._snapshot is not None:
+                self._stats["stale_served"] += 1
+                logger.warning(f"Failed to revalidate skill catalog, serving version {self._snapshot.version}: {str(e)}")
+                return self._snapshot
+            logger.error(f"Failed to fetch skills from backend: {str(e)}")
+            raise Exception(f"Backend server unavailable: {str(e)}")
+
+    async def _arefresh(self, client) -> CatalogSnapshot:
+        try:
+            logger.info(f"Revalidating skill catalog from: {self.skills_url}")
+            response = await client.get("skills_all", self.skills_url, headers=self.conditional_headers())
+            return self.apply_response(response.status_code, response.headers, response.content)
+
+        except (httpx.HTTPError, requests.exceptions.RequestException) as e:
+            if self._snapshot is not None:
+                self._stats["stale_served"] += 1
+                logger.warning(f"Failed to revalidate skill catalog, serving version {self._snapshot.version}: {str(e)}")
+                return self._snapshot
+            logger.error(f"Failed to fetch skills from backend: {str(e)}")
+            raise Exception(f"Backend server unavailable: {str(e)}")
+
+    def apply_response(self, status_code: int, headers: Dict[str, str], content: bytes) -> CatalogSnapshot:
+        """
+        Apply a backend response to the cache
+
+        Args:
+            status_code: HTTP status of the `/skills/all` response
+            headers: Response headers
+            content: Raw response body
+
+        Returns:
+            The snapshot that is current after applying the response
+        """
+        if status_code == 304 and self._snapshot is not None:
+            self._validated_at = time.monotonic()
+            self._stats["revalidated"] += 1
+            logger.debug(f"Skill catalog not modified (version {self._snapshot.version})")
+            return self._snapshot
+
+        if status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{status_code} Error fetching skills catalog")
+
+        self._etag = headers.get("ETag")
+        self._last_modified = headers.get("Last-Modified")
+
+        version = hashlib.sha256(content).hexdigest()[:16]
+        if self._snapshot is not None and version == self._snapshot.version:
+            self._validated_at = time.monotonic()
+            self._stats["revalidated"] += 1
+            logger.debug(f"Skill catalog content unchanged (version {version})")
+            return self._snapshot
+
+        skills = self._parse_skills(orjson.loads(content))
+        self._snapshot = CatalogSnapshot(
+            version=version,
+            skills=skills,
+            fetched_at=time.time(),
+            by_name={skill.name.lower().strip(): skill for skill in skills},
+        )
+        self._validated_at = time.monotonic()
+        self._stats["reloaded"] += 1
+        logger.info(f"Loaded skill catalog version {version} with {len(skills)} skills")
+        return self._snapshot
+
+    def _parse_skills(self, skills_data: Dict[str, Any]) -> List[Skill]:
+        skills = []
+        for skill_data in skills_data["data"]["skills"]:
+            try:
+                skills.append(Skill(**skill_data))
+            except Exception as e:
+                logger.warning(f"Failed to parse skill data: {skill_data}, error: {str(e)}")
+                continue
+        return skills
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "skills": len(snapshot.skills) if snapshot else 0,
+            "ttl_seconds": self.ttl_seconds,
+            "stale": self.is_stale(),
+            **self._stats,
+        }
+
+_skill_catalog: Optional[SkillCatalog] = None
+_skill_catalog_lock = threading.Lock()
+
+def get_skill_catalog() -> SkillCatalog:
+    """Get the process-wide skill catalog cache, creating it on first use"""
+    global _skill_catalog
+    if _skill_catalog is None:
+        with _skill_catalog_lock:
+            if _skill_catalog is None:
+                _skill_catalog = SkillCatalog()
+    return _skill_catalog
@@ -1,24 +1,42 @@
 """
 Skill extraction service - Step 1: Extract skills from ticket using provided skills list
 """
+import contextvars
+import hashlib
 import json
 import logging
-from typing import List, Dict, Any
-from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from models.ticket import Ticket
 from models.skill import Skill
+from services.extraction_cache import ExtractionCache, extraction_cache_key
+from services.metrics import track_stage
+from services.micro_batcher import MicroBatcher
+from services.stream_parser import IncrementalArrayParser
+from services.token_usage import current_token_usage, record_batched_llm_usage, record_llm_usage
 from config.settings import Config
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
 logger = logging.getLogger(__name__)
 
 class SkillExtractionService:
     """Service for extracting skills from ticket information using LLM"""
     
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: "ChatOpenAI"):
         self.llm = llm
         self.json_parser = JsonOutputParser()
+        self.cache = ExtractionCache()
+        self.batcher = None
+        if Config.EXTRACTION_BATCH_ENABLED:
+            self.batcher = MicroBatcher(self._extract_batch, Config.EXTRACTION_BATCH_MAX_SIZE, Config.EXTRACTION_BATCH_WAIT_MS / 1000)
+        self._batch_fallbacks = 0
+        self._batch_lock = threading.Lock()
         self._setup_prompts()
     
     def _setup_prompts(self):
@@ -77,14 +95,80 @@ class SkillExtractionService:
             """,
             input_variables=["subject", "description", "tags", "available_skills"]
         )
+
+        self.batch_extraction_prompt = PromptTemplate(
+            template="""You are a service desk assistant designed to analyze incoming support tickets and identify the relevant **technical skills** needed to resolve them.
+
+                You will be provided:
+                1. Several support tickets, each with a key, subject, description, and tags
+                2. A list of available skills (from which you must choose)
+
+                Analyze every ticket on its own. The tickets are unrelated to each other.
+
+                ---
+
+                **Tickets**
+                {tickets}
+
+                ---
+
+                **Available Skills**:  
+                {available_skills}
+
+                ---
+
+                **Instructions**:
+                - For each ticket, analyze the subject and description to identify which skills are needed.
+                - Output the result as a valid JSON object with the key `tickets` containing one entry per ticket, in any order.
+                - Each entry has the ticket `key` and a `skills` array of matched skills for that ticket.
+                - Do NOT include any explanations or text outside of the JSON.
+
+                **Skill Selection Rules** (apply to each ticket separately):
+                - Select from the provided list of available skills if relevant or near to relevant skills are present in available skills.
+                - If No skill relevant to the ticket is present in available skills, then create new skill/skill(s).
+                - If multiple skills are relevant to the ticket, then return all the skills that are relevant to the ticket.
+                - Create at max 3 new skills per ticket if needed. Try to create minimum number of new skills.
+                - Skills should be at max 2-3 words long. keeps the skill names crisp and concise.
+
+                ---
+
+                **Output Format**:
+                {{
+                    "tickets": [
+                        {{
+                            "key": "<ticket_key>",
+                            "skills": [
+                                {{
+                                    "name": "<new_skill_name>",
+                                    "description": "<new_skill_description>",
+                                    "is_new": true
+                                }},
+                                {{
+                                    "name": "<existing_skill_name>",
+                                    "description": "",
+                                    "is_new": false
+                                }}
+                            ]
+                        }}
+                    ]
+                }}
+
+            """,
+            input_variables=["tickets", "available_skills"]
+        )
     
-    def extract_skills_from_ticket(self, ticket: Ticket, available_skills: List[str]) -> Dict[str, Any]:
+    def extract_skills_from_ticket(self, ticket: Ticket, available_skills: List[str], catalog_version: Optional[str] = None, use_cache: bool = True, stream: bool = False, catalog_skills: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Extract relevant skills from ticket using LLM
         
         Args:
             ticket: Ticket object containing the issue information
             available_skills: List of available skill names to choose from
+            catalog_version: Version of the skills catalog, used in the cache key
+            use_cache: Whether a cached result for the same ticket text and catalog may be served
+            stream: Stream the LLM response and return as soon as the skills array is complete
+            catalog_skills: Every catalog skill name, when only a shortlist is offered; a skill
+                the LLM names is existing if it is in the catalog, offered or not
             
         Returns:
             List of skill names that match the ticket requirements
@@ -92,116 +176,359 @@ class SkillExtractionService:
 
         try:
             logger.info(f"Extracting skills from ticket: {ticket.subject}")
+
+            cache_key, cached_result = self._check_cache(ticket, available_skills, catalog_version, use_cache)
+            if cached_result is not None:
+                return cached_result
             
-            # Format tags for prompt
-            tags_text = ", ".join(ticket.tags) if ticket.tags else "None"
+            if stream:
+                skills, offered_skills = self._stream_skills(ticket, available_skills), available_skills
+            elif self.batcher is not None:
+                # The caller's context goes with the ticket, so its tokens are accounted to this request
+                skills, offered_skills = self.batcher.call((ticket, available_skills, contextvars.copy_context()))
+            else:
+                skills, offered_skills = self._request_skills(ticket, available_skills), available_skills
             
-            # Format available skills for prompt
-            available_skills_text = "\n".join([f"- {skill}" for skill in available_skills])
+            return self._finish_extraction(skills, catalog_skills or offered_skills, cache_key)
             
-            # Create the prompt with ticket data and available skills
-            prompt = self.skill_extraction_prompt.format(
-                subject=ticket.subject,
-                description=ticket.description,
-                tags=tags_text,
-                available_skills=available_skills_text
-            )
+        except Exception as e:
+            logger.error(f"Error extracting skills from ticket: {str(e)}")
+            raise
+
+    async def aextract_skills_from_ticket(self, ticket: Ticket, available_skills: List[str], catalog_version: Optional[str] = None, use_cache: bool = True, catalog_skills: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Async version of extract_skills_from_ticket using `llm.ainvoke`
+        
+        Tickets are always sent one per prompt; the micro-batcher is only used by the sync path.
+        
+        Args:
+            ticket: Ticket object containing the issue information
+            available_skills: List of available skill names to choose from
+            catalog_version: Version of the skills catalog, used in the cache key
+            use_cache: Whether a cached result for the same ticket text and catalog may be served
+            catalog_skills: Every catalog skill name, when only a shortlist is offered
             
-            # Get LLM response
+        Returns:
+            Dictionary with existing_skills, new_skills and all_skills
+        """
+        try:
+            logger.info(f"Extracting skills from ticket: {ticket.subject}")
+
+            cache_key, cached_result = self._check_cache(ticket, available_skills, catalog_version, use_cache)
+            if cached_result is not None:
+                return cached_result
+
             logger.debug("Sending prompt to LLM for skill extraction")
+            prompt = self._build_extraction_prompt(ticket, available_skills)
+            with track_stage("assignment", "extraction_llm"):
+                response = await self.llm.ainvoke(prompt)
+            record_llm_usage("extraction", prompt, response)
+            skills = self._skills_from_response(response.content)
+
+            return self._finish_extraction(skills, catalog_skills or available_skills, cache_key)
+
+        except Exception as e:
+            logger.error(f"Error extracting skills from ticket: {str(e)}")
+            raise
+
+    def _check_cache(self, ticket: Ticket, available_skills: List[str], catalog_version: Optional[str], use_cache: bool) -> tuple:
+        """Get the cache key for a ticket and any cached extraction for it"""
+        if use_cache and Config.EXTRACTION_CACHE_ENABLED:
+            cache_key = extraction_cache_key(
+                ticket.subject, ticket.description, ticket.tags,
+                catalog_version or self._skills_version(available_skills)
+            )
+            cached_result = self.cache.get(cache_key)
+            if cached_result is not None:
+                logger.info("Serving skill extraction from cache")
+            return cache_key, cached_result
+        if not use_cache:
+            self.cache.record_bypass()
+        return None, None
+
+    def _finish_extraction(self, skills: List[Any], known_skills: List[str], cache_key: Optional[str]) -> Dict[str, Any]:
+        """Categorize the LLM skills against the known skill names and cache the result"""
+        result = self._categorize_skills(skills, known_skills)
+        logger.info(f"Successfully extracted {len(result['existing_skills'])} existing and {len(result['new_skills'])} new skills from ticket")
+
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+        return result
+    
+    def _request_skills(self, ticket: Ticket, available_skills: List[str]) -> List[Any]:
+        """
+        Ask the LLM for the skills of a single ticket
+        
+        Args:
+            ticket: Ticket object containing the issue information
+            available_skills: List of available skill names to choose from
+            
+        Returns:
+            Raw skill objects from the LLM response
+        """
+        # Get LLM response
+        logger.debug("Sending prompt to LLM for skill extraction")
+        prompt = self._build_extraction_prompt(ticket, available_skills)
+        with track_stage("assignment", "extraction_llm"):
             response = self.llm.invoke(prompt)
+        record_llm_usage("extraction", prompt, response)
+        return self._skills_from_response(response.content)
+
+    def _stream_skills(self, ticket: Ticket, available_skills: List[str]) -> List[Any]:
+        """
+        Stream the single-ticket prompt and stop reading once the skills array closes
+        
+        Args:
+            ticket: Ticket object containing the issue information
+            available_skills: List of available skill names to choose from
             
-            # Parse JSON response using JsonOutputParser
-            try:
-                result_data = self.json_parser.parse(response.content)
-            except Exception as e:
-                logger.error(f"Failed to parse LLM response as JSON: {response.content}")
-                # Fallback to manual JSON parsing
-                try:
-                    result_data = json.loads(response.content)
-                except json.JSONDecodeError as json_error:
-                    raise ValueError(f"Invalid JSON response from LLM: {str(json_error)}")
+        Returns:
+            Raw skill objects from the LLM response
+        """
+        logger.debug("Streaming prompt to LLM for skill extraction")
+        parser = IncrementalArrayParser("skills")
+        parse_early = True
+        prompt = self._build_extraction_prompt(ticket, available_skills)
+        # Usage is only reported with the final chunk, so a stream cut short is estimated
+        usage_chunk = None
+        try:
+            with track_stage("assignment", "extraction_llm"), closing(self.llm.stream(prompt)) as chunks:
+                for chunk in chunks:
+                    if getattr(chunk, "usage_metadata", None):
+                        usage_chunk = chunk
+                    if not parse_early:
+                        parser.text += chunk.content
+                        continue
+                    try:
+                        skills = parser.feed(chunk.content)
+                    except json.JSONDecodeError:
+                        # Read the rest and parse the complete response the usual way
+                        parse_early = False
+                        continue
+                    if skills is not None:
+                        return skills
+        finally:
+            record_llm_usage("extraction", prompt, usage_chunk, completion=parser.text)
+        return self._skills_from_response(parser.text)
+
+    def _build_extraction_prompt(self, ticket: Ticket, available_skills: List[str]) -> str:
+        """Format the single-ticket extraction prompt"""
+        # Format tags for prompt
+        tags_text = ", ".join(ticket.tags) if ticket.tags else "None"
+        
+        # Format available skills for prompt
+        available_skills_text = "\n".join([f"- {skill}" for skill in available_skills])
+        
+        # Create the prompt with ticket data and available skills
+        return self.skill_extraction_prompt.format(
+            subject=ticket.subject,
+            description=ticket.description,
+            tags=tags_text,
+            available_skills=available_skills_text
+        )
+
+    def _skills_from_response(self, content: str) -> List[Any]:
+        """Get the raw skill objects from a single-ticket LLM response"""
+        result_data = self._parse_response(content)
+        
+        # Extract skills from response
+        if 'skills' not in result_data:
+            logger.error(f"Response missing 'skills' key: {result_data}")
+            raise ValueError("LLM response missing 'skills' key")
+        
+        return result_data['skills']
+
+    def _extract_batch(self, requests: List[tuple]) -> List[Any]:
+        """
+        Extract skills for several tickets with one multi-ticket prompt
+        
+        The LLM is offered the union of the tickets' available skills. Tickets missing from
+        the response, or every ticket when the response cannot be parsed, fall back to
+        single-ticket prompts if EXTRACTION_BATCH_FALLBACK is enabled. The batched call's
+        prompt tokens are split evenly between the tickets' requests and its completion
+        tokens by the size of each ticket's entry; fallback prompts are accounted to their
+        ticket's request.
+        
+        Args:
+            requests: (ticket, available_skills, caller context) tuples collected by the micro-batcher
             
-            # Extract skills from response
-            if 'skills' not in result_data:
-                logger.error(f"Response missing 'skills' key: {result_data}")
-                raise ValueError("LLM response missing 'skills' key")
+        Returns:
+            One (skills, offered_skills) pair or exception per request, in order
+        """
+        if len(requests) == 1:
+            ticket, available_skills, context = requests[0]
+            return [(context.run(self._request_skills, ticket, available_skills), available_skills)]
+
+        offered_skills = list(dict.fromkeys(skill for _, available_skills, _ in requests for skill in available_skills))
+        tickets_text = "\n".join(
+            f"- **Key**: T{index}\n  **Subject**: {ticket.subject}\n  **Description**: {ticket.description}\n"
+            f"  **Tags**: {', '.join(ticket.tags) if ticket.tags else 'None'}"
+            for index, (ticket, _, _) in enumerate(requests, start=1)
+        )
+        prompt = self.batch_extraction_prompt.format(
+            tickets=tickets_text,
+            available_skills="\n".join([f"- {skill}" for skill in offered_skills])
+        )
+
+        entries_by_key = {}
+        response = None
+        try:
+            logger.debug(f"Sending batched prompt to LLM for skill extraction of {len(requests)} tickets")
+            with track_stage("assignment", "extraction_llm"):
+                response = self.llm.invoke(prompt)
+            result_data = self._parse_response(response.content)
+            for entry in result_data.get("tickets", []):
+                if isinstance(entry, dict) and isinstance(entry.get("skills"), list):
+                    entries_by_key[str(entry.get("key"))] = entry
+        except Exception as e:
+            if not Config.EXTRACTION_BATCH_FALLBACK:
+                raise
+            logger.warning(f"Batched skill extraction failed, falling back to single prompts: {str(e)}")
+        finally:
+            if response is not None:
+                entries = [entries_by_key.get(f"T{index}") for index in range(1, len(requests) + 1)]
+                record_batched_llm_usage(
+                    "extraction_batch", prompt, response,
+                    [context.run(current_token_usage) for _, _, context in requests],
+                    [json.dumps(entry) if entry is not None else "" for entry in entries]
+                )
+
+        results: List[Any] = [None] * len(requests)
+        missing = []
+        for index, (ticket, available_skills, _) in enumerate(requests):
+            entry = entries_by_key.get(f"T{index + 1}")
+            if entry is not None:
+                results[index] = (entry["skills"], offered_skills)
+            elif Config.EXTRACTION_BATCH_FALLBACK:
+                missing.append(index)
+            else:
+                results[index] = ValueError(f"Batched LLM response is missing ticket T{index + 1}")
+
+        if missing:
+            with self._batch_lock:
+                self._batch_fallbacks += len(missing)
+
+            def single(index: int) -> Any:
+                ticket, available_skills, context = requests[index]
+                try:
+                    return (context.run(self._request_skills, ticket, available_skills), available_skills)
+                except Exception as e:
+                    return e
+
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                for index, result in zip(missing, executor.map(single, missing)):
+                    results[index] = result
+
+        logger.info(f"Extracted skills for {len(requests)} tickets in one batch ({len(missing)} fell back to single prompts)")
+        return results
+
+    def get_batch_stats(self) -> Optional[Dict[str, Any]]:
+        """Get micro-batching statistics, or None when batching is disabled"""
+        if self.batcher is None:
+            return None
+        with self._batch_lock:
+            fallbacks = self._batch_fallbacks
+        return {**self.batcher.get_stats(), "fallbacks": fallbacks}
+
+    def _parse_response(self, content: str) -> Dict[str, Any]:
+        """Parse a JSON LLM response"""
+        # Parse JSON response using JsonOutputParser
+        try:
+            return self.json_parser.parse(content)
+        except Exception as e:
+            logger.error(f"Failed to parse LLM response as JSON: {content}")
+            # Fallback to manual JSON parsing
+            try:
+                return json.loads(content)
+            except json.JSONDecodeError as json_error:
+                raise ValueError(f"Invalid JSON response from LLM: {str(json_error)}")
+
+    def _categorize_skills(self, skills: List[Any], available_skills: List[str]) -> Dict[str, Any]:
+        """
+        Validate the skill objects returned by the LLM and split them into existing and new skills
+        
+        Args:
+            skills: Raw skill objects from the LLM response
+            available_skills: Skill names of the catalog; a name matching one, ignoring case, is existing
             
-            skills = result_data['skills']
+        Returns:
+            Dictionary with existing_skills, new_skills and all_skills
+        """
+        # Validate and categorize skills
+        existing_skills = []
+        new_skills = []
+        all_skills = []
+        known_skills = {name.lower().strip(): name for name in available_skills}
+        
+        for skill_obj in skills:
+            # Validate skill object structure
+            if not isinstance(skill_obj, dict):
+                logger.warning(f"Invalid skill object format: {skill_obj}")
+                continue
             
-            # Validate and categorize skills
-            existing_skills = []
-            new_skills = []
-            all_skills = []
+            if 'name' not in skill_obj or 'is_new' not in skill_obj:
+                logger.warning(f"Skill object missing required fields: {skill_obj}")
+                continue
             
-            for skill_obj in skills:
-                # Validate skill object structure
-                if not isinstance(skill_obj, dict):
-                    logger.warning(f"Invalid skill object format: {skill_obj}")
-                    continue
-                
-                if 'name' not in skill_obj or 'is_new' not in skill_obj:
-                    logger.warning(f"Skill object missing required fields: {skill_obj}")
-                    continue
-                
-                skill_name = skill_obj['name']
-                is_new = skill_obj.get('is_new', False)
-                description = skill_obj.get('description', '')
-                
-                # Validate skill object
-                validated_skill = {
-                    'name': skill_name,
-                    'description': description,
-                    'is_new': is_new
-                }
-                
-                all_skills.append(validated_skill)
-                
-                if is_new:
-                    # New skill
-                    if not description:
-                        logger.warning(f"New skill '{skill_name}' missing description")
-                    new_skills.append({
-                        'name': skill_name,
-                        'description': description
-                    })
-                    logger.debug(f"  - NEW: {skill_name} - {description}")
-                else:
-                    # Existing skill - validate it exists in available skills
-                    if skill_name in available_skills:
-                        existing_skills.append(skill_name)
-                        logger.debug(f"  - EXISTING: {skill_name}")
-                    else:
-                        logger.warning(f"LLM marked skill '{skill_name}' as existing but it's not in available skills list")
-                        # Treat as new skill
-                        new_skills.append({
-                            'name': skill_name,
-                            'description': description or f"Auto-generated skill for {skill_name}"
-                        })
-                        # Update the skill object
-                        validated_skill['is_new'] = True
-                        validated_skill['description'] = description or f"Auto-generated skill for {skill_name}"
+            skill_name = skill_obj['name']
+            is_new = skill_obj.get('is_new', False)
+            description = skill_obj.get('description', '')
             
-            # Validate new skills count
-            if len(new_skills) > 3:
-                logger.warning(f"LLM created {len(new_skills)} new skills, exceeding limit of 3")
-                new_skills = new_skills[:3]  # Keep only first 3
-                # Update all_skills to reflect this limit
-                all_skills = [skill for skill in all_skills if not skill['is_new'] or skill['name'] in [s['name'] for s in new_skills]]
+            # A catalog skill the LLM was not offered may come back as new; it is existing
+            catalog_name = known_skills.get(str(skill_name).lower().strip())
+            if catalog_name is not None:
+                skill_name, is_new = catalog_name, False
             
-            result = {
-                'existing_skills': existing_skills,
-                'new_skills': new_skills,
-                'all_skills': all_skills
+            # Validate skill object
+            validated_skill = {
+                'name': skill_name,
+                'description': description,
+                'is_new': is_new
             }
             
-            logger.info(f"Successfully extracted {len(existing_skills)} existing and {len(new_skills)} new skills from ticket")
-            
-            return result
+            all_skills.append(validated_skill)
             
-        except Exception as e:
-            logger.error(f"Error extracting skills from ticket: {str(e)}")
-            raise
+            if is_new:
+                # New skill
+                if not description:
+                    logger.warning(f"New skill '{skill_name}' missing description")
+                new_skills.append({
+                    'name': skill_name,
+                    'description': description
+                })
+                logger.debug(f"  - NEW: {skill_name} - {description}")
+            else:
+                # Existing skill - validate it exists in available skills
+                if catalog_name is not None:
+                    existing_skills.append(skill_name)
+                    logger.debug(f"  - EXISTING: {skill_name}")
+                else:
+                    logger.warning(f"LLM marked skill '{skill_name}' as existing but it's not in available skills list")
+                    # Treat as new skill
+                    new_skills.append({
+                        'name': skill_name,
+                        'description': description or f"Auto-generated skill for {skill_name}"
+                    })
+                    # Update the skill object
+                    validated_skill['is_new'] = True
+                    validated_skill['description'] = description or f"Auto-generated skill for {skill_name}"
+        
+        # Validate new skills count
+        if len(new_skills) > 3:
+            logger.warning(f"LLM created {len(new_skills)} new skills, exceeding limit of 3")
+            new_skills = new_skills[:3]  # Keep only first 3
+            # Update all_skills to reflect this limit
+            all_skills = [skill for skill in all_skills if not skill['is_new'] or skill['name'] in [s['name'] for s in new_skills]]
+        
+        return {
+            'existing_skills': existing_skills,
+            'new_skills': new_skills,
+            'all_skills': all_skills
+        }
+    
+    def _skills_version(self, available_skills: List[str]) -> str:
+        """Content hash of the offered skill list, used when no catalog version is given"""
+        return hashlib.sha256("\n".join(available_skills).encode("utf-8")).hexdigest()[:16]
     
     def     validate_extracted_skills(self, extraction_result: Dict[str, Any], available_skills: List[str]) -> bool:
         """
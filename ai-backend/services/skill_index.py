@@ -0,0 +1,126 @@
+"""
+Skill index - Local BM25 retrieval over the skills catalog for prompt shortlisting
+"""
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from models.skill import Skill
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words that carry no signal about which skill a ticket needs
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "cannot", "for", "from", "has", "have",
+    "in", "is", "it", "its", "not", "of", "on", "or", "the", "to", "unable", "user", "users", "was",
+    "were", "with", "after", "when", "this", "that", "issue", "issues", "problem",
+}
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens without stopwords"""
+    if not text:
+        return []
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+class SkillIndex:
+    """
+    BM25 index over skill names and descriptions
+
+    Skill names are weighted more heavily than descriptions. Skills can be added
+    one at a time, so newly created skills become retrievable without a rebuild.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, name_weight: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.name_weight = name_weight
+
+        self._names: List[str] = []
+        self._term_freqs: List[Counter] = []
+        self._doc_lengths: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._positions: Dict[str, int] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_skills(cls, skills: List[Skill]) -> "SkillIndex":
+        """Build an index from a list of Skill objects"""
+        index = cls()
+        for skill in skills:
+            index.add(skill.name, skill.description)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, description: Optional[str] = None):
+        """
+        Add a skill to the index, replacing an existing skill with the same name
+
+        Args:
+            name: Skill name
+            description: Optional skill description
+        """
+        terms = Counter()
+        for token in tokenize(name):
+            terms[token] += self.name_weight
+        terms.update(tokenize(description))
+        length = sum(terms.values())
+        key = name.lower().strip()
+
+        with self._lock:
+            if key in self._positions:
+                position = self._positions[key]
+                self._total_length -= self._doc_lengths[position]
+                for term in self._term_freqs[position]:
+                    self._postings[term].remove(position)
+                self._names[position] = name
+                self._term_freqs[position] = terms
+                self._doc_lengths[position] = length
+            else:
+                position = len(self._names)
+                self._positions[key] = position
+                self._names.append(name)
+                self._term_freqs.append(terms)
+                self._doc_lengths.append(length)
+
+            self._total_length += length
+            for term in terms:
+                self._postings.setdefault(term, []).append(position)
+
+    def search(self, query: str, top_k: int) -> List[Tuple[str, float]]:
+        """
+        Get the top-K skills for a query
+
+        Args:
+            query: Free text, such as the ticket subject, description and tags
+            top_k: Maximum number of skills to return
+
+        Returns:
+            List of (skill name, score) pairs, best first. Skills with no matching terms are not returned.
+        """
+        query_terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self._names)
+            if not doc_count or not query_terms:
+                return []
+            average_length = self._total_length / doc_count
+
+            scores: Dict[int, float] = {}
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for position in postings:
+                    tf = self._term_freqs[position][term]
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[position] / average_length)
+                    scores[position] = scores.get(position, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], self._names[item[0]]))[:top_k]
+            return [(self._names[position], score) for position, score in ranked]
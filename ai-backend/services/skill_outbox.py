@@ -0,0 +1,308 @@
+"""
+Skill notification outbox - Background, batched delivery of extracted skills to the backend
+"""
+import heapq
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional, List, Tuple
+import requests
+from services.backend_client import get_backend_client
+from services.skill_catalog import get_skill_catalog
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+# Client errors that can succeed when retried; any other 4xx is permanent
+RETRYABLE_CLIENT_ERRORS = {408, 409, 425, 429}
+
+class SkillNotificationOutbox:
+    """
+    Durable outbox for `/tickets/process-skills` notifications
+
+    Notifications are queued in memory. A background worker drains up to
+    `batch_size` notifications at a time, journals the new ones to a local JSONL
+    file in one write, coalesces the ones for the same ticket into a single
+    request, and delivers them over the pooled backend client. Failures are kept
+    in a heap keyed on their next attempt and retried with exponential backoff,
+    while new notifications keep being delivered. Delivered notifications are
+    acknowledged in the journal, so anything still pending at shutdown is
+    re-queued on the next start.
+    """
+
+    def __init__(self, journal_path: str = None, max_pending: int = None, batch_size: int = None,
+                 batch_window: float = None, max_attempts: int = None, backoff_seconds: float = None):
+        self.journal_path = journal_path or Config.OUTBOX_JOURNAL_PATH
+        self.max_pending = Config.OUTBOX_MAX_PENDING if max_pending is None else max_pending
+        self.batch_size = Config.OUTBOX_BATCH_SIZE if batch_size is None else batch_size
+        self.batch_window = Config.OUTBOX_BATCH_WINDOW_SECONDS if batch_window is None else batch_window
+        self.max_attempts = Config.OUTBOX_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self.backoff_seconds = Config.OUTBOX_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
+        self.process_skills_url = f"{Config.BACKEND_SERVER_URL}/api/v1/tickets/process-skills"
+        self.backend = get_backend_client()
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=self.max_pending)
+        # Journaled notifications waiting for their next attempt, only touched by the worker
+        self._backoff: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._backoff_order = itertools.count()
+        self._journal_lock = threading.Lock()
+        self._acked_since_compaction = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"enqueued": 0, "delivered": 0, "requests": 0, "coalesced": 0, "retries": 0, "dropped": 0, "failed": 0, "recovered": 0}
+
+    def start(self):
+        """Recover pending notifications from the journal and start the delivery worker"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._recover()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="skill-notification-outbox", daemon=True)
+        self._thread.start()
+        logger.info(f"Skill notification outbox started (journal {self.journal_path})")
+
+    def stop(self, timeout: float = 5):
+        """Stop the delivery worker; undelivered notifications stay in the journal"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def enqueue(self, ticket_id: int, skills: List[Dict[str, Any]], has_new_skills: bool = False) -> bool:
+        """
+        Queue a notification for background delivery
+
+        Only the in-memory queue is touched here; the worker journals the notification
+        when it takes it from the queue, so the request path never writes to disk.
+
+        Args:
+            ticket_id: Ticket the skills were extracted for
+            skills: Skill payloads for `/tickets/process-skills`
+            has_new_skills: Whether the payload creates new skills in the backend
+
+        Returns:
+            True if the notification was queued, False if the outbox is full
+        """
+        item = {
+            "id": uuid.uuid4().hex,
+            "ticket_id": ticket_id,
+            "skills": skills,
+            "has_new_skills": has_new_skills,
+            "attempts": 0,
+            "next_attempt_at": 0.0,
+        }
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._stats["dropped"] += 1
+            logger.error(f"Skill notification outbox full ({self.max_pending} pending), dropping notification for ticket {ticket_id}")
+            return False
+
+        self._stats["enqueued"] += 1
+        return True
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._deliver(batch)
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """
+        Collect the retries that are due and the new notifications from the queue
+
+        The worker only blocks on the queue while no retry is due, and no longer than
+        the earliest backoff, so a notification backing off never holds up the others.
+        New notifications are journaled before they are returned.
+        """
+        batch = self._take_due(self.batch_size)
+        fresh = []
+        if not batch:
+            wait = 0.5
+            if self._backoff:
+                wait = min(wait, max(0.0, self._backoff[0][0] - time.monotonic()))
+            try:
+                fresh.append(self._queue.get(timeout=wait))
+            except queue.Empty:
+                return self._take_due(self.batch_size)
+
+        # Anything already queued joins the batch even after the window has closed
+        deadline = time.monotonic() + (self.batch_window if fresh else 0)
+        while len(batch) + len(fresh) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    fresh.append(self._queue.get(timeout=remaining))
+                else:
+                    fresh.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        self._journal(*({"op": "add", "item": item} for item in fresh))
+        return batch + fresh
+
+    def _take_due(self, limit: int) -> List[Dict[str, Any]]:
+        """Pop up to `limit` notifications whose backoff has expired"""
+        now = time.monotonic()
+        due = []
+        while self._backoff and len(due) < limit and self._backoff[0][0] <= now:
+            due.append(heapq.heappop(self._backoff)[2])
+        return due
+
+    def _schedule(self, item: Dict[str, Any]):
+        heapq.heappush(self._backoff, (item["next_attempt_at"], next(self._backoff_order), item))
+
+    def _deliver(self, batch: List[Dict[str, Any]]):
+        acks = []
+        for ticket_id, items in self._coalesce(batch).items():
+            skills = self._merge_skills(items)
+            try:
+                self._stats["requests"] += 1
+                response = self.backend.post("process_skills", self.process_skills_url, json={"ticket_id": ticket_id, "skills": skills})
+                response.raise_for_status()
+                response_data = response.json()
+                if not response_data.get("success"):
+                    raise Exception(response_data.get("message", "Unknown error"))
+            except requests.HTTPError as e:
+                status_code = e.response.status_code if e.response is not None else None
+                if status_code is not None and 400 <= status_code < 500 and status_code not in RETRYABLE_CLIENT_ERRORS:
+                    self._fail(items, str(e))
+                else:
+                    self._retry(items, str(e))
+                continue
+            except Exception as e:
+                self._retry(items, str(e))
+                continue
+
+            acks.extend({"op": "ack", "id": item["id"]} for item in items)
+            self._stats["delivered"] += len(items)
+            logger.info(f"Delivered {len(items)} skill notification(s) for ticket {ticket_id}")
+
+            if any(item["has_new_skills"] for item in items):
+                get_skill_catalog().invalidate_after_create()
+
+        self._journal(*acks)
+        self._maybe_compact()
+
+    def _coalesce(self, items: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        by_ticket: Dict[int, List[Dict[str, Any]]] = {}
+        for item in items:
+            by_ticket.setdefault(item["ticket_id"], []).append(item)
+        self._stats["coalesced"] += len(items) - len(by_ticket)
+        return by_ticket
+
+    def _merge_skills(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge skill payloads for one ticket; later notifications win for the same skill name"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            for skill in item["skills"]:
+                merged[skill["name"].lower().strip()] = skill
+        return list(merged.values())
+
+    def _fail(self, items: List[Dict[str, Any]], error: str):
+        """Drop notifications the backend rejected, as retrying would be rejected the same way"""
+        for item in items:
+            self._stats["failed"] += 1
+            self._journal({"op": "ack", "id": item["id"]})
+            logger.error(f"Dropping skill notification for ticket {item['ticket_id']}, rejected by the backend: {error}")
+
+    def _retry(self, items: List[Dict[str, Any]], error: str):
+        for item in items:
+            item["attempts"] += 1
+            if item["attempts"] >= self.max_attempts:
+                self._stats["failed"] += 1
+                self._journal({"op": "ack", "id": item["id"]})
+                logger.error(f"Giving up on skill notification for ticket {item['ticket_id']} after {item['attempts']} attempts: {error}")
+                continue
+            self._stats["retries"] += 1
+            item["next_attempt_at"] = time.monotonic() + self.backoff_seconds * (2 ** (item["attempts"] - 1))
+            logger.warning(f"Skill notification for ticket {item['ticket_id']} failed ({error}), retry {item['attempts']}/{self.max_attempts - 1}")
+            self._schedule(item)
+
+    def _journal(self, *records: Dict[str, Any]):
+        """Append records to the journal in a single write"""
+        if not self.journal_path or not records:
+            return
+        try:
+            with self._journal_lock:
+                with open(self.journal_path, "a", encoding="utf-8") as journal:
+                    journal.write("".join(json.dumps(record) + "\n" for record in records))
+                self._acked_since_compaction += sum(1 for record in records if record["op"] == "ack")
+        except OSError as e:
+            logger.error(f"Failed to write skill outbox journal: {str(e)}")
+
+    def _read_pending(self) -> List[Dict[str, Any]]:
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return []
+        pending: Dict[str, Dict[str, Any]] = {}
+        with open(self.journal_path, "r", encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written last line from a crash
+                    continue
+                if record.get("op") == "add":
+                    pending[record["item"]["id"]] = record["item"]
+                elif record.get("op") == "ack":
+                    pending.pop(record.get("id"), None)
+        return list(pending.values())
+
+    def _recover(self):
+        """Re-queue notifications that were journaled but never acknowledged"""
+        if not self.journal_path:
+            return
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._journal_lock:
+            pending = self._read_pending()
+            for item in pending:
+                item["next_attempt_at"] = 0.0
+                self._schedule(item)
+            self._rewrite(pending)
+        if pending:
+            self._stats["recovered"] += len(pending)
+            logger.info(f"Recovered {len(pending)} pending skill notification(s) from journal")
+
+    def _maybe_compact(self):
+        """Rewrite the journal with only pending notifications once enough have been acknowledged"""
+        if not self.journal_path or self._acked_since_compaction < Config.OUTBOX_COMPACT_AFTER:
+            return
+        with self._journal_lock:
+            self._rewrite(self._read_pending())
+
+    def _rewrite(self, pending: List[Dict[str, Any]]):
+        temp_path = f"{self.journal_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as journal:
+            for item in pending:
+                journal.write(json.dumps({"op": "add", "item": item}) + "\n")
+        os.replace(temp_path, self.journal_path)
+        self._acked_since_compaction = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get outbox statistics"""
+        return {
+            "pending": self._queue.qsize() + len(self._backoff),
+            "max_pending": self.max_pending,
+            "worker_running": self._thread is not None and self._thread.is_alive(),
+            **self._stats,
+        }
+
+_skill_outbox: Optional[SkillNotificationOutbox] = None
+_skill_outbox_lock = threading.Lock()
+
+def get_skill_outbox() -> SkillNotificationOutbox:
+    """Get the process-wide skill notification outbox, creating it on first use"""
+    global _skill_outbox
+    if _skill_outbox is None:
+        with _skill_outbox_lock:
+            if _skill_outbox is None:
+                _skill_outbox = SkillNotificationOutbox()
+    return _skill_outbox
@@ -0,0 +1,67 @@
+"""
+Stage timer - Start and end offsets of the stages of one assignment pipeline run
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+from services.metrics import STAGE_DURATION, track_stage
+
+class StageTimer:
+    """
+    Records when each pipeline stage starts and ends, relative to the start of the run
+
+    Stages may run on other threads or overlap, so offsets are kept instead of
+    durations alone; the overlap of two stages can then be read off directly.
+    With a pipeline name, each stage is also recorded in the stage metrics.
+    """
+
+    def __init__(self, pipeline: Optional[str] = None, started: Optional[float] = None):
+        self.pipeline = pipeline
+        self._started = time.perf_counter() if started is None else started
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _offset_ms(self, timestamp: float) -> float:
+        return round((timestamp - self._started) * 1000, 1)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as the stage `name`"""
+        start = time.perf_counter()
+        try:
+            if self.pipeline is None:
+                yield
+            else:
+                with track_stage(self.pipeline, name):
+                    yield
+        finally:
+            self._record(name, start, time.perf_counter())
+
+    def record(self, name: str, start: float, end: float):
+        """Record a stage timed outside the timer, from perf_counter() readings"""
+        if self.pipeline is not None:
+            STAGE_DURATION.observe((self.pipeline, name), end - start)
+        self._record(name, start, end)
+
+    def _record(self, name: str, start: float, end: float):
+        with self._lock:
+            self._stages[name] = {
+                "start_ms": self._offset_ms(start),
+                "end_ms": self._offset_ms(end),
+                "duration_ms": round((end - start) * 1000, 1),
+            }
+
+    def overlap_ms(self, first: str, second: str) -> float:
+        """How long two recorded stages ran at the same time"""
+        with self._lock:
+            a, b = self._stages.get(first), self._stages.get(second)
+        if a is None or b is None:
+            return 0.0
+        return round(max(0.0, min(a["end_ms"], b["end_ms"]) - max(a["start_ms"], b["start_ms"])), 1)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the recorded stages and the elapsed time so far"""
+        with self._lock:
+            stages = dict(self._stages)
+        return {"stages": stages, "total_ms": self._offset_ms(time.perf_counter())}
@@ -0,0 +1,141 @@
+"""
+Startup - Startup time report and warm-up of the caches and connections the first requests need
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+from langchain_core.prompts import PromptTemplate
+from services.stage_timer import StageTimer
+from services.token_usage import estimate_tokens
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+class StartupReport:
+    """
+    How long the process took to become ready, phase by phase
+
+    Phases are offsets from `started`, which the entry point takes before its heavy
+    imports, and are also recorded in the stage metrics under the "startup" pipeline.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.timer = StageTimer("startup", started=started)
+        self.ready_ms: Optional[float] = None
+        self.warm_up: Optional[Dict[str, Any]] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as the startup phase `name`"""
+        with self.timer.stage(name):
+            yield
+
+    def record(self, name: str, start: float, end: Optional[float] = None):
+        """Record a phase that started at the perf_counter() reading `start` and ends now"""
+        self.timer.record(name, start, time.perf_counter() if end is None else end)
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_ms is not None
+
+    def mark_ready(self):
+        """Close the report and log where the startup time went"""
+        report = self.timer.as_dict()
+        self.ready_ms = report["total_ms"]
+        phases = ", ".join(f"{name} {stage['duration_ms']}ms" for name, stage in report["stages"].items())
+        logger.info(f"Startup completed in {self.ready_ms}ms ({phases})")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "ready_ms": self.ready_ms,
+            "phases": self.timer.as_dict()["stages"],
+            "warm_up": self.warm_up,
+        }
+
+def _warm_catalog(assignment_service):
+    snapshot = assignment_service.skill_catalog.get_snapshot()
+    # The BM25 index is built on first use of a catalog version
+    assignment_service.skill_catalog.get_index(snapshot)
+
+def _warm_connections(assignment_service, connections: int):
+    """Open pooled keep-alive connections with concurrent conditional catalog requests"""
+    catalog = assignment_service.skill_catalog
+
+    def revalidate(_):
+        assignment_service.backend.get("skills_all", catalog.skills_url, headers=catalog.conditional_headers()).close()
+
+    connections = min(connections, assignment_service.backend.pool_size)
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="warmup-connection") as pool:
+        list(pool.map(revalidate, range(connections)))
+
+def _prime_prompts(*services):
+    """Format every prompt template once and load the token counter"""
+    for service in services:
+        for template in vars(service).values():
+            if isinstance(template, PromptTemplate):
+                estimate_tokens(template.format(**{variable: "" for variable in template.input_variables}))
+
+def warm_up(report: StartupReport, assignment_service, evaluation_service=None) -> bool:
+    """
+    Fill the caches and connection pools the first requests would otherwise pay for
+
+    Loads the skill catalog and its search index, the technician roster, opens
+    STARTUP_WARMUP_CONNECTIONS pooled backend connections and primes the prompt
+    templates. Every step is a `warmup_<step>` phase of the report. A failing step
+    is logged and skipped, so that cache fills on first use as without warm-up.
+
+    Args:
+        report: Startup report of the process
+        assignment_service: AssignmentService to warm up
+        evaluation_service: EvaluationService sharing the roster, if any
+
+    Returns:
+        Whether every step succeeded
+    """
+    steps = [("catalog", lambda: _warm_catalog(assignment_service))]
+    if assignment_service.technician_roster is not None:
+        steps.append(("roster", assignment_service.technician_roster.refresh))
+    steps.append(("connections", lambda: _warm_connections(assignment_service, Config.STARTUP_WARMUP_CONNECTIONS)))
+    prompt_services = [assignment_service.skill_extraction_service, assignment_service.technician_selection_service]
+    if evaluation_service is not None:
+        prompt_services.append(evaluation_service)
+    steps.append(("prompts", lambda: _prime_prompts(*prompt_services)))
+
+    errors = {}
+    for name, step in steps:
+        try:
+            with report.phase(f"warmup_{name}"):
+                step()
+        except Exception as e:
+            errors[name] = str(e)
+            logger.warning(f"Startup warm-up step {name} failed, it will run on first use: {str(e)}")
+
+    report.warm_up = {"completed": not errors, "errors": errors}
+    return not errors
+
+async def awarm_up(report: StartupReport, service) -> bool:
+    """
+    Async version of warm_up for the ASGI app
+
+    Runs the blocking steps on a worker thread, then opens the pooled connections of
+    the async backend client, which the async service uses instead of the sync one.
+    """
+    completed = await asyncio.to_thread(warm_up, report, service)
+    try:
+        with report.phase("warmup_async_connections"):
+            catalog = service.skill_catalog
+            responses = await asyncio.gather(*(
+                service.async_backend.get("skills_all", catalog.skills_url, headers=catalog.conditional_headers())
+                for _ in range(Config.STARTUP_WARMUP_CONNECTIONS)
+            ))
+            for response in responses:
+                await response.aclose()
+    except Exception as e:
+        report.warm_up["errors"]["async_connections"] = str(e)
+        report.warm_up["completed"] = completed = False
+        logger.warning(f"Startup warm-up of async connections failed: {str(e)}")
+    return completed
@@ -0,0 +1,130 @@
+"""
+Stream parsers - Incremental parsing of JSON fields from streamed LLM output
+"""
+import json
+import re
+from typing import Any, List, Optional
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+class IncrementalArrayParser:
+    """
+    Detects when the JSON array value of a key is complete while the response is still streaming
+
+    The text is scanned once, tracking string and escape state and bracket depth, so the
+    array can be handed off as soon as its closing bracket arrives.
+    """
+
+    def __init__(self, key: str):
+        self._key_re = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self.text = ""
+        self._start: Optional[int] = None
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.result: Optional[List[Any]] = None
+
+    def feed(self, chunk: str) -> Optional[List[Any]]:
+        """
+        Add streamed text
+
+        Args:
+            chunk: Next piece of the LLM response
+
+        Returns:
+            The parsed array once it is complete, otherwise None
+        """
+        self.text += chunk
+        if self.result is not None:
+            return self.result
+
+        if self._start is None:
+            match = self._key_re.search(self.text)
+            if match is None:
+                return None
+            self._start = match.end() - 1
+            self._position = match.end()
+            self._depth = 1
+
+        text = self.text
+        for position in range(self._position, len(text)):
+            char = text[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.result = json.loads(text[self._start:position + 1])
+                    return self.result
+        self._position = len(text)
+        return None
+
+class IncrementalStringField:
+    """Decodes the JSON string value of a key as it streams, returning only the new characters"""
+
+    def __init__(self, key: str):
+        self._key_re = re.compile(r'"%s"\s*:\s*"' % re.escape(key))
+        self.text = ""
+        self._position: Optional[int] = None
+        self.value = ""
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add streamed text
+
+        Args:
+            chunk: Next piece of the LLM response
+
+        Returns:
+            Characters of the string value decoded from this chunk, possibly empty
+        """
+        self.text += chunk
+        if self.done:
+            return ""
+        if self._position is None:
+            match = self._key_re.search(self.text)
+            if match is None:
+                return ""
+            self._position = match.end()
+
+        decoded = []
+        text = self.text
+        position = self._position
+        while position < len(text):
+            char = text[position]
+            if char == '"':
+                self.done = True
+                position += 1
+                break
+            if char != "\\":
+                decoded.append(char)
+                position += 1
+                continue
+            # Wait for the rest of an escape sequence that was split across chunks
+            if position + 1 >= len(text):
+                break
+            escape = text[position + 1]
+            if escape == "u":
+                if position + 6 > len(text):
+                    break
+                decoded.append(chr(int(text[position + 2:position + 6], 16)))
+                position += 6
+            else:
+                decoded.append(_ESCAPES.get(escape, escape))
+                position += 2
+        self._position = position
+
+        delta = "".join(decoded)
+        self.value += delta
+        return delta
@@ -0,0 +1,342 @@
+"""
+Technician roster cache - Local roster snapshot with a skill_id -> technicians inverted index
+"""
+from array import array
+from collections import namedtuple
+from datetime import datetime
+import logging
+import sys
+import threading
+import time
+from typing import Dict, Any, Optional, List, Set, Iterable
+import orjson
+from models.technician import AvailabilityStatus, SkillLevel, SkillObject, Technician
+from services.backend_client import get_backend_client
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+def _parse_timestamp(value: Any) -> datetime:
+    if value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            pass
+    return datetime.now()
+
+# Skill entry of a CompactTechnician, read like SkillObject by the selection services
+SkillRef = namedtuple("SkillRef", ["id", "percentage"])
+
+# Enum values are interned so every record shares one string per status and level
+_AVAILABILITY_STATUSES = {status.value: sys.intern(status.value) for status in AvailabilityStatus}
+_SKILL_LEVELS = {level.value: sys.intern(level.value) for level in SkillLevel}
+
+# The backend rejects a `limit` above 100 on `/technicians`
+MAX_DELTA_PAGE_SIZE = 100
+
+class CompactTechnician:
+    """
+    Technician record as held by the roster and read by technician selection
+
+    Built straight from the backend JSON without model validation: enum values are
+    interned strings, skills are parallel int arrays, and timestamps stay as the raw
+    strings until `to_technician` parses them. Exposes the attributes the selection
+    and scoring services read from Technician, with `skills` as (id, percentage) pairs.
+    """
+    __slots__ = ("id", "name", "user_id", "workload", "availability_status", "skill_level", "specialization",
+                 "assigned_tickets_total", "assigned_tickets", "skill_ids", "skill_percentages", "created_at", "updated_at")
+
+    is_active = True
+
+    def __init__(self, tech_data: Dict[str, Any]):
+        name = (tech_data.get('name') or '').strip()
+        if len(name) < 2:
+            raise ValueError("Technician name must be at least 2 characters")
+        availability_status = tech_data.get('availability_status', AvailabilityStatus.AVAILABLE.value)
+        skill_level = tech_data.get('skill_level', SkillLevel.JUNIOR.value)
+        if availability_status not in _AVAILABILITY_STATUSES or skill_level not in _SKILL_LEVELS:
+            raise ValueError(f"Unknown availability status {availability_status!r} or skill level {skill_level!r}")
+
+        # Numbers are coerced with int() like the lax validation of the Technician model,
+        # so IDs and percentages sent as strings or floats are accepted
+        skill_ids = array('i')
+        skill_percentages = array('b')
+        for skill_data in tech_data.get('skills') or ():
+            if isinstance(skill_data, dict) and 'id' in skill_data:
+                percentage = int(skill_data.get('percentage', 0))
+                if not 0 <= percentage <= 100:
+                    raise ValueError(f"Skill percentage {percentage} is not between 0 and 100")
+                skill_ids.append(int(skill_data['id']))
+                skill_percentages.append(percentage)
+
+        assigned_tickets = tech_data.get('assigned_tickets')
+        specialization = tech_data.get('specialization')
+
+        tech_id = tech_data.get('id')
+        user_id = tech_data.get('user_id')
+
+        self.id = int(tech_id) if tech_id is not None else None
+        self.name = name
+        self.user_id = int(user_id) if user_id is not None else None
+        self.workload = int(tech_data.get('workload', 0))
+        self.availability_status = _AVAILABILITY_STATUSES[availability_status]
+        self.skill_level = _SKILL_LEVELS[skill_level]
+        self.specialization = sys.intern(specialization) if specialization else specialization
+        self.assigned_tickets_total = int(tech_data.get('assigned_tickets_total', 0))
+        self.assigned_tickets = array('i', map(int, assigned_tickets)) if isinstance(assigned_tickets, list) else array('i')
+        self.skill_ids = skill_ids
+        self.skill_percentages = skill_percentages
+        self.created_at = tech_data.get('created_at')
+        self.updated_at = tech_data.get('updated_at')
+
+    @property
+    def skills(self) -> List[SkillRef]:
+        return [SkillRef(skill_id, percentage) for skill_id, percentage in zip(self.skill_ids, self.skill_percentages)]
+
+    def to_technician(self) -> Technician:
+        """Get the validated Technician model of this record"""
+        return Technician(
+            id=self.id,
+            name=self.name,
+            user_id=self.user_id,
+            assigned_tickets_total=self.assigned_tickets_total,
+            assigned_tickets=list(self.assigned_tickets),
+            skills=[SkillObject(id=skill_id, percentage=percentage) for skill_id, percentage in zip(self.skill_ids, self.skill_percentages)],
+            workload=self.workload,
+            availability_status=self.availability_status,
+            skill_level=self.skill_level,
+            specialization=self.specialization,
+            created_at=_parse_timestamp(self.created_at),
+            updated_at=_parse_timestamp(self.updated_at)
+        )
+
+    def __repr__(self) -> str:
+        return f"CompactTechnician(id={self.id!r}, name={self.name!r}, workload={self.workload!r}, skills={len(self.skill_ids)})"
+
+def parse_technicians_payload(body: bytes) -> List[Dict[str, Any]]:
+    """
+    Decode a backend technicians response body with orjson
+
+    Args:
+        body: Raw response body of `/technicians/all`, `/technicians/by-skills` or `/technicians`
+
+    Returns:
+        The technician records, or raises if the backend reported an error
+    """
+    response_data = orjson.loads(body)
+    if not response_data.get('success'):
+        raise Exception(f"Backend returned error: {response_data.get('message', 'Unknown error')}")
+    return response_data.get('data', {}).get('technicians', [])
+
+class TechnicianRoster:
+    """
+    Local snapshot of the active technician roster
+
+    Records are held as CompactTechnician rather than Technician models. The roster is loaded once from `/technicians/all` and then kept current by a
+    background thread that pulls only the records changed since the newest
+    `updated_at` seen so far. Reads refresh synchronously when the snapshot is
+    older than the configured staleness bound, so workload and availability are
+    never older than `max_staleness_seconds`.
+    """
+
+    def __init__(self, base_url: str = None, refresh_interval: float = None, max_staleness: float = None):
+        self.base_url = base_url or f"{Config.BACKEND_SERVER_URL}/api/v1"
+        self.refresh_interval = Config.ROSTER_REFRESH_INTERVAL_SECONDS if refresh_interval is None else refresh_interval
+        self.max_staleness = Config.ROSTER_MAX_STALENESS_SECONDS if max_staleness is None else max_staleness
+        self.backend = get_backend_client()
+
+        # Snapshot state is replaced wholesale under the lock, so readers never see a half-applied delta
+        self._technicians: Dict[int, CompactTechnician] = {}
+        self._skill_index: Dict[int, Set[int]] = {}
+        self._watermark: Optional[str] = None
+        self._refreshed_at: Optional[float] = None
+        self._refresh_failed_at: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"full_loads": 0, "delta_refreshes": 0, "records_applied": 0, "sync_refreshes": 0, "errors": 0}
+
+    def start(self):
+        """Start the background refresh thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="technician-roster-refresh", daemon=True)
+        self._thread.start()
+        logger.info(f"Technician roster refresh started (interval {self.refresh_interval}s)")
+
+    def stop(self):
+        """Stop the background refresh thread"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Background technician roster refresh failed: {str(e)}")
+            self._stop_event.wait(self.refresh_interval)
+
+    def refresh(self):
+        """Load the full roster on first use, otherwise apply changes since the last refresh"""
+        with self._refresh_lock:
+            if self._watermark is None:
+                self._full_load()
+            else:
+                self._delta_refresh()
+
+    def _full_load(self):
+        response = self.backend.get("technicians_all", f"{self.base_url}/technicians/all")
+        response.raise_for_status()
+        records = parse_technicians_payload(response.content)
+        self._apply(records, replace=True)
+        self._stats["full_loads"] += 1
+        logger.info(f"Loaded technician roster with {len(self._technicians)} technicians")
+
+    def _delta_refresh(self):
+        records = []
+        page = 1
+        while True:
+            params = {
+                'updated_from': self._watermark,
+                'sort_by': 'updated_at',
+                'sort_order': 'ASC',
+                'limit': min(Config.ROSTER_DELTA_PAGE_SIZE, MAX_DELTA_PAGE_SIZE),
+                'page': page,
+            }
+            response = self.backend.get("technicians_delta", f"{self.base_url}/technicians", params=params)
+            response.raise_for_status()
+            data = orjson.loads(response.content).get('data', {})
+            records.extend(data.get('technicians', []))
+            if not data.get('pagination', {}).get('hasNextPage'):
+                break
+            page += 1
+
+        self._apply(records, replace=False)
+        self._stats["delta_refreshes"] += 1
+        if records:
+            logger.info(f"Applied {len(records)} technician roster changes")
+
+    def _apply(self, records: Iterable[Dict[str, Any]], replace: bool):
+        with self._lock:
+            technicians = {} if replace else dict(self._technicians)
+            watermark = self._watermark
+            applied = 0
+
+            for tech_data in records:
+                updated_at = tech_data.get('updated_at')
+                if updated_at and (watermark is None or updated_at > watermark):
+                    watermark = updated_at
+
+                if not tech_data.get('is_active', True):
+                    tech_id = tech_data.get('id')
+                    technicians.pop(int(tech_id) if tech_id is not None else None, None)
+                    continue
+                try:
+                    technician = CompactTechnician(tech_data)
+                    technicians[technician.id] = technician
+                    applied += 1
+                except Exception as e:
+                    logger.warning(f"Failed to parse technician data: {tech_data}, error: {str(e)}")
+
+            skill_index: Dict[int, Set[int]] = {}
+            for tech_id, technician in technicians.items():
+                for skill_id in technician.skill_ids:
+                    skill_index.setdefault(skill_id, set()).add(tech_id)
+
+            self._technicians = technicians
+            self._skill_index = skill_index
+            self._watermark = watermark
+            self._refreshed_at = time.monotonic()
+            self._stats["records_applied"] += applied
+
+    def _ensure_fresh(self):
+        """
+        Refresh synchronously if the snapshot is missing or older than the staleness bound
+
+        If the refresh fails and a snapshot was loaded before, the stale snapshot is
+        served and the synchronous refresh is not retried for `refresh_interval`,
+        so a backend outage does not fail or slow down every read. Raises only when
+        there is no snapshot at all.
+        """
+        now = time.monotonic()
+        if self._refreshed_at is not None:
+            if now - self._refreshed_at <= self.max_staleness:
+                return
+            if self._refresh_failed_at is not None and now - self._refresh_failed_at < self.refresh_interval:
+                return
+
+        self._stats["sync_refreshes"] += 1
+        try:
+            self.refresh()
+            self._refresh_failed_at = None
+        except Exception as e:
+            if self._refreshed_at is None:
+                raise
+            self._refresh_failed_at = time.monotonic()
+            self._stats["errors"] += 1
+            logger.warning(f"Technician roster refresh failed, serving snapshot from {round(now - self._refreshed_at, 1)}s ago: {str(e)}")
+
+    def get_candidates(self, skill_ids: List[int]) -> List[CompactTechnician]:
+        """
+        Get active technicians that have any of the given skills
+
+        Args:
+            skill_ids: Skill IDs extracted for the ticket
+
+        Returns:
+            Matching technicians ordered by workload then name, like `/technicians/by-skills`
+        """
+        self._ensure_fresh()
+        with self._lock:
+            technicians = self._technicians
+            candidate_ids = set().union(*(self._skill_index.get(skill_id, set()) for skill_id in skill_ids))
+        candidates = [technicians[tech_id] for tech_id in candidate_ids]
+        candidates.sort(key=lambda tech: (tech.workload, tech.name))
+        return candidates
+
+    def get_technician(self, technician_id: int) -> Optional[Technician]:
+        """Get an active technician by ID, or None if the roster does not have it"""
+        self._ensure_fresh()
+        with self._lock:
+            technician = self._technicians.get(technician_id)
+        return technician.to_technician() if technician is not None else None
+
+    def get_all(self) -> List[CompactTechnician]:
+        """Get all active technicians in the roster"""
+        self._ensure_fresh()
+        with self._lock:
+            technicians = list(self._technicians.values())
+        technicians.sort(key=lambda tech: tech.name)
+        return technicians
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get roster cache statistics"""
+        age = None if self._refreshed_at is None else round(time.monotonic() - self._refreshed_at, 2)
+        return {
+            "technicians": len(self._technicians),
+            "indexed_skills": len(self._skill_index),
+            "snapshot_age_seconds": age,
+            "max_staleness_seconds": self.max_staleness,
+            "watermark": self._watermark,
+            "background_refresh": self._thread is not None and self._thread.is_alive(),
+            **self._stats,
+        }
+
+_technician_roster: Optional[TechnicianRoster] = None
+_technician_roster_lock = threading.Lock()
+
+def get_technician_roster() -> TechnicianRoster:
+    """Get the process-wide technician roster cache, creating it on first use"""
+    global _technician_roster
+    if _technician_roster is None:
+        with _technician_roster_lock:
+            if _technician_roster is None:
+                _technician_roster = TechnicianRoster()
+    return _technician_roster
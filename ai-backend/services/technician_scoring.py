@@ -0,0 +1,278 @@
+"""
+Technician scoring service - Deterministic, vectorized alternative to LLM technician selection
+"""
+import logging
+import re
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from models.ticket import Ticket
+from models.skill import Skill
+from models.technician import AvailabilityStatus, SkillLevel, Technician
+
+logger = logging.getLogger(__name__)
+
+# Weights of the suitability score used by the selection rules
+SKILL_MATCH_WEIGHT = 0.6
+WORKLOAD_WEIGHT = 0.4
+
+# Statuses that exclude a technician from high and medium priority tickets
+UNAVAILABLE_STATUSES = {AvailabilityStatus.END_OF_SHIFT.value}
+
+EXPERIENCED_LEVELS = {SkillLevel.SENIOR.value, SkillLevel.EXPERT.value}
+TRAINING_LEVELS = {SkillLevel.JUNIOR.value, SkillLevel.MID.value}
+
+# Words of three or more characters, so connectives like "of" or "it" never make a specialist
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+def _value(field: Any) -> str:
+    """Enum fields may arrive as enums or as their values"""
+    return getattr(field, "value", field)
+
+class TechnicianScoringService:
+    """
+    Service for selecting the best technician with the assignment rules applied as arithmetic
+
+    The suitability score for every candidate is computed at once over a
+    technicians x required-skills proficiency matrix:
+    `Score = 0.6 * Skill_Match_Score + 0.4 * Workload_Score`.
+    """
+
+    def build_proficiency_matrix(self, technicians: List[Technician], skill_ids: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build the technicians x skills proficiency matrix
+
+        Args:
+            technicians: Candidate technicians (rows)
+            skill_ids: Required skill IDs (columns)
+
+        Returns:
+            Tuple of (percentages, possession mask), both shaped (len(technicians), len(skill_ids))
+        """
+        column = {skill_id: j for j, skill_id in enumerate(skill_ids)}
+        percentages = np.zeros((len(technicians), len(skill_ids)), dtype=np.float64)
+        possessed = np.zeros((len(technicians), len(skill_ids)), dtype=bool)
+        for i, tech in enumerate(technicians):
+            for skill in tech.skills or []:
+                j = column.get(skill.id)
+                if j is not None:
+                    percentages[i, j] = skill.percentage
+                    possessed[i, j] = True
+        return percentages, possessed
+
+    def score_technicians(self, technicians: List[Technician], required_skills: List[Skill]) -> Dict[str, np.ndarray]:
+        """
+        Compute the suitability score of every technician
+
+        Args:
+            technicians: Candidate technicians
+            required_skills: Skills required for the ticket
+
+        Returns:
+            Dictionary of per-technician arrays: skill_match, workload_score and score
+        """
+        skill_ids = [skill.id for skill in required_skills if skill.id is not None]
+        workload = np.array([tech.workload for tech in technicians], dtype=np.float64)
+        workload_score = 1.0 - np.clip(workload, 0, 100) / 100.0
+
+        if skill_ids:
+            percentages, possessed = self.build_proficiency_matrix(technicians, skill_ids)
+            match_count = possessed.sum(axis=1)
+            average_percentage = np.divide(
+                percentages.sum(axis=1), match_count,
+                out=np.zeros(len(technicians)), where=match_count > 0
+            )
+            skill_match = (match_count / len(skill_ids)) * (average_percentage / 100.0)
+        else:
+            skill_match = np.zeros(len(technicians))
+
+        return {
+            "skill_match": skill_match,
+            "workload_score": workload_score,
+            "score": SKILL_MATCH_WEIGHT * skill_match + WORKLOAD_WEIGHT * workload_score,
+        }
+
+    def rank_technicians(self, technicians: List[Technician], required_skills: List[Skill]) -> List[int]:
+        """
+        Rank technicians by suitability score, highest first
+
+        Returns:
+            Indices into `technicians` in ranked order
+        """
+        if not technicians:
+            return []
+        scores = self.score_technicians(technicians, required_skills)
+        # lexsort sorts by the last key first: score, then skill match, then lower workload
+        order = np.lexsort((-scores["workload_score"], -scores["skill_match"], -scores["score"]))
+        return order.tolist()
+
+    def shortlist_technicians(self, ticket: Ticket, technicians: List[Technician], required_skills: List[Skill], top_k: int) -> List[Technician]:
+        """
+        Cut a candidate list down to the top-K technicians for a ticket
+
+        Candidates are ranked in the tiers the priority rules select from, so the technician
+        the rules would pick from the full list is always kept: for critical tickets
+        experienced specialists, then experienced technicians with a matching skill, then
+        experienced ones, ordered by workload; for low tickets available junior or mid-level
+        technicians with a matching skill, then reachable experienced ones; otherwise
+        reachable technicians. Within a tier candidates are ordered by suitability score,
+        skill match and workload.
+
+        Args:
+            ticket: Ticket object containing the issue information
+            technicians: Candidate technicians
+            required_skills: Skills required for the ticket
+            top_k: Maximum number of technicians to keep
+
+        Returns:
+            At most `top_k` technicians, best first
+        """
+        if top_k <= 0 or len(technicians) <= top_k:
+            return list(technicians)
+
+        priority = _value(ticket.priority)
+        scores = self.score_technicians(technicians, required_skills)
+        levels = np.array([_value(tech.skill_level) for tech in technicians])
+        statuses = np.array([_value(tech.availability_status) for tech in technicians])
+        experienced = np.isin(levels, list(EXPERIENCED_LEVELS))
+        reachable = ~np.isin(statuses, list(UNAVAILABLE_STATUSES))
+
+        if priority == "critical":
+            tiers = (self._specialists(ticket, technicians) & experienced, experienced & (scores["skill_match"] > 0), experienced)
+        elif priority == "low":
+            tiers = (self._trainees(scores, levels, statuses, bool(required_skills)), reachable & experienced, experienced, reachable)
+        else:
+            tiers = (reachable,)
+        # Index of the first tier each technician is in, len(tiers) for none
+        tier = np.full(len(technicians), len(tiers))
+        for rank in reversed(range(len(tiers))):
+            tier[tiers[rank]] = rank
+
+        if priority == "critical":
+            # Same order as _select_critical: lowest workload, then the strongest skill match
+            order = np.lexsort((-scores["skill_match"], -scores["workload_score"], tier))
+        else:
+            order = np.lexsort((-scores["workload_score"], -scores["skill_match"], -scores["score"], tier))
+        return [technicians[i] for i in order[:top_k]]
+
+    def select_technician_for_ticket(self, ticket: Ticket, available_technicians: List[Technician], required_skills: List[Skill]) -> Tuple[Optional[Technician], Optional[str]]:
+        """
+        Select the best technician for a ticket using the priority rules
+
+        Args:
+            ticket: Ticket object containing the issue information
+            available_technicians: List of available Technician objects to choose from
+            required_skills: List of Skill objects required for the ticket
+
+        Returns:
+            Tuple of the selected Technician (or None) and a justification
+        """
+        if not available_technicians:
+            logger.warning("No technicians available for scoring")
+            return None, None
+
+        priority = _value(ticket.priority)
+        scores = self.score_technicians(available_technicians, required_skills)
+        levels = np.array([_value(tech.skill_level) for tech in available_technicians])
+        statuses = np.array([_value(tech.availability_status) for tech in available_technicians])
+        experienced = np.isin(levels, list(EXPERIENCED_LEVELS))
+
+        if priority == "critical":
+            index = self._select_critical(ticket, available_technicians, scores, experienced)
+        elif priority == "low":
+            index = self._select_low(scores, levels, statuses, experienced, bool(required_skills))
+        else:
+            index = self._select_standard(scores, statuses)
+
+        selected = available_technicians[index]
+        justification = self._build_justification(ticket, selected, required_skills)
+        logger.info(f"Scoring selected technician: {selected.name} (ID: {selected.id}) with score {scores['score'][index]:.3f}")
+        return selected, justification
+
+    def _select_critical(self, ticket: Ticket, technicians: List[Technician], scores: Dict[str, np.ndarray], experienced: np.ndarray) -> int:
+        """Critical tickets go to an experienced specialist with the lowest workload, ignoring availability"""
+        specialist = self._specialists(ticket, technicians)
+
+        for mask in (specialist & experienced, experienced & (scores["skill_match"] > 0), experienced, np.ones(len(technicians), dtype=bool)):
+            if mask.any():
+                break
+
+        # Lowest workload first, then the strongest skill match
+        candidates = np.flatnonzero(mask)
+        best = np.lexsort((-scores["skill_match"][candidates], -scores["workload_score"][candidates]))[0]
+        return int(candidates[best])
+
+    def _specialists(self, ticket: Ticket, technicians: List[Technician]) -> np.ndarray:
+        """Mask of technicians whose specialization shares a word with the ticket"""
+        ticket_words = set(_WORD_RE.findall(f"{ticket.subject} {ticket.description}".lower()))
+        return np.array([
+            bool(tech.specialization) and bool(set(_WORD_RE.findall(tech.specialization.lower())) & ticket_words)
+            for tech in technicians
+        ], dtype=bool)
+
+    def _trainees(self, scores: Dict[str, np.ndarray], levels: np.ndarray, statuses: np.ndarray, has_required_skills: bool) -> np.ndarray:
+        """Mask of available junior and mid-level technicians, with a matching skill if any are required"""
+        trainees = np.isin(levels, list(TRAINING_LEVELS)) & (statuses == AvailabilityStatus.AVAILABLE.value)
+        if has_required_skills:
+            trainees &= scores["skill_match"] > 0
+        return trainees
+
+    def _select_standard(self, scores: Dict[str, np.ndarray], statuses: np.ndarray, mask: np.ndarray = None) -> int:
+        """High and medium tickets go to the highest suitability score among reachable technicians"""
+        eligible = ~np.isin(statuses, list(UNAVAILABLE_STATUSES))
+        if mask is not None:
+            eligible &= mask
+        if not eligible.any():
+            eligible = mask if mask is not None and mask.any() else np.ones(len(statuses), dtype=bool)
+        return self._argmax(scores["score"], eligible)
+
+    def _select_low(self, scores: Dict[str, np.ndarray], levels: np.ndarray, statuses: np.ndarray, experienced: np.ndarray, has_required_skills: bool) -> int:
+        """Low tickets go to the best qualified, available junior or mid-level technician first"""
+        trainees = self._trainees(scores, levels, statuses, has_required_skills)
+        if trainees.any():
+            return self._argmax(scores["score"], trainees)
+        return self._select_standard(scores, statuses, experienced if experienced.any() else None)
+
+    def _argmax(self, values: np.ndarray, mask: np.ndarray) -> int:
+        return int(np.argmax(np.where(mask, values, -np.inf)))
+
+    def _build_justification(self, ticket: Ticket, technician: Technician, required_skills: List[Skill]) -> str:
+        """Build a pointwise, human-readable justification without IDs or numeric scores"""
+        priority = _value(ticket.priority)
+        level = _value(technician.skill_level)
+        status = _value(technician.availability_status)
+
+        technician_skill_ids = {skill.id for skill in technician.skills or []}
+        matched = [skill.name for skill in required_skills if skill.id in technician_skill_ids]
+        missing = [skill.name for skill in required_skills if skill.id not in technician_skill_ids]
+
+        level_text = {
+            "junior": "a junior technician",
+            "mid": "a mid-level technician",
+            "senior": "an experienced senior technician",
+            "expert": "an experienced expert",
+        }.get(level, "a technician")
+
+        if technician.workload < 30:
+            workload_text = "low current workload"
+        elif technician.workload < 70:
+            workload_text = "moderate workload"
+        else:
+            workload_text = "high workload"
+
+        points = [f"• Assigned to handle this {priority} priority ticket: {ticket.subject}"]
+        points.append(f"• {technician.name} is {level_text}" + (f" specializing in {technician.specialization}" if technician.specialization else ""))
+        if matched:
+            points.append(f"• Possesses the required skills {', '.join(matched)}")
+        if missing:
+            points.append(f"• Closest available match for the remaining skills {', '.join(missing)}")
+        points.append(f"• Currently {status.replace('_', ' ')} with {workload_text}")
+
+        if priority == "critical":
+            points.append("• Chosen for specialist experience to ensure the fastest possible resolution")
+        elif priority == "low":
+            points.append("• Gives a developing technician the opportunity to build experience on a suitable ticket" if level in TRAINING_LEVELS
+                          else "• No junior or mid-level technician was available and qualified for this ticket")
+        else:
+            points.append("• Offers the best balance of skill match and available capacity among reachable technicians")
+
+        return "\n".join(points)
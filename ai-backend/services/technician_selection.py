@@ -3,23 +3,34 @@ Technician selection service - Select the best technician for a ticket based on
 """
 import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+import re
+from contextlib import closing
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional, Tuple
+from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from models.ticket import Ticket
 from models.skill import Skill
 from models.technician import Technician
+from services.metrics import track_stage
+from services.technician_scoring import TechnicianScoringService
+from services.stream_parser import IncrementalStringField
+from services.token_usage import record_llm_usage
 from config.settings import Config
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
 logger = logging.getLogger(__name__)
 
+_SELECTED_ID_RE = re.compile(r'"selected_technician_id"\s*:\s*(-?\d+)\s*[,}]')
+
 class TechnicianSelectionService:
     """Service for selecting the best technician for a ticket using LLM"""
     
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: "ChatOpenAI"):
         self.llm = llm
         self.json_parser = JsonOutputParser()
+        self.scoring_service = TechnicianScoringService()
         self._setup_prompts()
     
     def _setup_prompts(self):
@@ -125,6 +136,24 @@ class TechnicianSelectionService:
             input_variables=["ticket_name", "ticket_description", "ticket_priority", "available_technicians", "required_skills"]
         )
     
+    def prune_candidates(self, ticket: Ticket, technicians: List[Technician], required_skills: List[Skill]) -> Tuple[List[Technician], int]:
+        """
+        Pre-rank technicians and keep only the top SELECTION_CANDIDATE_K for the prompt
+        
+        Args:
+            ticket: Ticket object containing the issue information
+            technicians: All candidate technicians
+            required_skills: List of Skill objects required for the ticket
+            
+        Returns:
+            Tuple of the kept technicians and the number of technicians pruned
+        """
+        kept = self.scoring_service.shortlist_technicians(ticket, technicians, required_skills, Config.SELECTION_CANDIDATE_K)
+        pruned = len(technicians) - len(kept)
+        if pruned:
+            logger.info(f"Pruned {pruned} of {len(technicians)} technicians before selection prompt")
+        return kept, pruned
+    
     def select_technician_for_ticket(self, ticket: Ticket, available_technicians: List[Technician], required_skills: List[Skill]) -> Tuple[Technician, str]:
         """
         Select the best technician for a ticket using LLM
@@ -140,59 +169,130 @@ class TechnicianSelectionService:
         try:
             logger.info(f"Selecting technician for ticket: {ticket.subject}")
             
-            # Format required skills for prompt
-            required_skills_text = "\n".join([f"- {skill.name}" for skill in required_skills])
-            
-            # Format available technicians for prompt
-            technicians_text = self._format_technicians_for_prompt(available_technicians)
-            
-            # Create the prompt with ticket data, technicians, and required skills
-            prompt = self.technician_selection_prompt.format(
-                ticket_name=ticket.subject,
-                ticket_description=ticket.description,
-                ticket_priority=ticket.priority,
-                available_technicians=technicians_text,
-                required_skills=required_skills_text
-            )
-            
             # Get LLM response
             logger.info("Sending prompt to LLM for technician selection")
-            response = self.llm.invoke(prompt)
+            prompt = self._build_selection_prompt(ticket, available_technicians, required_skills)
+            with track_stage("assignment", "selection_llm"):
+                response = self.llm.invoke(prompt)
+            record_llm_usage("selection", prompt, response)
             
-            # Parse JSON response using JsonOutputParser
-            try:
-                result_data = self.json_parser.parse(response.content)
-            except Exception as e:
-                logger.error(f"Failed to parse LLM response as JSON: {response.content}")
-                # Fallback to manual JSON parsing
-                try:
-                    result_data = json.loads(response.content)
-                except json.JSONDecodeError as json_error:
-                    raise ValueError(f"Invalid JSON response from LLM: {str(json_error)}")
+            return self._selection_from_response(response.content, available_technicians)
             
-            # Extract technician selection from response
-            if 'selected_technician_id' not in result_data:
-                logger.error(f"Response missing 'selected_technician_id' key: {result_data}")
-                raise ValueError("LLM response missing 'selected_technician_id' key")
-            
-            selected_technician_id = result_data['selected_technician_id']
-            justification = result_data['justification']
-            
-            # Find the selected technician from available technicians
-            selected_technician = self._find_technician_by_id(available_technicians, selected_technician_id)
+        except Exception as e:
+            logger.error(f"Error selecting technician for ticket: {str(e)}")
+            raise
 
+    async def aselect_technician_for_ticket(self, ticket: Ticket, available_technicians: List[Technician], required_skills: List[Skill]) -> Tuple[Technician, str]:
+        """
+        Async version of select_technician_for_ticket using `llm.ainvoke`
+        
+        Args:
+            ticket: Ticket object containing the issue information
+            available_technicians: List of available Technician objects to choose from
+            required_skills: List of Skill objects required for the ticket
             
-            if selected_technician:
-                logger.info(f"Successfully selected technician: {selected_technician.name} (ID: {selected_technician.id}) with justification: {justification}")
-                
-            else:
-                logger.warning(f"LLM selected technician ID '{selected_technician_id}' not found in available technicians")
-            
-            return selected_technician, justification
+        Returns:
+            Selected Technician object or None if no suitable technician found, and the justification
+        """
+        try:
+            logger.info(f"Selecting technician for ticket: {ticket.subject}")
+            prompt = self._build_selection_prompt(ticket, available_technicians, required_skills)
+            with track_stage("assignment", "selection_llm"):
+                response = await self.llm.ainvoke(prompt)
+            record_llm_usage("selection", prompt, response)
+            return self._selection_from_response(response.content, available_technicians)
             
         except Exception as e:
             logger.error(f"Error selecting technician for ticket: {str(e)}")
             raise
+
+    def stream_select_technician(self, ticket: Ticket, available_technicians: List[Technician], required_skills: List[Skill]) -> Iterator[Tuple[str, Any]]:
+        """
+        Select the best technician with a streamed LLM response
+        
+        Yields ("technician", Technician or None) as soon as the selected ID has streamed,
+        then ("justification", text) for each new piece of the justification, and finally
+        ("done", (technician, justification)) parsed from the complete response.
+        
+        Args:
+            ticket: Ticket object containing the issue information
+            available_technicians: List of available Technician objects to choose from
+            required_skills: List of Skill objects required for the ticket
+        """
+        logger.info(f"Streaming technician selection for ticket: {ticket.subject}")
+        justification = IncrementalStringField("justification")
+        announced = False
+        prompt = self._build_selection_prompt(ticket, available_technicians, required_skills)
+        usage_chunk = None
+
+        try:
+            with track_stage("assignment", "selection_llm"), closing(self.llm.stream(prompt)) as chunks:
+                for chunk in chunks:
+                    if getattr(chunk, "usage_metadata", None):
+                        usage_chunk = chunk
+                    delta = justification.feed(chunk.content)
+                    if not announced:
+                        match = _SELECTED_ID_RE.search(justification.text)
+                        if match:
+                            announced = True
+                            yield "technician", self._find_technician_by_id(available_technicians, int(match.group(1)))
+                    if delta:
+                        yield "justification", delta
+        finally:
+            record_llm_usage("selection", prompt, usage_chunk, completion=justification.text)
+
+        selected_technician, full_justification = self._selection_from_response(justification.text, available_technicians)
+        if not announced:
+            yield "technician", selected_technician
+        yield "done", (selected_technician, full_justification)
+
+    def _build_selection_prompt(self, ticket: Ticket, available_technicians: List[Technician], required_skills: List[Skill]) -> str:
+        """Format the technician selection prompt"""
+        # Format required skills for prompt
+        required_skills_text = "\n".join([f"- {skill.name}" for skill in required_skills])
+        
+        # Format available technicians for prompt
+        technicians_text = self._format_technicians_for_prompt(available_technicians)
+        
+        # Create the prompt with ticket data, technicians, and required skills
+        return self.technician_selection_prompt.format(
+            ticket_name=ticket.subject,
+            ticket_description=ticket.description,
+            ticket_priority=ticket.priority,
+            available_technicians=technicians_text,
+            required_skills=required_skills_text
+        )
+
+    def _selection_from_response(self, content: str, available_technicians: List[Technician]) -> Tuple[Optional[Technician], str]:
+        """Parse the LLM selection and look up the selected technician"""
+        # Parse JSON response using JsonOutputParser
+        try:
+            result_data = self.json_parser.parse(content)
+        except Exception as e:
+            logger.error(f"Failed to parse LLM response as JSON: {content}")
+            # Fallback to manual JSON parsing
+            try:
+                result_data = json.loads(content)
+            except json.JSONDecodeError as json_error:
+                raise ValueError(f"Invalid JSON response from LLM: {str(json_error)}")
+        
+        # Extract technician selection from response
+        if 'selected_technician_id' not in result_data:
+            logger.error(f"Response missing 'selected_technician_id' key: {result_data}")
+            raise ValueError("LLM response missing 'selected_technician_id' key")
+        
+        selected_technician_id = result_data['selected_technician_id']
+        justification = result_data['justification']
+        
+        # Find the selected technician from available technicians
+        selected_technician = self._find_technician_by_id(available_technicians, selected_technician_id)
+        
+        if selected_technician:
+            logger.info(f"Successfully selected technician: {selected_technician.name} (ID: {selected_technician.id}) with justification: {justification}")
+        else:
+            logger.warning(f"LLM selected technician ID '{selected_technician_id}' not found in available technicians")
+        
+        return selected_technician, justification
     
     def _format_technicians_for_prompt(self, technicians: List[Technician]) -> str:
         """
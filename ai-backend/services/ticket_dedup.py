@@ -0,0 +1,185 @@
+"""
+Ticket deduplication - SimHash index of recent tickets for reusing skill extractions
+"""
+import copy
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+SIMHASH_BITS = 64
+# The fingerprint is split into bands; two fingerprints within the distance threshold
+# are guaranteed to share at least one identical band as long as threshold < SIMHASH_BANDS.
+SIMHASH_BANDS = 8
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+def _features(text: str) -> List[str]:
+    """Word unigrams and bigrams of the normalized text"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+def simhash(text: str) -> int:
+    """
+    Compute the 64-bit SimHash fingerprint of a text
+
+    Args:
+        text: Text to fingerprint
+
+    Returns:
+        Fingerprint as an integer
+    """
+    weights = [0] * SIMHASH_BITS
+    for feature in _features(text):
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    """A recently processed ticket close enough to reuse its extraction"""
+    ticket_id: Optional[int]
+    distance: int
+    similarity: float
+    extraction: Dict[str, Any]
+
+class NearDuplicateIndex:
+    """
+    Bounded, time-limited SimHash index of recently processed tickets
+
+    Fingerprints are bucketed by band so lookups only compare against tickets
+    that share at least one band, not the whole window.
+    """
+
+    def __init__(self, max_entries: int = None, ttl_seconds: float = None, max_distance: int = None):
+        self.max_entries = Config.DEDUP_MAX_ENTRIES if max_entries is None else max_entries
+        self.ttl_seconds = Config.DEDUP_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_distance = Config.DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+        if self.max_distance >= SIMHASH_BANDS:
+            raise ValueError(f"DEDUP_MAX_DISTANCE must be below {SIMHASH_BANDS}")
+
+        # fingerprint -> (stored_at, ticket_id, catalog_version, extraction)
+        self._entries: "OrderedDict[int, Tuple[float, Optional[int], str, Dict[str, Any]]]" = OrderedDict()
+        self._bands: List[Dict[int, set]] = [{} for _ in range(SIMHASH_BANDS)]
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "reused": 0, "stored": 0, "evicted": 0, "expired": 0}
+
+    @staticmethod
+    def _band_keys(fingerprint: int) -> List[int]:
+        return [(fingerprint >> (band * _BAND_BITS)) & _BAND_MASK for band in range(SIMHASH_BANDS)]
+
+    def find(self, text: str, catalog_version: str) -> Optional[DuplicateMatch]:
+        """
+        Find a recent ticket whose text is within the similarity threshold
+
+        Args:
+            text: Subject and description of the new ticket
+            catalog_version: Only extractions made against this catalog version are reused
+
+        Returns:
+            The closest match, or None
+        """
+        fingerprint = simhash(text)
+        with self._lock:
+            self._stats["lookups"] += 1
+            self._expire()
+
+            candidates = set()
+            for band, key in enumerate(self._band_keys(fingerprint)):
+                candidates |= self._bands[band].get(key, set())
+
+            best = None
+            for candidate in candidates:
+                _, ticket_id, version, extraction = self._entries[candidate]
+                if version != catalog_version:
+                    continue
+                distance = hamming_distance(fingerprint, candidate)
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, ticket_id, extraction)
+
+            if best is None:
+                return None
+
+            self._stats["reused"] += 1
+            distance, ticket_id, extraction = best
+            return DuplicateMatch(
+                ticket_id=ticket_id,
+                distance=distance,
+                similarity=round(1 - distance / SIMHASH_BITS, 4),
+                extraction=copy.deepcopy(extraction),
+            )
+
+    def add(self, text: str, ticket_id: Optional[int], catalog_version: str, extraction: Dict[str, Any]):
+        """
+        Remember a processed ticket and its extraction
+
+        Args:
+            text: Subject and description of the ticket
+            ticket_id: ID of the ticket
+            catalog_version: Catalog version the extraction was made against
+            extraction: Skill extraction result
+        """
+        if self.max_entries <= 0:
+            return
+        fingerprint = simhash(text)
+        with self._lock:
+            if fingerprint in self._entries:
+                self._remove(fingerprint)
+            self._entries[fingerprint] = (time.monotonic(), ticket_id, catalog_version, copy.deepcopy(extraction))
+            for band, key in enumerate(self._band_keys(fingerprint)):
+                self._bands[band].setdefault(key, set()).add(fingerprint)
+            self._stats["stored"] += 1
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evicted"] += 1
+
+    def _remove(self, fingerprint: int):
+        del self._entries[fingerprint]
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            bucket = self._bands[band].get(key)
+            if bucket is not None:
+                bucket.discard(fingerprint)
+                if not bucket:
+                    del self._bands[band][key]
+
+    def _expire(self):
+        """Drop entries older than the TTL; entries are kept in insertion order"""
+        if not self.ttl_seconds:
+            return
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._entries:
+            fingerprint, (stored_at, *_rest) = next(iter(self._entries.items()))
+            if stored_at >= cutoff:
+                break
+            self._remove(fingerprint)
+            self._stats["expired"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "max_distance": self.max_distance,
+                **self._stats,
+            }
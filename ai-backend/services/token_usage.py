@@ -0,0 +1,292 @@
+"""
+Token usage - Prompt and completion token accounting for LLM calls, per stage, endpoint and request
+"""
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from config.settings import Config
+from services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LLM_TOKENS = registry.counter("neurodesk_llm_tokens_total", "LLM tokens consumed", ("endpoint", "stage", "type"))
+LLM_CALLS = registry.counter("neurodesk_llm_calls_total", "LLM calls, by where their token counts came from", ("endpoint", "stage", "source"))
+
+_current_usage: contextvars.ContextVar[Optional["TokenUsage"]] = contextvars.ContextVar("token_usage", default=None)
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+def _empty_counts() -> Dict[str, int]:
+    return {"calls": 0, "estimated_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+def _cost(prompt_tokens: int, completion_tokens: int) -> float:
+    return round(
+        prompt_tokens / 1000 * Config.LLM_PROMPT_COST_PER_1K_TOKENS
+        + completion_tokens / 1000 * Config.LLM_COMPLETION_COST_PER_1K_TOKENS, 6
+    )
+
+def _summarize(stages: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    prompt_tokens = sum(counts["prompt_tokens"] for counts in stages.values())
+    completion_tokens = sum(counts["completion_tokens"] for counts in stages.values())
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "cost_usd": _cost(prompt_tokens, completion_tokens),
+        "stages": stages,
+    }
+
+class TokenUsage:
+    """
+    Token counts of the LLM calls made while handling one request
+
+    Scopes nest: a ticket processed as part of a batch gets its own scope, and
+    everything it records is added to the batch's scope too.
+    """
+
+    def __init__(self, endpoint: str, parent: Optional["TokenUsage"] = None):
+        self.endpoint = endpoint
+        self.parent = parent
+        self._stages: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, prompt_tokens: int, completion_tokens: int, estimated: bool):
+        with self._lock:
+            counts = self._stages.setdefault(stage, _empty_counts())
+            counts["calls"] += 1
+            counts["estimated_calls"] += int(estimated)
+            counts["prompt_tokens"] += prompt_tokens
+            counts["completion_tokens"] += completion_tokens
+        if self.parent is not None:
+            self.parent.add(stage, prompt_tokens, completion_tokens, estimated)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {stage: dict(counts) for stage, counts in self._stages.items()}
+        return _summarize(stages)
+
+class _Ledger:
+    """Running totals since startup, per endpoint and stage"""
+
+    def __init__(self):
+        self._totals: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint: str, stage: str, prompt_tokens: int, completion_tokens: int, estimated: bool, calls: int = 1):
+        with self._lock:
+            counts = self._totals.setdefault((endpoint, stage), _empty_counts())
+            counts["calls"] += calls
+            counts["estimated_calls"] += int(estimated) * calls
+            counts["prompt_tokens"] += prompt_tokens
+            counts["completion_tokens"] += completion_tokens
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = {key: dict(counts) for key, counts in self._totals.items()}
+        endpoints: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for (endpoint, stage), counts in totals.items():
+            endpoints.setdefault(endpoint, {})[stage] = counts
+        overall: Dict[str, Dict[str, int]] = {}
+        for (endpoint, stage), counts in totals.items():
+            stage_counts = overall.setdefault(stage, _empty_counts())
+            for name, value in counts.items():
+                stage_counts[name] += value
+        return {
+            **_summarize(overall),
+            "endpoints": {endpoint: _summarize(stages) for endpoint, stages in endpoints.items()},
+        }
+
+_ledger = _Ledger()
+
+def current_token_usage() -> Optional[TokenUsage]:
+    """Get the token usage scope of the request being handled, if any"""
+    return _current_usage.get()
+
+@contextmanager
+def token_usage_scope(endpoint: str) -> Iterator[TokenUsage]:
+    """
+    Collect the token usage of the LLM calls made in the enclosed block
+
+    Inside an existing scope, the new scope keeps the outer endpoint and adds its
+    counts to the outer scope as well.
+    """
+    parent = _current_usage.get()
+    usage = TokenUsage(parent.endpoint if parent is not None else endpoint, parent)
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+def tracks_token_usage(endpoint: str):
+    """
+    Run the decorated function, coroutine function or generator function in a token usage scope
+
+    Generators run every step in one context of their own, so the scope survives
+    between steps wherever they are resumed from.
+    """
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                context = contextvars.copy_context()
+                scope = token_usage_scope(endpoint)
+                context.run(scope.__enter__)
+                generator = context.run(func, *args, **kwargs)
+                try:
+                    while True:
+                        try:
+                            item = context.run(next, generator)
+                        except StopIteration:
+                            return
+                        yield item
+                finally:
+                    context.run(generator.close)
+                    context.run(scope.__exit__, None, None, None)
+            return generator_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with token_usage_scope(endpoint):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with token_usage_scope(endpoint):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _get_encoder():
+    """Load the tokenizer for the configured model once; False when it cannot be loaded"""
+    global _encoder
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None:
+                try:
+                    import tiktoken
+                    try:
+                        _encoder = tiktoken.encoding_for_model(Config.OPENAI_MODEL or "gpt-3.5-turbo")
+                    except KeyError:
+                        _encoder = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    logger.warning(f"Tokenizer unavailable, estimating tokens from text length: {str(e)}")
+                    _encoder = False
+    return _encoder
+
+def estimate_tokens(text: str) -> int:
+    """Count the tokens of a text with tiktoken, or approximate them when it is unavailable"""
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder:
+        return len(encoder.encode(text, disallowed_special=()))
+    return max(1, len(text) // 4)
+
+def _reported_usage(response: Any) -> Optional[Tuple[int, int]]:
+    """Prompt and completion tokens reported with an LLM response, if any"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+    token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage")
+    if token_usage:
+        return int(token_usage.get("prompt_tokens", 0)), int(token_usage.get("completion_tokens", 0))
+    return None
+
+def record_llm_usage(stage: str, prompt: str, response: Any = None, completion: Optional[str] = None) -> Dict[str, int]:
+    """
+    Record the tokens of one LLM call
+
+    Counts reported with the response are used when present; otherwise the prompt and
+    completion text are counted with tiktoken.
+
+    Args:
+        stage: Pipeline stage that made the call
+        prompt: Prompt sent to the LLM
+        response: LLM response message, or the last streamed chunk
+        completion: Completion text, when it is not the response content
+
+    Returns:
+        Dictionary with the recorded prompt and completion tokens
+    """
+    reported = _reported_usage(response) if response is not None else None
+    if reported is not None:
+        prompt_tokens, completion_tokens = reported
+    else:
+        if completion is None:
+            completion = getattr(response, "content", "") or ""
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(completion)
+    estimated = reported is None
+
+    usage = _current_usage.get()
+    endpoint = usage.endpoint if usage is not None else "unscoped"
+    LLM_TOKENS.inc((endpoint, stage, "prompt"), prompt_tokens)
+    LLM_TOKENS.inc((endpoint, stage, "completion"), completion_tokens)
+    LLM_CALLS.inc((endpoint, stage, "estimate" if estimated else "usage"))
+    _ledger.add(endpoint, stage, prompt_tokens, completion_tokens, estimated)
+    if usage is not None:
+        usage.add(stage, prompt_tokens, completion_tokens, estimated)
+
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+
+def _split(total: int, weights: List[int]) -> List[int]:
+    """Split a token count in proportion to the weights, handing out the remainder in order"""
+    if sum(weights) <= 0:
+        weights = [1] * len(weights)
+    weight_sum = sum(weights)
+    shares = [total * weight // weight_sum for weight in weights]
+    for index in range(total - sum(shares)):
+        shares[index % len(shares)] += 1
+    return shares
+
+def record_batched_llm_usage(stage: str, prompt: str, response: Any, usages: List[Optional[TokenUsage]], completions: List[str]) -> List[Dict[str, int]]:
+    """
+    Record the tokens of one LLM call made for several requests
+
+    Prompt tokens are split evenly between the requests, and completion tokens in
+    proportion to the tokens of each request's part of the completion. Each request's
+    scope records the call with its share; the running totals count it once.
+
+    Args:
+        stage: Pipeline stage that made the call
+        prompt: Prompt sent to the LLM
+        response: LLM response message
+        usages: Token usage scope of each request, None for a request outside a scope
+        completions: Each request's part of the completion text, empty if the response had none
+
+    Returns:
+        The recorded prompt and completion tokens of each request
+    """
+    reported = _reported_usage(response)
+    if reported is not None:
+        prompt_tokens, completion_tokens = reported
+    else:
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(getattr(response, "content", "") or "")
+    estimated = reported is None
+
+    current = _current_usage.get()
+    LLM_CALLS.inc((current.endpoint if current is not None else "unscoped", stage, "estimate" if estimated else "usage"))
+    prompt_shares = _split(prompt_tokens, [1] * len(usages))
+    completion_shares = _split(completion_tokens, [estimate_tokens(completion) for completion in completions])
+
+    shares = []
+    for index, (usage, prompt_share, completion_share) in enumerate(zip(usages, prompt_shares, completion_shares)):
+        endpoint = usage.endpoint if usage is not None else "unscoped"
+        LLM_TOKENS.inc((endpoint, stage, "prompt"), prompt_share)
+        LLM_TOKENS.inc((endpoint, stage, "completion"), completion_share)
+        _ledger.add(endpoint, stage, prompt_share, completion_share, estimated, calls=int(index == 0))
+        if usage is not None:
+            usage.add(stage, prompt_share, completion_share, estimated)
+        shares.append({"prompt_tokens": prompt_share, "completion_tokens": completion_share})
+    return shares
+
+def get_token_totals() -> Dict[str, Any]:
+    """Get the running token totals since startup, overall and per endpoint and stage"""
+    return _ledger.as_dict()
@@ -0,0 +1,97 @@
+"""
+Shared stubs of the skill catalog and the backend for the assignment service tests
+"""
+import threading
+import time
+import pytest
+from models.skill import Skill
+from services.assignment_service import AssignmentService
+from services.skill_catalog import CatalogSnapshot
+from services.skill_index import SkillIndex
+from config.settings import Config
+
+SKILLS = [Skill(id=1, name="VPN Setup", description="Remote access VPN clients"), Skill(id=2, name="Printers", description="Printer drivers and queues")]
+TECHNICIANS = [
+    {"id": 7, "name": "Alice Smith", "user_id": 107, "skills": [{"id": 1, "percentage": 90}], "workload": 20},
+    {"id": 8, "name": "Bob Jones", "user_id": 108, "skills": [{"id": 2, "percentage": 80}], "workload": 10},
+]
+
+class StubCatalog:
+    """Skill catalog serving one fixed snapshot and its search index"""
+    skills_url = "http://backend/api/v1/skills/all"
+
+    def __init__(self, skills=SKILLS):
+        self.snapshot = CatalogSnapshot(version="v1", skills=skills, fetched_at=0.0, by_name={skill.name.lower(): skill for skill in skills})
+        self.index = SkillIndex.from_skills(skills)
+        self.reads = 0
+        self.indexed = []
+
+    def get_snapshot(self):
+        self.reads += 1
+        return self.snapshot
+
+    def get_index(self, snapshot=None):
+        self.indexed.append((snapshot or self.snapshot).version)
+        return self.index
+
+    def conditional_headers(self):
+        return {"If-None-Match": 'W/"v1"'}
+
+class StubResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+    def close(self):
+        pass
+
+class StubBackend:
+    """Serves the same technicians for every request after an optional simulated round trip"""
+    pool_size = 20
+
+    def __init__(self, technicians=None, delay=0.0):
+        self.technicians = TECHNICIANS if technicians is None else technicians
+        self.delay = delay
+        self.requests = []
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def get(self, endpoint, url, params=None, **kwargs):
+        with self.lock:
+            self.requests.append((endpoint, sorted((params or {}).get("skills", []))))
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return StubResponse({"success": True, "data": {"technicians": self.technicians}})
+
+@pytest.fixture
+def stub_catalog():
+    return StubCatalog()
+
+@pytest.fixture
+def stub_backend():
+    return StubBackend()
+
+@pytest.fixture
+def make_assignment_service(monkeypatch):
+    """
+    Factory of AssignmentService instances wired to the stub catalog and backend
+
+    The roster, outbox and dedup are disabled; keyword arguments other than `llm`,
+    `skills`, `technicians` and `delay` are Config settings to override for the test.
+    """
+    def make(llm=None, skills=SKILLS, technicians=None, delay=0.0, **config):
+        for flag in ("ROSTER_CACHE_ENABLED", "OUTBOX_ENABLED", "DEDUP_ENABLED"):
+            monkeypatch.setattr(Config, flag, False)
+        for name, value in config.items():
+            monkeypatch.setattr(Config, name, value)
+        service = AssignmentService(llm=llm)
+        service.skill_catalog = StubCatalog(skills)
+        service.backend = StubBackend(technicians, delay)
+        return service
+
+    return make
@@ -0,0 +1,57 @@
+"""
+Tests for the per-request context that keeps concurrent assignments apart
+"""
+import dataclasses
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+def _service(make_assignment_service):
+    service = make_assignment_service(LLM_STREAMING=False)
+    service.notified = []
+    lock = threading.Lock()
+
+    def extract(ticket, available_skills, catalog_version=None, use_cache=True, stream=False, catalog_skills=None):
+        # Long enough for every request to be inside the pipeline at the same time
+        time.sleep(0.05)
+        return {"existing_skills": ["Printers" if "printer" in ticket.subject.lower() else "VPN Setup"], "new_skills": []}
+
+    def notify(context, extracted_skill_names, existing_extracted_skills):
+        with lock:
+            service.notified.append((context.ticket.id, extracted_skill_names["existing_skills"][0]))
+
+    service.skill_extraction_service.extract_skills_from_ticket = extract
+    service._notify_extracted_skills = notify
+    return service
+
+def test_concurrent_assignments_keep_their_own_state(make_assignment_service):
+    """Tickets assigned at the same time by one service never see each other's ticket or diagnostics"""
+    service = _service(make_assignment_service)
+    requests = [{
+        "id": ticket_id,
+        "subject": "Printer is offline" if ticket_id % 2 else "VPN connection down",
+        "description": "Details of the issue",
+        "requester_id": 5,
+        "selection_engine": "scoring",
+    } for ticket_id in range(1, 17)]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        responses = list(pool.map(service.process_ticket_assignment, requests))
+
+    assert all(response.success for response in responses)
+    assert [response.selected_technician_id for response in responses] == [8 if ticket_id % 2 else 7 for ticket_id in range(1, 17)]
+    assert sorted(service.notified) == [(ticket_id, "Printers" if ticket_id % 2 else "VPN Setup") for ticket_id in range(1, 17)]
+    for response in responses:
+        assert response.diagnostics["candidate_technicians"] == 2
+        assert list(response.diagnostics["timings"]["stages"]) == ["catalog", "extraction", "notify", "technicians", "selection"]
+
+def test_context_cannot_be_reassigned(make_assignment_service):
+    """Stages read the context but cannot swap out the ticket or snapshot it holds"""
+    service = _service(make_assignment_service)
+    context = service._create_context({"id": 7, "subject": "VPN connection down", "description": "Details of the issue", "requester_id": 5})
+
+    assert context.ticket.id == 7 and context.available_skills == service.skill_catalog.snapshot.skills
+    assert list(context.timer.as_dict()["stages"]) == ["catalog"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        context.ticket = None
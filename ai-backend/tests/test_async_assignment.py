@@ -0,0 +1,112 @@
+"""
+Tests for the asyncio assignment pipeline and its ASGI entry point
+"""
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+import httpx
+from asgi import create_app
+from services.async_assignment_service import AsyncAssignmentService
+from services.async_backend_client import AsyncBackendClient
+from services.skill_catalog import SkillCatalog
+from config.settings import Config
+
+SKILLS = {"success": True, "data": {"skills": [{"id": 1, "name": "VPN Setup"}, {"id": 2, "name": "Printers"}]}}
+TECHNICIANS = {"success": True, "data": {"technicians": [
+    {"id": 7, "name": "Alice Smith", "user_id": 107, "skills": [{"id": 1, "percentage": 90}], "workload": 20},
+]}}
+
+class _LLM:
+    """Answers extraction and selection prompts after a simulated round trip"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, prompt):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        if "Technicians:" in prompt:
+            return SimpleNamespace(content=json.dumps({"selected_technician_id": 7, "justification": "• Best fit"}))
+        return SimpleNamespace(content=json.dumps({"skills": [{"name": "VPN Setup", "description": "", "is_new": False}]}))
+
+def _backend(request):
+    if request.url.path.endswith("/skills/all"):
+        return httpx.Response(200, json=SKILLS)
+    if request.url.path.endswith("/technicians/by-skills"):
+        return httpx.Response(200, json=TECHNICIANS)
+    return httpx.Response(404)
+
+def _service(monkeypatch, llm):
+    for flag in ("ROSTER_CACHE_ENABLED", "OUTBOX_ENABLED", "DEDUP_ENABLED", "EXTRACTION_CACHE_ENABLED"):
+        monkeypatch.setattr(Config, flag, False)
+    service = AsyncAssignmentService(llm, backend=AsyncBackendClient(transport=httpx.MockTransport(_backend)))
+    service.skill_catalog = SkillCatalog(skills_url="http://backend/api/v1/skills/all")
+    service._anotify_extracted_skills = _no_notify
+    return service
+
+async def _no_notify(*args):
+    return None
+
+def _ticket(ticket_id):
+    return {"id": ticket_id, "subject": "VPN connection down", "description": "Remote users cannot connect", "requester_id": 5}
+
+def test_assignments_overlap_on_one_event_loop(monkeypatch):
+    """Many assignments wait on the LLM at the same time instead of one after another"""
+    llm = _LLM(delay=0.1)
+    service = _service(monkeypatch, llm)
+
+    async def run():
+        return await asyncio.gather(*(service.aprocess_ticket_assignment(_ticket(i)) for i in range(100)))
+
+    started = time.monotonic()
+    results = asyncio.run(run())
+    elapsed = time.monotonic() - started
+
+    assert all(result.success and result.selected_technician_id == 7 for result in results)
+    assert llm.max_in_flight == 100
+    # Two sequential LLM round trips per ticket; run serially this would take 20s
+    assert elapsed < 5
+
+def test_shortlisting_and_scoring_run_off_the_event_loop(monkeypatch):
+    """CPU-bound shortlisting and scoring run in worker threads, not on the event loop"""
+    service = _service(monkeypatch, _LLM(delay=0))
+    threads = {}
+    shortlist, select = service._shortlist_skills, service.technician_scoring_service.select_technician_for_ticket
+
+    def record(name, func):
+        def wrapper(*args):
+            threads[name] = threading.current_thread()
+            return func(*args)
+        return wrapper
+
+    service._shortlist_skills = record("shortlist", shortlist)
+    service.technician_scoring_service.select_technician_for_ticket = record("scoring", select)
+
+    result = asyncio.run(service.aprocess_ticket_assignment({**_ticket(1), "selection_engine": "scoring"}))
+
+    assert result.success and result.selected_technician_id == 7
+    assert set(threads) == {"shortlist", "scoring"}
+    assert threading.main_thread() not in threads.values()
+
+def test_asgi_app_serves_ticket_assignment(monkeypatch):
+    """The ASGI app routes assignment requests to the async service"""
+    app = create_app(_service(monkeypatch, _LLM(delay=0)))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            assigned = await client.post("/api/ticket-assignment", json=_ticket(1))
+            invalid = await client.post("/api/ticket-assignment", content=b"not json")
+            missing = await client.get("/api/unknown")
+            return assigned, invalid, missing
+
+    assigned, invalid, missing = asyncio.run(run())
+
+    assert assigned.status_code == 200 and assigned.json()["selected_technician_id"] == 7
+    assert invalid.status_code == 400
+    assert missing.status_code == 404
@@ -0,0 +1,57 @@
+"""
+Tests for the backend client's per-endpoint retry policy
+"""
+import pytest
+import requests
+from http.client import RemoteDisconnected
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+from services.backend_client import BackendClient
+from config.settings import Config
+
+def _client(monkeypatch, error):
+    client = BackendClient()
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(kwargs["timeout"])
+        raise error
+
+    monkeypatch.setattr(client.session, "request", request)
+    return client, calls
+
+def test_read_timeout_of_process_skills_is_not_retried(monkeypatch):
+    """A POST that timed out while reading may have been applied, so it is not sent again"""
+    client, calls = _client(monkeypatch, requests.exceptions.ReadTimeout("read timed out"))
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.post("process_skills", "http://backend/api/v1/tickets/process-skills", json={})
+    assert len(calls) == 1
+
+def test_reads_retry_and_use_configured_timeout(monkeypatch):
+    """Idempotent reads are retried on timeouts, with the read timeout from the configuration"""
+    client, calls = _client(monkeypatch, requests.exceptions.ReadTimeout("read timed out"))
+    monkeypatch.setattr("services.backend_client.time.sleep", lambda seconds: None)
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get("skills_all", "http://backend/api/v1/skills/all")
+    assert len(calls) == Config.BACKEND_MAX_RETRIES + 1
+    assert calls[0] == (Config.BACKEND_CONNECT_TIMEOUT, Config.BACKEND_READ_TIMEOUT)
+
+def test_process_skills_is_not_replayed_after_an_aborted_connection(monkeypatch):
+    """A stale keep-alive socket dropped after the POST was sent must not send it again"""
+    aborted = requests.exceptions.ConnectionError(ProtocolError("Connection aborted.", RemoteDisconnected("Remote end closed connection without response")))
+    client, calls = _client(monkeypatch, aborted)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post("process_skills", "http://backend/api/v1/tickets/process-skills", json={})
+    assert len(calls) == 1
+
+def test_process_skills_is_retried_when_the_connection_was_refused(monkeypatch):
+    """A POST that never reached the backend is safe to send again"""
+    refused = requests.exceptions.ConnectionError(MaxRetryError(None, "/api/v1/tickets/process-skills", NewConnectionError(None, "Connection refused")))
+    client, calls = _client(monkeypatch, refused)
+    monkeypatch.setattr("services.backend_client.time.sleep", lambda seconds: None)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post("process_skills", "http://backend/api/v1/tickets/process-skills", json={})
+    assert len(calls) == 2
@@ -0,0 +1,57 @@
+"""
+Tests for the offline benchmark harness: fake LLM, stub backend and load generator
+"""
+import json
+import requests
+from services.fake_llm import FakeChatModel
+from bench.load_generator import run_load
+from bench.stub_backend import StubBackend
+from models.technician import Technician
+from models.ticket import Ticket
+from services.skill_extraction import SkillExtractionService
+from services.technician_selection import TechnicianSelectionService
+
+def test_fake_llm_answers_services_deterministically():
+    """Extraction and selection parse the fake answers, which depend only on the prompt"""
+    llm = FakeChatModel()
+    ticket = Ticket(subject="VPN drops for remote users", description="The VPN disconnects every few minutes", requester_id=1)
+    available_skills = ["VPN Troubleshooting", "Printer Configuration", "Email Migration"]
+
+    first = SkillExtractionService(llm).extract_skills_from_ticket(ticket, available_skills, use_cache=False)
+    second = SkillExtractionService(llm).extract_skills_from_ticket(ticket, available_skills, use_cache=False, stream=True)
+
+    assert first["existing_skills"] == second["existing_skills"] == ["VPN Troubleshooting"]
+    technicians = [Technician(id=5, name="Alice Smith", user_id=105), Technician(id=3, name="Bob Jones", user_id=103)]
+    selected, justification = TechnicianSelectionService(llm).select_technician_for_ticket(ticket, technicians, [])
+    assert selected.id == 5 and justification
+
+def test_stub_backend_serves_catalog_and_roster():
+    """The stub pages technicians by skill like the backend and revalidates the catalog by ETag"""
+    stub = StubBackend(skills=30, technicians=50).start()
+    try:
+        catalog = requests.get(f"{stub.url}/api/v1/skills/all", timeout=5)
+        assert len(catalog.json()["data"]["skills"]) == 30
+        revalidated = requests.get(f"{stub.url}/api/v1/skills/all", headers={"If-None-Match": catalog.headers["ETag"]}, timeout=5)
+        assert revalidated.status_code == 304
+
+        page = requests.get(f"{stub.url}/api/v1/technicians/by-skills", params={"skills": [1, 2]}, timeout=5).json()["data"]["technicians"]
+        assert 0 < len(page) <= 10
+        assert [tech["workload"] for tech in page] == sorted(tech["workload"] for tech in page)
+        assert all(Technician(**tech) for tech in page)
+        assert requests.get(f"{stub.url}/api/v1/technicians/999", timeout=5).status_code == 404
+    finally:
+        stub.stop()
+
+def test_load_generator_reports_percentiles():
+    """Every request is counted, and the report carries throughput and latency percentiles"""
+    stub = StubBackend(skills=5, technicians=5).start()
+    try:
+        url = f"{stub.url}/api/v1/tickets/process-skills"
+        report = run_load(url, lambda index: {"ticket_id": index, "skills": []}, 40, concurrency=4)
+    finally:
+        stub.stop()
+
+    assert report["succeeded"] == 40 and report["status_codes"] == {"200": 40}
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+    assert report["throughput_rps"] > 0
+    json.dumps(report)
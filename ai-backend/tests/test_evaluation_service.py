@@ -0,0 +1,204 @@
+"""
+Tests for the concurrent and combined LLM analyses of skill evaluation
+"""
+import json
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from services.evaluation_service import EvaluationService
+from config.settings import Config
+
+TICKET = {
+    "subject": "VPN down", "description": "Remote users cannot connect", "priority": "high",
+    "required_skills": [1], "assigned_technician_id": 7, "feedback": "Fixed quickly, thanks!",
+}
+SKILL_ANALYSIS = "SKILL: 1\nSCORE: 80\nREASON: Restored the VPN gateway"
+SENTIMENT_ANALYSIS = "SCORE: 70\nREASON: Grateful and satisfied"
+COMBINED_ANALYSIS = json.dumps({
+    "skills": [{"skill_id": 1, "score": 80, "reasoning": "Restored the VPN gateway"}],
+    "sentiment": {"score": 70, "reasoning": "Grateful and satisfied"},
+})
+
+class _LLM:
+    """Answers evaluation prompts after a simulated round trip"""
+
+    def __init__(self, delay=0.2, sentiment_delay=None, combined=COMBINED_ANALYSIS):
+        self.delay = delay
+        self.sentiment_delay = delay if sentiment_delay is None else sentiment_delay
+        self.combined = combined
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        if "Respond with JSON" in prompt:
+            time.sleep(self.delay)
+            return SimpleNamespace(content=self.combined)
+        if "sentiment of this user feedback" in prompt:
+            time.sleep(self.sentiment_delay)
+            return SimpleNamespace(content=SENTIMENT_ANALYSIS, usage_metadata={"input_tokens": 120, "output_tokens": 30})
+        time.sleep(self.delay)
+        return SimpleNamespace(content=SKILL_ANALYSIS, usage_metadata={"input_tokens": 200, "output_tokens": 40})
+
+class _Response:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self.payload
+
+class _Backend:
+    """Serves single technicians by ID and records the requested URLs"""
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, endpoint, url, **kwargs):
+        self.urls.append((endpoint, url))
+        if url.endswith("/technicians/7"):
+            return _Response(200, {"success": True, "data": {"id": 7, "name": "Alice Smith", "skills": [{"id": 1, "percentage": 60}]}})
+        return _Response(404, {"success": False, "message": "Technician not found"})
+
+def _service(monkeypatch, llm):
+    monkeypatch.setattr(Config, "ROSTER_CACHE_ENABLED", False)
+    return EvaluationService(llm)
+
+def test_analyses_run_concurrently(monkeypatch):
+    """The skill and sentiment calls overlap, so the evaluation takes about one round trip"""
+    monkeypatch.setattr(Config, "EVALUATION_COMBINED_CALL", False)
+    service = _service(monkeypatch, _LLM(delay=0.3))
+
+    started = time.monotonic()
+    metrics = service.calculate_metrics(TICKET)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.5
+    assert metrics.skill_metrics["1"].score == 80
+    assert metrics.feedback_sentiment.score == 70
+    # Both calls ran on pool threads and were still accounted to this ticket
+    assert metrics.token_usage["prompt_tokens"] == 320 and metrics.token_usage["completion_tokens"] == 70
+
+def test_combined_call_returns_both_analyses(monkeypatch):
+    """One structured call fills in the skill metrics and the sentiment"""
+    monkeypatch.setattr(Config, "EVALUATION_COMBINED_CALL", True)
+    llm = _LLM(delay=0)
+    service = _service(monkeypatch, llm)
+
+    metrics = service.calculate_metrics(TICKET)
+
+    assert len(llm.prompts) == 1
+    assert metrics.skill_metrics["1"].reasoning == "Restored the VPN gateway"
+    assert metrics.feedback_sentiment.score == 70
+
+def test_unparseable_combined_call_falls_back_to_separate_calls(monkeypatch):
+    """A combined response that is not JSON is retried as the two separate analyses"""
+    monkeypatch.setattr(Config, "EVALUATION_COMBINED_CALL", True)
+    llm = _LLM(delay=0, combined="Sorry, I cannot help with that")
+    service = _service(monkeypatch, llm)
+
+    metrics = service.calculate_metrics(TICKET)
+
+    assert len(llm.prompts) == 3
+    assert metrics.skill_metrics["1"].score == 80 and metrics.feedback_sentiment.score == 70
+
+def test_slow_sentiment_is_neutral_after_deadline(monkeypatch):
+    """Sentiment that misses the shared deadline does not hold up the evaluation"""
+    monkeypatch.setattr(Config, "EVALUATION_COMBINED_CALL", False)
+    monkeypatch.setattr(Config, "EVALUATION_TIMEOUT_SECONDS", 0.3)
+    service = _service(monkeypatch, _LLM(delay=0, sentiment_delay=1.0))
+
+    started = time.monotonic()
+    metrics = service.calculate_metrics(TICKET)
+
+    assert time.monotonic() - started < 0.6
+    assert metrics.skill_metrics["1"].score == 80
+    assert metrics.feedback_sentiment.score == 0.0
+
+def test_slow_skill_analysis_fails_after_deadline(monkeypatch):
+    """Without skill metrics there is nothing to evaluate, so the deadline is an error"""
+    monkeypatch.setattr(Config, "EVALUATION_COMBINED_CALL", False)
+    monkeypatch.setattr(Config, "EVALUATION_TIMEOUT_SECONDS", 0.2)
+    service = _service(monkeypatch, _LLM(delay=1.0, sentiment_delay=0))
+
+    with pytest.raises(TimeoutError):
+        service.calculate_metrics(TICKET)
+
+def test_technician_fetched_by_id(monkeypatch):
+    """Only the evaluated technician is requested, from the configured backend"""
+    service = _service(monkeypatch, _LLM())
+    service.backend = _Backend()
+
+    technician = service.get_technician(7)
+
+    assert technician["skills"] == [{"id": 1, "percentage": 60}]
+    assert service.get_technician(8) is None
+    assert service.backend.urls[0] == ("technician_by_id", f"{Config.BACKEND_SERVER_URL}/api/v1/technicians/7")
+
+def test_batch_folds_updates_per_technician_in_resolution_order(monkeypatch):
+    """Each technician gets one update, built from their tickets applied oldest first"""
+    service = _service(monkeypatch, _LLM(delay=0.2))
+    service.backend = _Backend()
+    tickets = [
+        dict(TICKET, id=2, resolved_at="2024-01-01T12:00:00Z"),
+        dict(TICKET, id=1, resolved_at="2024-01-01T09:00:00Z"),
+        dict(TICKET, id=3, assigned_technician_id=8),
+        {"id": 4, "subject": "Missing fields"},
+    ]
+
+    started = time.monotonic()
+    result = service.evaluate_tickets(tickets)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.6
+    assert (result["total"], result["succeeded"], result["failed"]) == (4, 2, 2)
+    assert "Technician 8 not found" in result["results"][2]["error_message"]
+    assert "Missing required fields" in result["results"][3]["error_message"]
+    [update] = result["technicians"]
+    assert update["technician_id"] == 7 and update["ticket_ids"] == [1, 2]
+    # 60 -> 60 * 0.7 + 80 * 0.3 = 66 -> 66 * 0.7 + 80 * 0.3 = 70.2
+    assert update["skills"] == [{"id": 1, "percentage": pytest.approx(70.2)}]
+
+def test_batch_rejects_oversized_requests(monkeypatch):
+    """Batches above the configured size are rejected before any analysis"""
+    monkeypatch.setattr(Config, "EVALUATION_BATCH_MAX_TICKETS", 2)
+    service = _service(monkeypatch, _LLM())
+
+    with pytest.raises(ValueError):
+        service.evaluate_tickets([TICKET] * 3)
+    with pytest.raises(ValueError):
+        service.evaluate_tickets([])
+
+def test_batch_analyses_queued_for_the_pool_are_not_timed_out(monkeypatch):
+    """A batch runs no more tickets at once than the LLM pool can serve, so none time out queued"""
+    monkeypatch.setattr(Config, "EVALUATION_COMBINED_CALL", False)
+    monkeypatch.setattr(Config, "EVALUATION_LLM_WORKERS", 1)
+    monkeypatch.setattr(Config, "EVALUATION_TIMEOUT_SECONDS", 0.15)
+    service = _service(monkeypatch, _LLM(delay=0.05))
+    service.backend = _Backend()
+
+    # Eight calls on one worker would queue the last one for 0.35s if the tickets ran together
+    result = service.evaluate_tickets([dict(TICKET, id=ticket_id) for ticket_id in range(4)])
+
+    assert result["succeeded"] == 4
+    assert all(item["metrics"]["feedback_sentiment"]["score"] == 70 for item in result["results"])
+
+def test_saturated_pool_counts_against_the_deadline(monkeypatch):
+    """An analysis that cannot get an LLM worker before the deadline times out instead of waiting"""
+    monkeypatch.setattr(Config, "EVALUATION_COMBINED_CALL", False)
+    monkeypatch.setattr(Config, "EVALUATION_LLM_WORKERS", 1)
+    monkeypatch.setattr(Config, "EVALUATION_TIMEOUT_SECONDS", 0.2)
+    service = _service(monkeypatch, _LLM(delay=0))
+    release = threading.Event()
+    service._llm_executor.submit(release.wait, 2)
+
+    started = time.monotonic()
+    try:
+        with pytest.raises(TimeoutError):
+            service.calculate_metrics(TICKET)
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
@@ -0,0 +1,35 @@
+"""
+Tests for the content-addressed skill-extraction cache
+"""
+import time
+from services.extraction_cache import ExtractionCache, extraction_cache_key
+
+def test_key_ignores_case_whitespace_and_tag_order():
+    """Re-submitted tickets with cosmetic differences share a key"""
+    first = extraction_cache_key("VPN down", "Cannot  connect\nto VPN", ["vpn", "Network"], "v1")
+    second = extraction_cache_key(" vpn DOWN ", "cannot connect to vpn", ["network", "VPN"], "v1")
+
+    assert first == second
+    assert first != extraction_cache_key("VPN down", "Cannot connect to VPN", ["vpn", "network"], "v2")
+
+def test_lru_eviction_and_counters():
+    """The least recently used entry is evicted and hits and misses are counted"""
+    cache = ExtractionCache(max_entries=2, ttl_seconds=0)
+    cache.put("a", {"skills": ["A"]})
+    cache.put("b", {"skills": ["B"]})
+    assert cache.get("a") == {"skills": ["A"]}
+
+    cache.put("c", {"skills": ["C"]})
+
+    assert cache.get("b") is None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+
+def test_entries_expire_after_ttl():
+    """Entries older than the TTL are treated as misses"""
+    cache = ExtractionCache(max_entries=10, ttl_seconds=0.01)
+    cache.put("a", {"skills": []})
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.get_stats()["expired"] == 1
@@ -0,0 +1,43 @@
+"""
+Tests for the orjson JSON provider and model responses
+"""
+import json
+from datetime import datetime
+from decimal import Decimal
+import numpy as np
+from flask import Flask, jsonify, request
+from models.ticket import TicketAssignmentResponse
+from services.json_provider import OrjsonProvider, model_response
+
+def _app():
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return jsonify({"received": request.get_json()})
+
+    @app.route("/values")
+    def values():
+        return jsonify({"at": datetime(2025, 1, 2, 3, 4, 5), "price": Decimal("1.50"), "score": np.float64(0.75), "ids": np.array([1, 2]), 7: "seven"})
+
+    @app.route("/model")
+    def model():
+        return model_response(TicketAssignmentResponse(success=True, selected_technician_id=3, justification="• Best fit", diagnostics={"timings": {"total_ms": 1.5}}))
+
+    return app
+
+def test_jsonify_and_get_json_use_orjson():
+    """Request bodies decode and responses encode types the stdlib encoder rejects"""
+    client = _app().test_client()
+
+    assert client.post("/echo", json={"subject": "Café VPN"}).get_json() == {"received": {"subject": "Café VPN"}}
+    assert client.post("/echo", data=b"not json", content_type="application/json").status_code == 400
+    assert client.get("/values").get_json() == {"at": "2025-01-02T03:04:05", "price": 1.5, "score": 0.75, "ids": [1, 2], "7": "seven"}
+
+def test_model_response_matches_model_dump():
+    """model_dump_json output decodes to the same data jsonify(model_dump()) used to send"""
+    response = _app().test_client().get("/model")
+
+    assert response.mimetype == "application/json"
+    assert json.loads(response.data) == TicketAssignmentResponse(success=True, selected_technician_id=3, justification="• Best fit", diagnostics={"timings": {"total_ms": 1.5}}).model_dump()
@@ -0,0 +1,63 @@
+"""
+Tests for recording LLM responses to a cassette and replaying them offline
+"""
+import time
+from contextlib import closing
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from services.fake_llm import FakeChatModel
+from models.ticket import Ticket
+from services.llm_cassette import CassetteChatModel
+from services.skill_extraction import SkillExtractionService
+
+def test_replay_returns_recorded_responses_in_order(tmp_path):
+    """A prompt recorded several times replays its responses in recording order, then cycles"""
+    path = str(tmp_path / "llm.jsonl")
+    recorder = CassetteChatModel(mode="record", path=path, inner=FakeListChatModel(responses=["first answer", "second answer"]))
+    assert [recorder.invoke("Same prompt").content for _ in range(2)] == ["first answer", "second answer"]
+
+    replayer = CassetteChatModel(mode="replay", path=path)
+
+    assert [replayer.invoke("Same prompt").content for _ in range(3)] == ["first answer", "second answer", "first answer"]
+    assert replayer.get_stats()["responses"] == 2
+    with pytest.raises(LookupError):
+        replayer.invoke("Unrecorded prompt")
+
+def test_stream_replays_chunks_with_recorded_latency(tmp_path):
+    """Streamed responses replay the same chunks, spaced like the recording when asked to"""
+    path = str(tmp_path / "llm.jsonl")
+    recorder = CassetteChatModel(mode="record", path=path, inner=FakeListChatModel(responses=["abcd"], sleep=0.05))
+    recorded = [chunk.content for chunk in recorder.stream("Prompt")]
+
+    replayer = CassetteChatModel(mode="replay", path=path, replay_latency=True)
+    started = time.monotonic()
+    replayed = [chunk.content for chunk in replayer.stream("Prompt")]
+
+    assert replayed == recorded == ["a", "b", "c", "d"]
+    assert time.monotonic() - started >= 0.18
+    assert CassetteChatModel(mode="replay", path=path).invoke("Prompt").content == "abcd"
+
+def test_stream_closed_early_is_recorded_in_full(tmp_path):
+    """A consumer that stops reading early still leaves the whole response in the cassette"""
+    path = str(tmp_path / "llm.jsonl")
+    recorder = CassetteChatModel(mode="record", path=path, inner=FakeListChatModel(responses=["abcd"]))
+    with closing(recorder.stream("Prompt")) as chunks:
+        assert next(chunks).content == "a"
+
+    assert recorder.get_stats()["recorded"] == 1
+    replayer = CassetteChatModel(mode="replay", path=path)
+    assert [chunk.content for chunk in replayer.stream("Prompt")] == ["a", "b", "c", "d"]
+
+def test_replayed_extraction_matches_recording(tmp_path):
+    """Services get the same results and token usage from a replayed cassette"""
+    path = str(tmp_path / "llm.jsonl")
+    ticket = Ticket(subject="Printer jams on every job", description="The office printer jams", requester_id=1)
+    available_skills = ["Printer Troubleshooting", "VPN Configuration"]
+    recorder = CassetteChatModel(mode="record", path=path, inner=FakeChatModel())
+    recorded = SkillExtractionService(recorder).extract_skills_from_ticket(ticket, available_skills, use_cache=False)
+
+    replayer = CassetteChatModel(mode="replay", path=path)
+    replayed = SkillExtractionService(replayer).extract_skills_from_ticket(ticket, available_skills, use_cache=False)
+
+    assert replayed == recorded
+    assert replayer.get_stats()["hits"] == 1
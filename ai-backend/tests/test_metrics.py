@@ -0,0 +1,45 @@
+"""
+Tests for the stage metrics and their Prometheus rendering
+"""
+import pytest
+from services.metrics import Histogram, MetricsRegistry, STAGE_DURATION, STAGE_ERRORS, get_stage_summary, track_stage
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative and end with +Inf, followed by the sum and count"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_duration_seconds", "Test durations", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(("llm",), value)
+
+    text = registry.render()
+
+    assert "# TYPE test_duration_seconds histogram" in text
+    assert 'test_duration_seconds_bucket{stage="llm",le="0.1"} 1' in text
+    assert 'test_duration_seconds_bucket{stage="llm",le="1.0"} 3' in text
+    assert 'test_duration_seconds_bucket{stage="llm",le="+Inf"} 4' in text
+    assert 'test_duration_seconds_sum{stage="llm"} 6.05' in text
+    assert 'test_duration_seconds_count{stage="llm"} 4' in text
+
+def test_percentiles_use_recent_window():
+    """Percentiles are read from the most recent observations only"""
+    histogram = Histogram("test_window_seconds", "Test window", ("stage",), window=100)
+    for value in range(1, 201):
+        histogram.observe(("llm",), value / 1000)
+
+    percentiles = histogram.percentiles(("llm",))
+
+    assert percentiles[0.5] == pytest.approx(0.150)
+    assert percentiles[0.99] == pytest.approx(0.199)
+
+def test_track_stage_counts_errors():
+    """A failing stage is timed and counted as an error"""
+    labels = ("test", "failing")
+
+    with pytest.raises(RuntimeError):
+        with track_stage(*labels):
+            raise RuntimeError("backend down")
+
+    assert STAGE_DURATION.count(labels) == 1
+    assert STAGE_ERRORS.get(labels) == 1
+    summary = get_stage_summary()["test"]["failing"]
+    assert summary["errors"] == 1 and summary["in_flight"] == 0 and summary["p95_ms"] is not None
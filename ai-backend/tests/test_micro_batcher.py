@@ -0,0 +1,127 @@
+"""
+Tests for micro-batching of concurrent skill extractions
+"""
+import json
+import threading
+from types import SimpleNamespace
+import pytest
+from models.ticket import Ticket
+from services.micro_batcher import MicroBatcher
+from services.skill_extraction import SkillExtractionService
+from services.token_usage import estimate_tokens, token_usage_scope
+from config.settings import Config
+
+def _run_concurrently(function, items):
+    results = [None] * len(items)
+    def run(index):
+        results[index] = function(items[index])
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(len(items))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def _call(batcher, item):
+    try:
+        return batcher.call(item)
+    except ValueError as e:
+        return e
+
+def test_concurrent_calls_share_a_batch():
+    """Calls within the wait window are handed to the handler together"""
+    batches = []
+    def handler(items):
+        batches.append(list(items))
+        return [item * 10 if item != 3 else ValueError("bad item") for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=4, max_wait_seconds=1)
+    results = _run_concurrently(lambda item: _call(batcher, item), [1, 2, 3, 4])
+
+    assert [len(batch) for batch in batches] == [4]
+    assert results[:2] == [10, 20] and results[3] == 40
+    assert isinstance(results[2], ValueError)
+    assert batcher.get_stats()["average_batch_size"] == 4
+
+class _LLM:
+    def __init__(self, batch_content):
+        self.batch_content = batch_content
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self.lock:
+            self.prompts.append(prompt)
+        if "**Tickets**" in prompt:
+            return SimpleNamespace(content=self.batch_content)
+        return SimpleNamespace(content=json.dumps({"skills": [{"name": "Networking", "description": "", "is_new": False}]}))
+
+def _ticket(ticket_id, subject):
+    return Ticket(id=ticket_id, subject=subject, description="Details of the issue", requester_id=5)
+
+def _service(monkeypatch, batch_content):
+    monkeypatch.setattr(Config, "EXTRACTION_BATCH_ENABLED", True)
+    monkeypatch.setattr(Config, "EXTRACTION_BATCH_MAX_SIZE", 2)
+    monkeypatch.setattr(Config, "EXTRACTION_BATCH_WAIT_MS", 1000)
+    monkeypatch.setattr(Config, "EXTRACTION_CACHE_ENABLED", False)
+    return SkillExtractionService(_LLM(batch_content))
+
+def test_batched_extraction_fans_out_per_ticket_results(monkeypatch):
+    """One multi-ticket prompt is sent and each caller gets its own ticket's skills"""
+    service = _service(monkeypatch, json.dumps({"tickets": [
+        {"key": "T2", "skills": [{"name": "Printers", "description": "", "is_new": False}]},
+        {"key": "T1", "skills": [{"name": "VPN Setup", "description": "", "is_new": False}]},
+    ]}))
+    requests = [(_ticket(1, "VPN connection down"), ["VPN Setup"]), (_ticket(2, "Printer is offline"), ["Printers"])]
+
+    results = _run_concurrently(lambda request: service.extract_skills_from_ticket(*request), requests)
+
+    assert len(service.llm.prompts) == 1
+    assert "- VPN Setup" in service.llm.prompts[0] and "- Printers" in service.llm.prompts[0]
+    assert [result["existing_skills"] for result in results] == [["VPN Setup"], ["Printers"]]
+
+def test_unparseable_batch_falls_back_to_single_prompts(monkeypatch):
+    """Every ticket is retried on its own when the batched response is not JSON"""
+    service = _service(monkeypatch, "not json")
+    requests = [(_ticket(1, "VPN connection down"), ["Networking"]), (_ticket(2, "Printer is offline"), ["Networking"])]
+
+    results = _run_concurrently(lambda request: service.extract_skills_from_ticket(*request), requests)
+
+    assert len(service.llm.prompts) == 3
+    assert [result["existing_skills"] for result in results] == [["Networking"], ["Networking"]]
+    assert service.get_batch_stats()["fallbacks"] == 2
+
+def test_unparseable_batch_fails_without_fallback(monkeypatch):
+    """With fallback disabled the callers see the parse error"""
+    service = _service(monkeypatch, "not json")
+    monkeypatch.setattr(Config, "EXTRACTION_BATCH_FALLBACK", False)
+    requests = [(_ticket(1, "VPN connection down"), ["Networking"]), (_ticket(2, "Printer is offline"), ["Networking"])]
+
+    def extract(request):
+        with pytest.raises(ValueError):
+            service.extract_skills_from_ticket(*request)
+        return True
+
+    assert _run_concurrently(extract, requests) == [True, True]
+
+def test_batched_call_tokens_are_split_between_tickets(monkeypatch):
+    """Prompt tokens are shared evenly and completion tokens follow each ticket's part of the answer"""
+    batch_content = json.dumps({"tickets": [
+        {"key": "T1", "skills": [{"name": "VPN Setup", "description": "", "is_new": False}]},
+        {"key": "T2", "skills": [{"name": "Printers", "description": "Printer drivers, queues and network printing", "is_new": False}]},
+    ]})
+    service = _service(monkeypatch, batch_content)
+    requests = [(_ticket(1, "VPN connection down"), ["VPN Setup"]), (_ticket(2, "Printer is offline"), ["Printers"])]
+
+    def extract(request):
+        with token_usage_scope("test_micro_batch") as usage:
+            service.extract_skills_from_ticket(*request)
+        return usage.as_dict()["stages"]["extraction_batch"]
+
+    first, second = _run_concurrently(extract, requests)
+
+    assert len(service.llm.prompts) == 1 and first["calls"] == second["calls"] == 1
+    assert abs(first["prompt_tokens"] - second["prompt_tokens"]) <= 1
+    assert first["prompt_tokens"] + second["prompt_tokens"] == estimate_tokens(service.llm.prompts[0])
+    assert 0 < first["completion_tokens"] < second["completion_tokens"]
+    assert first["completion_tokens"] + second["completion_tokens"] == estimate_tokens(batch_content)
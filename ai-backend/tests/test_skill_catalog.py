@@ -0,0 +1,78 @@
+"""
+Tests for the versioned skill catalog cache
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from services.skill_catalog import SkillCatalog
+
+def _catalog_body(names):
+    skills = [{"id": i + 1, "name": name, "description": f"{name} work"} for i, name in enumerate(names)]
+    return json.dumps({"success": True, "data": {"skills": skills}}).encode()
+
+def test_unchanged_content_keeps_snapshot():
+    """A 200 with identical content should not rebuild the Skill models"""
+    catalog = SkillCatalog(skills_url="http://backend/skills/all", ttl_seconds=60)
+    first = catalog.apply_response(200, {"ETag": 'W/"a"'}, _catalog_body(["Networking", "VPN Setup"]))
+    second = catalog.apply_response(200, {"ETag": 'W/"a"'}, _catalog_body(["Networking", "VPN Setup"]))
+
+    assert second is first
+    assert catalog.get_stats()["reloaded"] == 1
+    assert catalog.get_stats()["revalidated"] == 1
+
+def test_not_modified_and_invalidation():
+    """A 304 keeps the snapshot, and invalidation forces a revalidation"""
+    catalog = SkillCatalog(skills_url="http://backend/skills/all", ttl_seconds=60)
+    snapshot = catalog.apply_response(200, {"ETag": 'W/"a"'}, _catalog_body(["Networking"]))
+
+    assert catalog.conditional_headers() == {"If-None-Match": 'W/"a"'}
+    assert not catalog.is_stale()
+
+    catalog.invalidate()
+    assert catalog.is_stale()
+
+    assert catalog.apply_response(304, {}, b"") is snapshot
+    assert not catalog.is_stale()
+
+def test_changed_content_creates_new_version():
+    """New skills produce a new catalog version"""
+    catalog = SkillCatalog(skills_url="http://backend/skills/all", ttl_seconds=60)
+    first = catalog.apply_response(200, {}, _catalog_body(["Networking"]))
+    second = catalog.apply_response(200, {}, _catalog_body(["Networking", "Active Directory"]))
+
+    assert second.version != first.version
+    assert [skill.name for skill in second.skills] == ["Networking", "Active Directory"]
+    assert "active directory" in second.by_name
+
+def test_index_is_rebuilt_when_a_description_changes():
+    """A skill whose description changed is searched by its new description"""
+    catalog = SkillCatalog(skills_url="http://backend/skills/all", ttl_seconds=60)
+    body = {"success": True, "data": {"skills": [
+        {"id": 1, "name": "Networking", "description": "Switches and routing"},
+        {"id": 2, "name": "VPN Setup", "description": "Remote access clients"},
+    ]}}
+    catalog.get_index(catalog.apply_response(200, {}, json.dumps(body).encode()))
+
+    body["data"]["skills"][0]["description"] = "Firewall rules and wifi access points"
+    index = catalog.get_index(catalog.apply_response(200, {}, json.dumps(body).encode()))
+
+    assert [name for name, _ in index.search("wifi access point is down", top_k=1)] == ["Networking"]
+    assert index.search("routing loop between switches", top_k=1) == []
+
+def test_async_revalidation_works_on_every_event_loop():
+    """Async revalidations are serialized with a lock of the running event loop, so any loop can use the catalog"""
+    catalog = SkillCatalog(skills_url="http://backend/skills/all", ttl_seconds=0)
+    requests = []
+
+    class _Client:
+        async def get(self, endpoint, url, headers=None):
+            requests.append(endpoint)
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(status_code=200, headers={"ETag": 'W/"a"'}, content=_catalog_body(["Networking"]))
+
+    async def read_concurrently():
+        return await asyncio.gather(*(catalog.aget_snapshot(_Client()) for _ in range(3)))
+
+    for _ in range(2):
+        assert [len(snapshot.skills) for snapshot in asyncio.run(read_concurrently())] == [1, 1, 1]
+    assert len(requests) == 6
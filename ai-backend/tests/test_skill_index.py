@@ -0,0 +1,70 @@
+"""
+Tests for the BM25 skill index used to shortlist catalog skills
+"""
+import json
+from langchain_core.messages import AIMessage
+from models.skill import Skill
+from models.ticket import Ticket
+from services.skill_index import SkillIndex
+
+SKILLS = [
+    Skill(id=1, name="VPN Configuration", description="Remote access and VPN client setup"),
+    Skill(id=2, name="Active Directory", description="User accounts, password reset and group policy"),
+    Skill(id=3, name="Printer Support", description="Network printers and print queues"),
+    Skill(id=4, name="Network Troubleshooting", description="Connectivity, DNS and routing problems"),
+]
+
+def _index():
+    return SkillIndex.from_skills(SKILLS)
+
+def test_search_ranks_relevant_skills_first():
+    """Skills sharing terms with the ticket are returned, best first"""
+    results = _index().search("VPN connection failing for remote staff", top_k=2)
+
+    assert results[0][0] == "VPN Configuration"
+    assert len(results) <= 2
+
+def test_search_skips_unrelated_skills():
+    """Skills with no matching terms are never returned"""
+    names = [name for name, _ in _index().search("password reset for HR portal", top_k=10)]
+
+    assert names == ["Active Directory"]
+
+def test_added_skills_are_searchable():
+    """Skills added incrementally are retrievable without a rebuild"""
+    index = _index()
+    index.add("Kubernetes Operations", "Cluster upgrades and pod scheduling")
+
+    assert len(index) == 5
+    assert index.search("pod stuck in kubernetes cluster", top_k=1)[0][0] == "Kubernetes Operations"
+
+def test_shortlist_is_padded_to_k_with_the_catalog(make_assignment_service):
+    """Retrieved skills come first and the rest of the K offered skills follow in catalog order"""
+    service = make_assignment_service(skills=SKILLS, SKILL_SHORTLIST_K=3)
+    context = service._create_context({"id": 1, "subject": "Password reset", "description": "Locked out after a password reset", "requester_id": 5})
+
+    assert service._shortlist_skills(context) == ["Active Directory", "VPN Configuration", "Printer Support"]
+
+class _StubLLM:
+    def __init__(self, skills):
+        self.content = json.dumps({"skills": skills})
+
+    def invoke(self, prompt):
+        return AIMessage(content=self.content)
+
+def test_catalog_skills_outside_the_shortlist_stay_existing(make_assignment_service):
+    """A catalog skill the LLM names without having been offered it is not treated as new"""
+    llm = _StubLLM([
+        {"name": "Active Directory", "is_new": False},
+        {"name": "printer support", "is_new": True, "description": "Print queues"},
+        {"name": "Badge Readers", "is_new": True, "description": "Door access badges"},
+    ])
+    service = make_assignment_service(llm=llm, skills=SKILLS, SKILL_SHORTLIST_K=1, EXTRACTION_BATCH_ENABLED=False)
+    ticket = Ticket(id=1, subject="VPN drops", description="VPN disconnects every hour", requester_id=5)
+
+    result = service.skill_extraction_service.extract_skills_from_ticket(
+        ticket, ["VPN Configuration"], use_cache=False, catalog_skills=[skill.name for skill in SKILLS]
+    )
+
+    assert result["existing_skills"] == ["Active Directory", "Printer Support"]
+    assert [skill["name"] for skill in result["new_skills"]] == ["Badge Readers"]
@@ -0,0 +1,91 @@
+"""
+Tests for the skill notification outbox
+"""
+import time
+import requests
+from services.skill_outbox import SkillNotificationOutbox
+
+class _Response:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def json(self):
+        return {"success": True}
+
+class _Backend:
+    def __init__(self, status_code=200, failing_tickets=()):
+        self.status_code = status_code
+        self.failing_tickets = failing_tickets
+        self.posts = []
+
+    def post(self, endpoint, url, json=None):
+        self.posts.append(json)
+        return _Response(503 if json["ticket_id"] in self.failing_tickets else self.status_code)
+
+def _outbox(tmp_path, backend, backoff_seconds=0):
+    outbox = SkillNotificationOutbox(journal_path=str(tmp_path / "outbox.jsonl"), batch_window=0, backoff_seconds=backoff_seconds)
+    outbox.backend = backend
+    return outbox
+
+def test_notifications_for_one_ticket_are_coalesced(tmp_path):
+    """Notifications for the same ticket are sent as one request"""
+    backend = _Backend()
+    outbox = _outbox(tmp_path, backend)
+    outbox.enqueue(7, [{"id": 1, "name": "Networking", "description": None}])
+    outbox.enqueue(7, [{"id": 2, "name": "VPN Setup", "description": None}])
+    outbox.enqueue(8, [{"id": 1, "name": "Networking", "description": None}])
+
+    outbox._deliver(outbox._next_batch())
+
+    assert sorted(post["ticket_id"] for post in backend.posts) == [7, 8]
+    assert len(next(post for post in backend.posts if post["ticket_id"] == 7)["skills"]) == 2
+    assert outbox.get_stats()["delivered"] == 3
+    assert outbox._read_pending() == []
+
+def test_undelivered_notifications_survive_restart(tmp_path):
+    """Failed notifications stay in the journal and are recovered by a new outbox"""
+    outbox = _outbox(tmp_path, _Backend(status_code=503))
+    outbox.enqueue(7, [{"id": 1, "name": "Networking", "description": None}])
+    outbox._deliver(outbox._next_batch())
+    assert outbox.get_stats()["retries"] == 1
+
+    backend = _Backend()
+    restarted = _outbox(tmp_path, backend)
+    restarted._recover()
+    restarted._deliver(restarted._next_batch())
+
+    assert [post["ticket_id"] for post in backend.posts] == [7]
+    assert restarted._read_pending() == []
+
+def test_rejected_notifications_are_not_retried(tmp_path):
+    """A 4xx response drops the notification instead of retrying it"""
+    backend = _Backend(status_code=400)
+    outbox = _outbox(tmp_path, backend)
+    outbox.enqueue(7, [{"id": 1, "name": "Networking", "description": None}])
+
+    outbox._deliver(outbox._next_batch())
+
+    assert len(backend.posts) == 1
+    assert outbox.get_stats()["failed"] == 1 and outbox.get_stats()["retries"] == 0
+    assert outbox.get_stats()["pending"] == 0 and outbox._read_pending() == []
+
+def test_backing_off_notification_does_not_hold_up_new_ones(tmp_path):
+    """A failing ticket waits out its backoff while later notifications are delivered"""
+    backend = _Backend(failing_tickets={7})
+    outbox = _outbox(tmp_path, backend, backoff_seconds=60)
+    outbox.enqueue(7, [{"id": 1, "name": "Networking", "description": None}])
+    assert not (tmp_path / "outbox.jsonl").exists()
+    outbox._deliver(outbox._next_batch())
+
+    outbox.enqueue(8, [{"id": 1, "name": "Networking", "description": None}])
+    started = time.monotonic()
+    outbox._deliver(outbox._next_batch())
+
+    assert time.monotonic() - started < 1
+    assert [post["ticket_id"] for post in backend.posts] == [7, 8]
+    assert outbox.get_stats()["pending"] == 1
+    assert [item["ticket_id"] for item in outbox._read_pending()] == [7]
@@ -0,0 +1,63 @@
+"""
+Tests for the speculative technician prefetch and per-stage timings
+"""
+import time
+
+def _service(make_assignment_service, extracted_skill, delay=0.05, technicians=None):
+    service = make_assignment_service(technicians=technicians, delay=delay)
+
+    def extract(ticket, available_skills, catalog_version=None, use_cache=True, stream=False, catalog_skills=None):
+        time.sleep(delay)
+        return {"existing_skills": [extracted_skill], "new_skills": []}
+
+    service.skill_extraction_service.extract_skills_from_ticket = extract
+    return service
+
+def _request(pipeline_mode):
+    return {
+        "id": 1, "subject": "VPN client cannot connect", "description": "Remote access VPN fails for the sales team",
+        "requester_id": 5, "selection_engine": "scoring", "pipeline_mode": pipeline_mode,
+    }
+
+def test_speculative_fetch_overlaps_extraction(make_assignment_service):
+    """The technician fetch for the predicted skills runs while the extraction is in flight"""
+    service = _service(make_assignment_service, "VPN Setup")
+
+    result = service.process_ticket_assignment(_request("speculative"))
+
+    assert result.success and result.selected_technician_id == 7
+    speculation = result.diagnostics["speculation"]
+    assert speculation["result"] == "hit" and speculation["predicted_skill_ids"] == [1]
+    assert "overlap_ms" in speculation
+    stages = result.diagnostics["timings"]["stages"]
+    assert stages["prefetch"]["start_ms"] < stages["extraction"]["end_ms"]
+    assert service.backend.requests == [("technicians_by_skills", [1])]
+
+def test_speculation_miss_fetches_extracted_skills(make_assignment_service):
+    """A prediction that does not cover the extracted skills falls back to a regular fetch"""
+    service = _service(make_assignment_service, "Printers", delay=0)
+
+    result = service.process_ticket_assignment(_request("speculative"))
+
+    assert result.success and result.selected_technician_id == 8
+    assert result.diagnostics["speculation"]["result"] == "miss"
+    assert service.backend.requests == [("technicians_by_skills", [1]), ("technicians_by_skills", [2])]
+
+def test_full_prefetch_page_is_refetched(make_assignment_service):
+    """A prefetch that filled a by-skills page may be cut off, so the extracted skills are fetched again"""
+    technicians = [{"id": 10 + index, "name": f"Tech {index:02d}", "user_id": 110 + index, "skills": [{"id": 1, "percentage": 90}], "workload": index} for index in range(10)]
+    service = _service(make_assignment_service, "VPN Setup", delay=0, technicians=technicians)
+
+    result = service.process_ticket_assignment(_request("speculative"))
+
+    assert result.success and result.diagnostics["speculation"]["result"] == "miss"
+    assert service.backend.requests == [("technicians_by_skills", [1]), ("technicians_by_skills", [1])]
+
+def test_sequential_mode_reports_stage_timings(make_assignment_service):
+    """Sequential runs record the same stages without a prefetch"""
+    service = _service(make_assignment_service, "VPN Setup", delay=0)
+
+    result = service.process_ticket_assignment(_request("sequential"))
+
+    assert set(result.diagnostics["timings"]["stages"]) == {"catalog", "extraction", "notify", "technicians", "selection"}
+    assert "speculation" not in result.diagnostics
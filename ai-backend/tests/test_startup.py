@@ -0,0 +1,49 @@
+"""
+Tests for the startup report and the startup warm-up
+"""
+import time
+from types import SimpleNamespace
+from langchain_core.prompts import PromptTemplate
+from services.startup import StartupReport, warm_up
+
+class _Roster:
+    def refresh(self):
+        raise ConnectionError("backend down")
+
+def _service(catalog, backend, roster=None):
+    # Held long enough that every request needs its own connection
+    backend.delay = 0.02
+    return SimpleNamespace(
+        skill_catalog=catalog,
+        backend=backend,
+        technician_roster=roster,
+        skill_extraction_service=SimpleNamespace(prompt=PromptTemplate(input_variables=["ticket"], template="Ticket: {ticket}")),
+        technician_selection_service=SimpleNamespace(),
+    )
+
+def test_warm_up_fills_catalog_and_connection_pool(stub_catalog, stub_backend):
+    """Every step runs as a startup phase, and the pool is filled with concurrent requests"""
+    report = StartupReport(time.perf_counter())
+    service = _service(stub_catalog, stub_backend)
+
+    assert warm_up(report, service)
+    report.mark_ready()
+
+    assert service.skill_catalog.indexed == ["v1"]
+    assert len(service.backend.threads) == 4
+    summary = report.as_dict()
+    assert summary["ready"] and summary["warm_up"] == {"completed": True, "errors": {}}
+    assert list(summary["phases"]) == ["warmup_catalog", "warmup_connections", "warmup_prompts"]
+
+def test_failing_step_is_skipped(stub_catalog, stub_backend):
+    """A failing step is reported and the remaining steps still run"""
+    started = time.perf_counter()
+    report = StartupReport(started)
+    report.record("imports", started)
+
+    assert not warm_up(report, _service(stub_catalog, stub_backend, roster=_Roster()))
+
+    summary = report.as_dict()
+    assert summary["warm_up"]["errors"] == {"roster": "backend down"}
+    assert list(summary["phases"]) == ["imports", "warmup_catalog", "warmup_roster", "warmup_connections", "warmup_prompts"]
+    assert not summary["ready"]
@@ -0,0 +1,85 @@
+"""
+Tests for streamed LLM output and the streamed assignment events
+"""
+import json
+from types import SimpleNamespace
+from models.ticket import Ticket
+from services.skill_extraction import SkillExtractionService
+from services.stream_parser import IncrementalArrayParser, IncrementalStringField
+from config.settings import Config
+
+EXTRACTION = json.dumps({"skills": [{"name": "VPN Setup", "description": "Uses [brackets] and \"quotes\"", "is_new": False}], "notes": "x" * 40})
+SELECTION = json.dumps({"selected_technician_id": 7, "justification": "• Expert in VPN\n• Low workload"})
+
+def _chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+class _StreamingLLM:
+    """Streams canned responses in small chunks and records how much of each was read"""
+
+    def __init__(self):
+        self.chunks_read = []
+        self.closed = []
+
+    def stream(self, prompt):
+        text = SELECTION if "Technicians:" in prompt else EXTRACTION
+        read = 0
+        try:
+            for chunk in _chunks(text):
+                read += 1
+                yield SimpleNamespace(content=chunk)
+        finally:
+            self.chunks_read.append(read)
+            self.closed.append(read < len(_chunks(text)))
+
+def test_array_parser_completes_across_chunks():
+    """The array is returned once its closing bracket arrives, ignoring brackets inside strings"""
+    parser = IncrementalArrayParser("skills")
+
+    results = [parser.feed(chunk) for chunk in _chunks(EXTRACTION, size=3)]
+
+    completed_at = next(i for i, result in enumerate(results) if result is not None)
+    assert completed_at < len(results) - 5
+    assert results[completed_at] == json.loads(EXTRACTION)["skills"]
+
+def test_string_field_decodes_escapes_split_across_chunks():
+    """Escape sequences cut between chunks are decoded once complete"""
+    field = IncrementalStringField("justification")
+
+    deltas = [field.feed(chunk) for chunk in ['{"justification": "a\\', 'n\\u00', 'e9b", "x": 1}']]
+
+    assert deltas == ["a", "\n", "éb"]
+    assert field.done and field.value == "a\néb"
+
+def test_streamed_extraction_stops_when_skills_close(monkeypatch):
+    """The extraction returns without reading the rest of the response"""
+    monkeypatch.setattr(Config, "EXTRACTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "EXTRACTION_BATCH_ENABLED", False)
+    llm = _StreamingLLM()
+    service = SkillExtractionService(llm)
+    ticket = Ticket(id=1, subject="VPN down", description="Remote users cannot connect", requester_id=5)
+
+    result = service.extract_skills_from_ticket(ticket, ["VPN Setup", "Printers"], stream=True)
+
+    assert result["existing_skills"] == ["VPN Setup"]
+    assert llm.closed == [True]
+
+def test_stream_ticket_assignment_event_order(make_assignment_service):
+    """Skills, the technician and justification deltas are sent before the final response"""
+    service = make_assignment_service(llm=_StreamingLLM(), EXTRACTION_CACHE_ENABLED=False, EXTRACTION_BATCH_ENABLED=False)
+    service._notify_extracted_skills = lambda *args: None
+
+    events = list(service.stream_ticket_assignment({
+        "id": 1, "subject": "VPN client cannot connect", "description": "Remote access VPN fails", "requester_id": 5, "selection_engine": "llm",
+    }))
+
+    names = [event["event"] for event in events]
+    assert names[:2] == ["skills", "technician"] and names[-1] == "done"
+    assert set(names[2:-1]) == {"justification"} and len(names) > 4
+    assert events[0]["data"]["existing_skills"] == [{"id": 1, "name": "VPN Setup"}]
+    assert events[1]["data"]["selected_technician_id"] == 7
+    justification = "".join(event["data"]["delta"] for event in events if event["event"] == "justification")
+    assert justification == events[-1]["data"]["justification"] == "• Expert in VPN\n• Low workload"
+    assert events[-1]["data"]["diagnostics"]["streamed"] is True
+    stages = events[-1]["data"]["diagnostics"]["token_usage"]["stages"]
+    assert stages["extraction"]["estimated_calls"] == 1 and stages["selection"]["completion_tokens"] > 0
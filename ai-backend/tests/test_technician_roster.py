@@ -0,0 +1,115 @@
+"""
+Tests for the local technician roster and its skill inverted index
+"""
+import orjson
+import pytest
+from services.technician_roster import CompactTechnician, TechnicianRoster, parse_technicians_payload
+
+def _technician(tech_id, name, skills, workload=0, updated_at="2025-01-01T00:00:00.000Z", is_active=True):
+    return {
+        "id": tech_id,
+        "name": name,
+        "user_id": tech_id + 100,
+        "skills": [{"id": skill_id, "percentage": 80} for skill_id in skills],
+        "workload": workload,
+        "is_active": is_active,
+        "updated_at": updated_at,
+    }
+
+def _roster():
+    roster = TechnicianRoster(base_url="http://backend/api/v1", refresh_interval=60, max_staleness=60)
+    roster._apply([
+        _technician(1, "Alice Smith", [10, 11], workload=40),
+        _technician(2, "Bob Jones", [11], workload=10),
+        _technician(3, "Carol White", [12]),
+    ], replace=True)
+    return roster
+
+def test_candidates_are_union_of_skill_postings():
+    """Candidates are the union of the inverted index postings, ordered by workload"""
+    roster = _roster()
+
+    assert [tech.id for tech in roster.get_candidates([10, 11])] == [2, 1]
+    assert [tech.id for tech in roster.get_candidates([12])] == [3]
+    assert roster.get_candidates([99]) == []
+
+def test_delta_updates_and_removes_technicians():
+    """Deltas replace changed records, drop deactivated ones and advance the watermark"""
+    roster = _roster()
+    roster._apply([
+        _technician(1, "Alice Smith", [12], workload=5, updated_at="2025-01-02T00:00:00.000Z"),
+        _technician(2, "Bob Jones", [11], is_active=False, updated_at="2025-01-03T00:00:00.000Z"),
+    ], replace=False)
+
+    assert roster.get_candidates([10, 11]) == []
+    assert [tech.id for tech in roster.get_candidates([12])] == [3, 1]
+    assert roster.get_stats()["watermark"] == "2025-01-03T00:00:00.000Z"
+
+def test_technician_lookup_by_id():
+    """Single technicians are read from the ID index without scanning the roster"""
+    roster = _roster()
+
+    assert roster.get_technician(2).name == "Bob Jones"
+    assert roster.get_technician(99) is None
+
+def test_records_are_compact_and_materialize_on_lookup():
+    """Records keep skills as parallel arrays and interned enums, and invalid ones are skipped"""
+    roster = TechnicianRoster(base_url="http://backend/api/v1", refresh_interval=60, max_staleness=60)
+    roster._apply([
+        {**_technician(1, "Alice Smith", [10, 11]), "availability_status": "busy", "skill_level": "senior"},
+        {**_technician(2, "Bob Jones", [11]), "availability_status": "busy"},
+        {**_technician(3, "Carol White", [12]), "availability_status": "asleep"},
+        _technician(4, " ", [12]),
+    ], replace=True)
+
+    alice, bob = roster.get_candidates([11])
+    assert list(alice.skill_ids) == [10, 11] and alice.skills == [(10, 80), (11, 80)]
+    assert alice.availability_status is bob.availability_status == "busy"
+    assert roster.get_stats()["technicians"] == 2
+
+    technician = roster.get_technician(1)
+    assert technician.skill_level == "senior" and [skill.id for skill in technician.skills] == [10, 11]
+    assert technician.updated_at.year == 2025
+
+def test_payload_is_decoded_with_orjson():
+    """A backend body decodes to its technician records, and a backend error raises"""
+    body = orjson.dumps({"success": True, "data": {"technicians": [_technician(1, "Alice Smith", [10])]}})
+
+    assert [CompactTechnician(record).name for record in parse_technicians_payload(body)] == ["Alice Smith"]
+    with pytest.raises(Exception, match="Backend returned error"):
+        parse_technicians_payload(b'{"success": false, "message": "down"}')
+
+def test_failed_refresh_serves_stale_snapshot():
+    """A stale snapshot is served when the refresh fails, and the refresh is not retried on every read"""
+    roster = _roster()
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        raise ConnectionError("backend down")
+
+    roster.refresh = refresh
+    roster._refreshed_at -= 120
+
+    assert [tech.id for tech in roster.get_candidates([11])] == [2, 1]
+    assert roster.get_technician(3).name == "Carol White"
+    assert len(calls) == 1 and roster.get_stats()["errors"] == 1
+
+    empty = TechnicianRoster(base_url="http://backend/api/v1", refresh_interval=60, max_staleness=60)
+    empty.refresh = refresh
+    with pytest.raises(ConnectionError):
+        empty.get_all()
+
+def test_string_and_float_numbers_are_coerced():
+    """IDs and percentages sent as strings or floats are coerced to int, like the Technician model does"""
+    roster = TechnicianRoster(base_url="http://backend/api/v1", refresh_interval=60, max_staleness=60)
+    roster._apply([
+        {**_technician(1, "Alice Smith", []), "id": "1", "workload": "20", "skills": [{"id": "5", "percentage": "80"}, {"id": 6, "percentage": 70.0}]},
+        {**_technician(2, "Bob Jones", []), "skills": [{"id": 5.0, "percentage": 90}], "assigned_tickets": ["7"]},
+    ], replace=True)
+
+    bob, alice = roster.get_candidates([5])
+    assert alice.id == 1 and alice.workload == 20 and alice.skills == [(5, 80), (6, 70)]
+    assert bob.skills == [(5, 90)] and list(bob.assigned_tickets) == [7]
+    assert [tech.id for tech in roster.get_candidates([6])] == [1]
+    assert roster.get_technician(1).skills[0].percentage == 80
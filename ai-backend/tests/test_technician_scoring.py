@@ -0,0 +1,99 @@
+"""
+Tests for the deterministic technician scoring engine
+"""
+from models.skill import Skill
+from models.ticket import Ticket
+from models.technician import SkillObject, Technician
+from services.technician_scoring import TechnicianScoringService
+
+NETWORKING = Skill(id=1, name="Networking")
+VPN = Skill(id=2, name="VPN Setup")
+
+def _technician(tech_id, skills, workload=0, level="mid", status="available", specialization=None):
+    return Technician(
+        id=tech_id,
+        name=f"Technician {tech_id}",
+        user_id=tech_id,
+        skills=[SkillObject(id=skill_id, percentage=pct) for skill_id, pct in skills.items()],
+        workload=workload,
+        skill_level=level,
+        availability_status=status,
+        specialization=specialization,
+    )
+
+def _ticket(priority):
+    return Ticket(id=1, subject="VPN connection failing", description="Remote users cannot reach the network", requester_id=1, priority=priority)
+
+def test_suitability_score_formula():
+    """Score = 0.6 * skill match + 0.4 * (1 - workload)"""
+    technicians = [_technician(1, {1: 80, 2: 60}, workload=50), _technician(2, {1: 100}, workload=0)]
+    scores = TechnicianScoringService().score_technicians(technicians, [NETWORKING, VPN])
+
+    # Technician 1: 2/2 skills at 70% average; technician 2: 1/2 skills at 100%
+    assert abs(scores["score"][0] - (0.6 * 0.7 + 0.4 * 0.5)) < 1e-9
+    assert abs(scores["score"][1] - (0.6 * 0.5 + 0.4 * 1.0)) < 1e-9
+
+def test_high_priority_skips_unavailable_technicians():
+    """High priority picks the best score among reachable technicians"""
+    technicians = [
+        _technician(1, {1: 100, 2: 100}, status="end_of_shift"),
+        _technician(2, {1: 90, 2: 80}, workload=20),
+        _technician(3, {1: 40}, workload=0),
+    ]
+    selected, justification = TechnicianScoringService().select_technician_for_ticket(_ticket("high"), technicians, [NETWORKING, VPN])
+
+    assert selected.id == 2
+    assert "Networking" in justification and "VPN Setup" in justification
+
+def test_critical_priority_prefers_experienced_specialist():
+    """Critical tickets ignore availability and pick the least loaded experienced specialist"""
+    technicians = [
+        _technician(1, {1: 100}, workload=10, level="mid", specialization="Network"),
+        _technician(2, {1: 80}, workload=70, level="expert", specialization="VPN and remote access", status="busy"),
+        _technician(3, {1: 90}, workload=30, level="senior", specialization="Network infrastructure", status="on_break"),
+        _technician(4, {1: 95}, workload=0, level="expert", specialization="Databases"),
+    ]
+    selected, _ = TechnicianScoringService().select_technician_for_ticket(_ticket("critical"), technicians, [NETWORKING])
+
+    assert selected.id == 3
+
+def test_low_priority_prefers_trainees_then_falls_back():
+    """Low priority goes to a qualified, available junior or mid-level technician first"""
+    scoring = TechnicianScoringService()
+    technicians = [
+        _technician(1, {1: 100}, level="expert"),
+        _technician(2, {1: 50}, workload=60, level="junior"),
+    ]
+    selected, _ = scoring.select_technician_for_ticket(_ticket("low"), technicians, [NETWORKING])
+    assert selected.id == 2
+
+    technicians[1] = _technician(2, {1: 50}, level="junior", status="busy")
+    selected, _ = scoring.select_technician_for_ticket(_ticket("low"), technicians, [NETWORKING])
+    assert selected.id == 1
+
+def test_shortlist_keeps_top_k_reachable_candidates():
+    """Pruning keeps the best reachable technicians and puts unavailable ones last"""
+    technicians = [
+        _technician(1, {1: 100, 2: 100}, status="end_of_shift"),
+        _technician(2, {1: 90}, workload=50),
+        _technician(3, {1: 90, 2: 90}, workload=10),
+        _technician(4, {}, workload=0),
+    ]
+    shortlist = TechnicianScoringService().shortlist_technicians(_ticket("high"), technicians, [NETWORKING, VPN], top_k=2)
+
+    assert [tech.id for tech in shortlist] == [3, 2]
+
+def test_shortlist_keeps_the_technician_the_rules_select():
+    """The shortlist ranks candidates in the tiers the low and critical rules select from"""
+    scoring = TechnicianScoringService()
+    technicians = [
+        _technician(1, {1: 100, 2: 100}, level="expert"),
+        _technician(2, {1: 95, 2: 95}, level="senior"),
+        _technician(3, {1: 30}, workload=60, level="junior"),
+        _technician(4, {1: 90, 2: 90}, workload=80, level="senior", specialization="VPN gateways"),
+    ]
+
+    for priority in ("low", "critical"):
+        selected, _ = scoring.select_technician_for_ticket(_ticket(priority), technicians, [NETWORKING, VPN])
+        shortlist = scoring.shortlist_technicians(_ticket(priority), technicians, [NETWORKING, VPN], top_k=2)
+        assert shortlist[0].id == selected.id == {"low": 3, "critical": 4}[priority]
@@ -0,0 +1,54 @@
+"""
+Tests for batch ticket assignment
+"""
+
+def _service(make_assignment_service):
+    service = make_assignment_service(BATCH_MAX_CONCURRENCY=4)
+
+    def extract(ticket, available_skills, catalog_version=None, use_cache=True, stream=False, catalog_skills=None):
+        if "fail" in ticket.subject:
+            raise ValueError("extraction failed")
+        return {"existing_skills": ["Printers" if "printer" in ticket.subject.lower() else "VPN Setup"], "new_skills": []}
+
+    service.skill_extraction_service.extract_skills_from_ticket = extract
+    service._notify_extracted_skills = lambda *args: None
+    return service
+
+def _ticket(ticket_id, subject):
+    return {"id": ticket_id, "subject": subject, "description": "Details of the issue", "requester_id": 5}
+
+def test_batch_shares_catalog_and_technicians(make_assignment_service):
+    """The catalog and technician list are fetched once for the whole batch"""
+    service = _service(make_assignment_service)
+    tickets = [_ticket(i, "VPN connection down" if i % 2 else "Printer is offline") for i in range(10)]
+
+    result = service.process_ticket_batch({"selection_engine": "scoring", "tickets": tickets})
+
+    assert result.success and result.succeeded == 10
+    assert service.skill_catalog.reads == 1
+    assert [endpoint for endpoint, _ in service.backend.requests] == ["technicians_all"]
+    assert [item.ticket_id for item in result.results] == list(range(10))
+    assert [item.selected_technician_id for item in result.results[:2]] == [8, 7]
+
+def test_batch_reports_per_ticket_errors(make_assignment_service):
+    """A failing ticket is reported in its result without failing the others"""
+    service = _service(make_assignment_service)
+    tickets = [_ticket(1, "VPN connection down"), _ticket(2, "This one will fail"), "not a ticket"]
+
+    result = service.process_ticket_batch({"selection_engine": "scoring", "tickets": tickets})
+
+    assert not result.success
+    assert (result.succeeded, result.failed) == (1, 2)
+    assert result.results[1].error_message == "extraction failed"
+    assert result.results[2].index == 2 and not result.results[2].success
+
+def test_malformed_ticket_id_fails_only_its_ticket(make_assignment_service):
+    """A ticket whose id is not an integer gets its own error entry"""
+    service = _service(make_assignment_service)
+    tickets = [_ticket(1, "VPN connection down"), _ticket("T-2", "Printer is offline"), _ticket(3, "Printer is offline")]
+
+    result = service.process_ticket_batch({"selection_engine": "scoring", "tickets": tickets})
+
+    assert (result.succeeded, result.failed) == (2, 1)
+    assert [item.ticket_id for item in result.results] == [1, None, 3]
+    assert not result.results[1].success and result.results[1].error_message
@@ -0,0 +1,40 @@
+"""
+Tests for SimHash near-duplicate ticket detection
+"""
+import time
+from services.ticket_dedup import NearDuplicateIndex
+
+OUTAGE = "Outlook not connecting to Exchange server. Since this morning my Outlook shows disconnected and I cannot send or receive email."
+OUTAGE_REPORT = "Outlook not connecting to exchange server. Since this morning Outlook shows disconnected and I cannot send or receive emails."
+PRINTER = "Printer on floor 3 jams on every print job, paper tray error shown on the display."
+
+def test_near_duplicate_reuses_extraction():
+    """A reworded report of the same outage reuses the stored extraction"""
+    index = NearDuplicateIndex(max_entries=10, ttl_seconds=60, max_distance=7)
+    index.add(OUTAGE, 1, "v1", {"existing_skills": ["Email Support"]})
+
+    match = index.find(OUTAGE_REPORT, "v1")
+
+    assert match is not None and match.ticket_id == 1
+    assert match.extraction == {"existing_skills": ["Email Support"]}
+    assert index.find(PRINTER, "v1") is None
+
+def test_other_catalog_versions_are_not_reused():
+    """Extractions made against another catalog version are ignored"""
+    index = NearDuplicateIndex(max_entries=10, ttl_seconds=60, max_distance=7)
+    index.add(OUTAGE, 1, "v1", {"existing_skills": []})
+
+    assert index.find(OUTAGE, "v2") is None
+
+def test_index_is_bounded_and_expires():
+    """The oldest tickets are evicted when full and expire after the TTL"""
+    index = NearDuplicateIndex(max_entries=1, ttl_seconds=0.01, max_distance=7)
+    index.add(OUTAGE, 1, "v1", {})
+    index.add(PRINTER, 2, "v1", {})
+
+    assert index.find(OUTAGE, "v1") is None
+    assert index.get_stats()["evicted"] == 1
+
+    time.sleep(0.02)
+    assert index.find(PRINTER, "v1") is None
+    assert index.get_stats()["entries"] == 0
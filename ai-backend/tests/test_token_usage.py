@@ -0,0 +1,55 @@
+"""
+Tests for LLM token accounting per stage, endpoint and request
+"""
+import contextvars
+import threading
+from types import SimpleNamespace
+from services.token_usage import current_token_usage, estimate_tokens, get_token_totals, record_llm_usage, token_usage_scope, tracks_token_usage
+
+def test_reported_usage_is_preferred_over_estimates():
+    """Counts reported with the response are used; text is only counted when they are missing"""
+    with token_usage_scope("test_reported") as usage:
+        record_llm_usage("extraction", "prompt text", SimpleNamespace(content="{}", usage_metadata={"input_tokens": 900, "output_tokens": 50}))
+        record_llm_usage("selection", "a much longer prompt " * 20, SimpleNamespace(content="short answer"))
+
+    result = usage.as_dict()
+    assert result["stages"]["extraction"] == {"calls": 1, "estimated_calls": 0, "prompt_tokens": 900, "completion_tokens": 50}
+    selection = result["stages"]["selection"]
+    assert selection["estimated_calls"] == 1
+    assert selection["prompt_tokens"] == estimate_tokens("a much longer prompt " * 20) > 0
+    assert result["total_tokens"] == 950 + selection["prompt_tokens"] + selection["completion_tokens"]
+
+def test_nested_scopes_add_to_the_outer_request():
+    """A ticket scope inside a batch keeps the batch endpoint and adds its counts to the batch"""
+    @tracks_token_usage("test_ticket")
+    def assign_ticket():
+        record_llm_usage("extraction", "", SimpleNamespace(content="", usage_metadata={"input_tokens": 100, "output_tokens": 10}))
+        return current_token_usage()
+
+    with token_usage_scope("test_batch") as batch:
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(assign_ticket,)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ticket = assign_ticket()
+
+    assert ticket.endpoint == "test_batch" and ticket.as_dict()["prompt_tokens"] == 100
+    assert batch.as_dict()["stages"]["extraction"]["calls"] == 4
+    assert get_token_totals()["endpoints"]["test_batch"]["prompt_tokens"] == 400
+    assert "test_ticket" not in get_token_totals()["endpoints"]
+
+def test_generator_scope_survives_between_steps():
+    """A decorated generator accounts every step to its own scope"""
+    @tracks_token_usage("test_stream")
+    def stream():
+        record_llm_usage("extraction", "", SimpleNamespace(content="", usage_metadata={"input_tokens": 10, "output_tokens": 1}))
+        yield current_token_usage()
+        record_llm_usage("selection", "", SimpleNamespace(content="", usage_metadata={"input_tokens": 20, "output_tokens": 2}))
+        yield current_token_usage()
+
+    first, second = list(stream())
+
+    assert first is second
+    assert second.as_dict()["total_tokens"] == 33
+    assert current_token_usage() is None